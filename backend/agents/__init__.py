@@ -4,5 +4,20 @@ from .monitor import MonitorAgent
 from .reason import ReasonAgent
 from .act import ActAgent
 from .escalate import EscalateAgent
+from .bedrock import BedrockExecutor
+from .ratelimit import RateController, RateLimitExceeded, shared_controller
+from .cache import AnalysisCache
+from .similarity import SimilarityIndex
 
-__all__ = ["MonitorAgent", "ReasonAgent", "ActAgent", "EscalateAgent"]
+__all__ = [
+    "MonitorAgent",
+    "ReasonAgent",
+    "ActAgent",
+    "EscalateAgent",
+    "BedrockExecutor",
+    "RateController",
+    "RateLimitExceeded",
+    "shared_controller",
+    "AnalysisCache",
+    "SimilarityIndex",
+]
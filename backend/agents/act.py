@@ -6,6 +6,8 @@ from __future__ import annotations
 
 import asyncio
 import random
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any
 
@@ -14,10 +16,30 @@ class ActAgent:
     """
     Executes auto-fix actions for high-confidence events.
     Each action returns a structured execution log.
+    Remediations run concurrently up to max_concurrency, but never two at
+    once against the same resource.
     """
 
-    def __init__(self, use_mock: bool = True):
+    def __init__(self, use_mock: bool = True, max_concurrency: int = 4):
         self.use_mock = use_mock
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._resource_locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+
+    @asynccontextmanager
+    async def _resource_lock(self, resource: str):
+        """Per-resource mutex; dropped once no execution holds or awaits it."""
+        lock = self._resource_locks.setdefault(resource, asyncio.Lock())
+        self._lock_users[resource] = self._lock_users.get(resource, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[resource] -= 1
+            if not self._lock_users[resource]:
+                del self._lock_users[resource]
+                del self._resource_locks[resource]
 
     async def execute(
         self,
@@ -33,9 +55,17 @@ class ActAgent:
                 "event_id": event["id"],
             }
 
-        if self.use_mock:
-            return await self._mock_execute(event, analysis)
-        return await self._live_execute(event, analysis)
+        queued = time.perf_counter()
+        # Resource lock first, so a blocked fix doesn't hold a concurrency slot
+        async with self._resource_lock(event.get("resource", event["id"])):
+            async with self._slots:
+                waited_ms = (time.perf_counter() - queued) * 1000
+                if self.use_mock:
+                    result = await self._mock_execute(event, analysis)
+                else:
+                    result = await self._live_execute(event, analysis)
+        result["wait_ms"] = round(waited_ms, 1)
+        return result
 
     async def _mock_execute(
         self, event: dict[str, Any], analysis: dict[str, Any]
@@ -0,0 +1,145 @@
+"""
+Bedrock execution layer — runs blocking Converse calls off the event loop.
+
+boto3 is synchronous, so every call is offloaded to a sized thread pool and
+admitted by a RateController (AIMD concurrency per model, optional RPM
+bucket, deadline-bounded retry on throttling). Latency is recorded for
+every call so the API can expose it alongside the analysis it produced.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import boto3  # type: ignore
+from botocore.config import Config  # type: ignore
+
+from .ratelimit import RateController, shared_controller
+
+
+def _percentile(ordered: list[float], q: float) -> float | None:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 1)
+
+
+class BedrockExecutor:
+    """
+    Shared async front-end for the bedrock-runtime client.
+    One thread pool and one boto3 client serve every agent; concurrency is
+    bounded per model id so a burst on one model cannot starve another.
+    Limits come from the process-wide controller unless overridden here.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        default_concurrency: int | None = None,
+        model_limits: dict[str, int] | None = None,
+        region_name: str | None = None,
+        rate: RateController | None = None,
+    ):
+        self.max_workers = max_workers or int(os.getenv("BEDROCK_MAX_WORKERS", "32"))
+        self.region_name = region_name or os.getenv("AWS_REGION", "us-east-1")
+        if rate is None and (default_concurrency is not None or model_limits is not None):
+            rate = RateController(default_concurrency=default_concurrency, model_concurrency=model_limits)
+        self.rate = rate or shared_controller()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bedrock")
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    def _get_client(self):
+        if self._client is not None:
+            return self._client
+        # First calls arrive on several worker threads at once, and creating a
+        # client from boto3's default session is not thread-safe
+        with self._client_lock:
+            if self._client is None:
+                self._client = boto3.client(
+                    "bedrock-runtime",
+                    region_name=self.region_name,
+                    # One pooled connection per worker thread — botocore defaults to 10.
+                    # Retries belong to the rate controller, which needs to see every throttle.
+                    config=Config(max_pool_connections=self.max_workers, retries={"total_max_attempts": 1}),
+                )
+            return self._client
+
+    def limit_for(self, model_id: str) -> int:
+        """Configured concurrency ceiling; the live AIMD limit is in stats()."""
+        return self.rate.ceiling_for(model_id)
+
+    def _model_stats(self, model_id: str) -> dict[str, Any]:
+        if model_id not in self._stats:
+            self._stats[model_id] = {
+                "calls": 0,
+                "errors": 0,
+                "in_flight": 0,
+                "total_latency_ms": 0.0,
+                "max_latency_ms": 0.0,
+                "recent_latency_ms": deque(maxlen=256),
+            }
+        return self._stats[model_id]
+
+    async def run(self, model_id: str, fn, *args, **kwargs) -> tuple[Any, float]:
+        """
+        Run fn(client, *args, **kwargs) on the pool under model_id's rate limits,
+        retrying throttled attempts. Returns (result, latency_ms) of the
+        successful attempt; latency excludes time spent queued or backing off.
+        """
+        stats = self._model_stats(model_id)
+        loop = asyncio.get_running_loop()
+        latency_ms = 0.0
+
+        def attempt() -> asyncio.Future:
+            # The pool future itself goes to the rate controller: a caller that
+            # gives up doesn't stop the thread, so its slot is held until it ends
+            stats["in_flight"] += 1
+            started = time.perf_counter()
+
+            def record(future: asyncio.Future) -> None:
+                nonlocal latency_ms
+                latency_ms = (time.perf_counter() - started) * 1000
+                if future.cancelled() or future.exception() is not None:
+                    stats["errors"] += 1
+                stats["in_flight"] -= 1
+                stats["calls"] += 1
+                stats["total_latency_ms"] += latency_ms
+                stats["max_latency_ms"] = max(stats["max_latency_ms"], latency_ms)
+                stats["recent_latency_ms"].append(latency_ms)
+
+            future = loop.run_in_executor(self._pool, lambda: fn(self._get_client(), *args, **kwargs))
+            future.add_done_callback(record)
+            return future
+
+        result = await self.rate.acall(model_id, attempt)
+        return result, latency_ms
+
+    async def converse(self, modelId: str, **request: Any) -> tuple[dict[str, Any], float]:
+        """Async Converse API call. Returns (response, latency_ms)."""
+        return await self.run(modelId, lambda client: client.converse(modelId=modelId, **request))
+
+    def stats(self) -> dict[str, Any]:
+        """Per-model call counts, concurrency ceilings and latency percentiles, plus live rate limits."""
+        models = {}
+        for model_id, s in self._stats.items():
+            recent = sorted(s["recent_latency_ms"])
+            models[model_id] = {
+                "calls": s["calls"],
+                "errors": s["errors"],
+                "in_flight": s["in_flight"],
+                "concurrency_limit": self.limit_for(model_id),
+                "avg_latency_ms": round(s["total_latency_ms"] / s["calls"], 1) if s["calls"] else None,
+                "p50_latency_ms": _percentile(recent, 0.50),
+                "p95_latency_ms": _percentile(recent, 0.95),
+                "max_latency_ms": round(s["max_latency_ms"], 1),
+            }
+        return {"max_workers": self.max_workers, "models": models, "rate_limits": self.rate.stats()}
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,224 @@
+"""
+Analysis cache — content-addressed store for ReasonAgent results.
+
+Events are keyed by a fingerprint of the fields that drive the analysis
+(source, service, resource, metric, bucketed value/threshold, severity) plus
+the prompt/model version, so an alarm that stays in ALARM across runs is
+answered from cache instead of a fresh Nova Pro call.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+def bucket(value: Any, pct: float) -> str:
+    """
+    Quantise a metric value onto a log scale with buckets `pct` wide, so
+    94.7% and 95.1% CPU share a fingerprint but 60% and 95% do not.
+    Non-numeric values (e.g. live alarm state strings) are used verbatim.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return str(value)
+    if value == 0 or pct <= 0:
+        return repr(float(value))
+    sign = "-" if value < 0 else ""
+    return f"{sign}b{math.floor(math.log(abs(value)) / math.log1p(pct))}"
+
+
+def fingerprint(event: dict[str, Any], version: str, pct: float = 0.05) -> str:
+    """Stable hash of the analysis-relevant fields of an event."""
+    parts = [
+        version,
+        str(event.get("source", "")),
+        str(event.get("service", "")),
+        str(event.get("resource", "")),
+        str(event.get("metric", "")),
+        bucket(event.get("value"), pct),
+        bucket(event.get("threshold"), pct),
+        # Severity is part of the prompt, so a re-classified alarm is re-analyzed
+        str(event.get("severity", "")),
+    ]
+    # Correlation clusters: the member set is part of what gets analyzed
+    for member in sorted(event.get("correlated_events", []), key=lambda e: str(e.get("id"))):
+        parts.append(fingerprint(member, version, pct))
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU map with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, float, dict[str, Any]]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[float, float, dict[str, Any]] | None:
+        item = self._data.get(key)
+        if item is not None:
+            self._data.move_to_end(key)
+        return item
+
+    def set(self, key: str, stored_at: float, expires_at: float, value: dict[str, Any]) -> int:
+        self._data[key] = (stored_at, expires_at, copy.deepcopy(value))
+        self._data.move_to_end(key)
+        evicted = 0
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """On-disk LRU store — survives restarts and can be shared by workers."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS analysis_cache (
+                key TEXT PRIMARY KEY,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                value TEXT NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_cache_lru ON analysis_cache(last_access)"
+        )
+
+    def get(self, key: str) -> tuple[float, float, dict[str, Any]] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, expires_at, value FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE analysis_cache SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+        return row[0], row[1], json.loads(row[2])
+
+    def set(self, key: str, stored_at: float, expires_at: float, value: dict[str, Any]) -> int:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?, ?, ?)",
+                (key, stored_at, expires_at, time.time(), json.dumps(value)),
+            )
+            overflow = len(self) - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    """DELETE FROM analysis_cache WHERE key IN (
+                        SELECT key FROM analysis_cache ORDER BY last_access LIMIT ?
+                    )""",
+                    (overflow,),
+                )
+        return max(overflow, 0)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM analysis_cache")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+
+class AnalysisCache:
+    """
+    TTL + LRU cache in front of ReasonAgent.analyze.
+    Tracks hits, misses, expirations and evictions for /metrics.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 900,
+        max_entries: int = 1024,
+        path: str | None = None,
+        bucket_pct: float = 0.05,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.bucket_pct = bucket_pct
+        self.backend = SQLiteBackend(path, max_entries) if path else MemoryBackend(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "AnalysisCache":
+        return cls(
+            ttl_seconds=float(os.getenv("ANALYSIS_CACHE_TTL", "900")),
+            max_entries=int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "1024")),
+            path=os.getenv("ANALYSIS_CACHE_PATH") or None,
+            bucket_pct=float(os.getenv("ANALYSIS_CACHE_BUCKET_PCT", "0.05")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def key_for(self, event: dict[str, Any], version: str) -> str:
+        return fingerprint(event, version, self.bucket_pct)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return a copy of the cached analysis with cache metadata, or None."""
+        item = self.backend.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        stored_at, expires_at, value = item
+        now = time.time()
+        if now >= expires_at:
+            self.backend.delete(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        value = copy.deepcopy(value)
+        value["cache"] = {"hit": True, "fingerprint": key[:16], "age_seconds": round(now - stored_at, 1)}
+        return value
+
+    def set(self, key: str, analysis: dict[str, Any]) -> None:
+        now = time.time()
+        self.evictions += self.backend.set(key, now, now + self.ttl_seconds, analysis)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "sqlite" if isinstance(self.backend, SQLiteBackend) else "memory",
+            "entries": len(self.backend),
+            "max_entries": self.backend.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,165 @@
+"""
+Correlation stage — groups related events into incident clusters before
+reasoning, so an alarm storm costs one Nova Pro call per incident instead
+of one per alarm.
+
+Events are linked when they share a resource, or when signals from the
+same source in the same region fall inside one time window and sit on a
+known service dependency chain (e.g. Lambda errors caused by DynamoDB
+throttling). Sharing a service alone is not a link: two CPU alarms on
+unrelated instances are two incidents.
+"""
+from __future__ import annotations
+
+import bisect
+import hashlib
+from datetime import datetime
+from typing import Any
+
+
+SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+# Upstream services each service commonly depends on
+SERVICE_DEPENDENCIES: dict[str, set[str]] = {
+    "Lambda": {"DynamoDB", "SQS", "SNS", "Kinesis", "RDS", "S3"},
+    "ApiGateway": {"Lambda"},
+    "ApplicationELB": {"EC2", "ECS"},
+    "ECS": {"DynamoDB", "RDS", "ElastiCache", "SQS"},
+    "EC2": {"RDS", "ElastiCache", "EBS"},
+    "StepFunctions": {"Lambda"},
+}
+
+
+def _parse_ts(value: Any) -> float | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        self.parent[rb] = ra
+        return True
+
+
+class Correlator:
+    """
+    Deterministic event → incident-cluster grouping.
+    Returns clusters as plain dicts so they can be stored on the run record.
+    """
+
+    def __init__(self, window_seconds: float = 900, dependencies: dict[str, set[str]] | None = None):
+        self.window_seconds = window_seconds
+        self.dependencies = SERVICE_DEPENDENCIES if dependencies is None else dependencies
+
+    def _nearest(self, ts: float | None, group: tuple[list[float], list[int], list[int]]) -> list[int]:
+        """
+        Members of a (sorted) service group to link an event at ts to: the
+        closest one in time if inside the window, plus one whose timestamp
+        is unknown — those never block a link.
+        """
+        times, timed, untimed = group
+        if ts is None:
+            return (timed or untimed)[:1]
+        found = untimed[:1]
+        pos = bisect.bisect_left(times, ts)
+        near = [k for k in (pos - 1, pos) if 0 <= k < len(times)]
+        if near:
+            k = min(near, key=lambda k: abs(times[k] - ts))
+            if abs(times[k] - ts) <= self.window_seconds:
+                found.append(timed[k])
+        return found
+
+    def correlate(self, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Group events into clusters. Singletons are returned as 1-event clusters."""
+        uf = _UnionFind(len(events))
+        reasons: dict[tuple[int, int], str] = {}
+
+        def link(i: int, j: int, reason: str) -> None:
+            if uf.union(i, j):
+                reasons[(i, j)] = reason
+
+        by_resource: dict[str, int] = {}
+        # (region, source) → service → member indices. Dependency links are only
+        # made between signals of the same source — a cost anomaly is not
+        # evidence of an operational dependency failure.
+        by_scope: dict[tuple[str, str], dict[str, list[int]]] = {}
+        stamps = [_parse_ts(e.get("timestamp")) for e in events]
+        for i, event in enumerate(events):
+            resource = event.get("resource")
+            if resource:
+                if resource in by_resource:
+                    link(by_resource[resource], i, f"shared resource {resource}")
+                else:
+                    by_resource[resource] = i
+            scope = (event.get("region", ""), event.get("source", ""))
+            by_scope.setdefault(scope, {}).setdefault(event.get("service", ""), []).append(i)
+
+        # Dependency chain: declared upstream, or named in the alarm message.
+        # Each event links to the nearest-in-time upstream signal — enough for
+        # union-find to join the chain without comparing every pair.
+        for (region, _), services in by_scope.items():
+            timelines = {}
+            for service, members in services.items():
+                timed = sorted((i for i in members if stamps[i] is not None), key=lambda i: stamps[i])
+                timelines[service] = ([stamps[i] for i in timed], timed, [i for i in members if stamps[i] is None])
+            for service, members in services.items():
+                upstreams = self.dependencies.get(service, set())
+                for i in members:
+                    message = str(events[i].get("message", ""))
+                    for other, group in timelines.items():
+                        if not other or other == service or (other not in upstreams and other not in message):
+                            continue
+                        for j in self._nearest(stamps[i], group):
+                            link(i, j, f"{service} depends on {other} in {region}")
+
+        groups: dict[int, list[int]] = {}
+        for i in range(len(events)):
+            groups.setdefault(uf.find(i), []).append(i)
+        group_reasons: dict[int, set[str]] = {}
+        for (a, _), reason in reasons.items():
+            group_reasons.setdefault(uf.find(a), set()).add(reason)
+
+        clusters = []
+        for root, members in groups.items():
+            member_events = [events[i] for i in members]
+            primary = min(member_events, key=lambda e: SEVERITY_ORDER.get(e.get("severity"), 9))
+            ids = sorted(e["id"] for e in member_events)
+            clusters.append({
+                "cluster_id": "cluster-" + hashlib.sha256("|".join(ids).encode()).hexdigest()[:10],
+                "primary_event_id": primary["id"],
+                "event_ids": [e["id"] for e in member_events],
+                "reasons": sorted(group_reasons.get(root, ())),
+            })
+        return clusters
+
+    @staticmethod
+    def cluster_event(cluster: dict[str, Any], events_by_id: dict[str, dict[str, Any]]) -> dict[str, Any]:
+        """
+        Synthetic event standing in for a multi-event cluster: the primary
+        event's fields plus the other members under `correlated_events`.
+        """
+        primary = events_by_id[cluster["primary_event_id"]]
+        return {
+            **primary,
+            "id": cluster["cluster_id"],
+            "primary_event_id": primary["id"],
+            "correlated_events": [
+                events_by_id[eid] for eid in cluster["event_ids"] if eid != primary["id"]
+            ],
+        }
@@ -4,18 +4,73 @@ that require human-in-the-loop approval before action.
 """
 from __future__ import annotations
 
+import heapq
+import itertools
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterator
+
+from .monitor import SEVERITY_ORDER
+
+# Heap entry: (confidence, escalated_at, seq, escalation_id, record)
+_Entry = tuple[float, float, int, str, dict[str, Any]]
+
+
+def _ordered(heap: list[_Entry]) -> Iterator[_Entry]:
+    """
+    Yield heap entries in priority order without popping them: walk the
+    heap tree best-first from the root, so the first K cost O(K log K).
+    """
+    if not heap:
+        return
+    frontier = [(heap[0], 0)]
+    while frontier:
+        entry, i = heapq.heappop(frontier)
+        yield entry
+        for child in (2 * i + 1, 2 * i + 2):
+            if child < len(heap):
+                heapq.heappush(frontier, (heap[child], child))
 
 
 class EscalateAgent:
     """
     Manages the HITL escalation queue.
-    Stores pending escalations in memory (production: use DynamoDB/Redis).
+    Stores escalations in memory (production: use DynamoDB/Redis).
+
+    Pending escalations live in one priority heap per (severity, service),
+    ordered by confidence (least certain first) then age (oldest first),
+    with severity and service indexes. A filtered queue walks only the
+    matching heaps, merged lazily. Resolved escalations move to a bounded
+    archive; resolved heap entries are dropped lazily.
+
+    on_change(kind, diff) is called with a compact diff whenever the queue
+    changes, so dashboards can be pushed updates instead of polling.
     """
 
-    def __init__(self):
-        self._queue: dict[str, dict[str, Any]] = {}
+    def __init__(
+        self,
+        archive_size: int = 1000,
+        on_change: Callable[[str, dict[str, Any]], Any] | None = None,
+    ):
+        self.archive_size = archive_size
+        self.on_change = on_change
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._archive: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._heaps: dict[tuple[str, str], list[_Entry]] = {}
+        self._by_severity: dict[str, set[str]] = {}
+        self._by_service: dict[str, set[str]] = {}
+        self._by_scope: dict[tuple[str, str], set[str]] = {}
+        self._seq = itertools.count()
+        self._archived_evicted = 0
+
+    @staticmethod
+    def _severity(record: dict[str, Any]) -> str:
+        return str(record["event"].get("severity", ""))
+
+    @staticmethod
+    def _service(record: dict[str, Any]) -> str:
+        return str(record["event"].get("service", ""))
 
     def escalate(
         self,
@@ -35,16 +90,85 @@ class EscalateAgent:
             "resolution": None,
             "resolved_by": None,
         }
-        self._queue[escalation_id] = record
+        # Re-escalating an event replaces its previous record
+        self._unindex(escalation_id)
+        self._archive.pop(escalation_id, None)
+
+        self._pending[escalation_id] = record
+        severity, service = self._severity(record), self._service(record)
+        self._by_severity.setdefault(severity, set()).add(escalation_id)
+        self._by_service.setdefault(service, set()).add(escalation_id)
+        self._by_scope.setdefault((severity, service), set()).add(escalation_id)
+        confidence = float(analysis.get("confidence") or 0.0)
+        heapq.heappush(
+            self._heaps.setdefault((severity, service), []),
+            (confidence, time.time(), next(self._seq), escalation_id, record),
+        )
+        self._notify("escalation.created", {
+            "escalation_id": escalation_id,
+            "event_id": event["id"],
+            "severity": severity,
+            "service": self._service(record),
+            "confidence": confidence,
+            "created_at": record["created_at"],
+        })
+        return record
+
+    def _notify(self, kind: str, diff: dict[str, Any]) -> None:
+        if self.on_change is not None:
+            self.on_change(kind, {**diff, "pending": len(self._pending)})
+
+    def _unindex(self, escalation_id: str) -> dict[str, Any] | None:
+        record = self._pending.pop(escalation_id, None)
+        if record is None:
+            return None
+        scope = (self._severity(record), self._service(record))
+        self._by_severity[scope[0]].discard(escalation_id)
+        self._by_service[scope[1]].discard(escalation_id)
+        self._by_scope[scope].discard(escalation_id)
+        heap = self._heaps[scope]
+        # Entries are dropped lazily; rebuild once most of a heap is stale
+        if len(heap) > 64 and len(heap) > 2 * len(self._by_scope[scope]):
+            self._heaps[scope] = [e for e in heap if self._pending.get(e[3]) is e[4]]
+            heapq.heapify(self._heaps[scope])
         return record
 
-    def get_queue(self) -> list[dict[str, Any]]:
-        """Return all pending escalations."""
-        return [r for r in self._queue.values() if r["status"] == "pending"]
+    def _iter_pending(self, severity: str | None = None, service: str | None = None) -> Iterator[dict[str, Any]]:
+        """Live pending records in priority order (severity first), from the matching heaps only."""
+        by_severity: dict[str, list[list[_Entry]]] = {}
+        for (sev, svc), heap in self._heaps.items():
+            if heap and (severity is None or sev == severity) and (service is None or svc == service):
+                by_severity.setdefault(sev, []).append(heap)
+        for sev in sorted(by_severity, key=lambda s: SEVERITY_ORDER.get(s, 9)):
+            for entry in heapq.merge(*(_ordered(heap) for heap in by_severity[sev])):
+                if self._pending.get(entry[3]) is entry[4]:
+                    yield entry[4]
+
+    def get_queue(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+        severity: str | None = None,
+        service: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return pending escalations, highest priority first."""
+        records = self._iter_pending(severity, service)
+        stop = None if limit is None else offset + limit
+        return list(itertools.islice(records, offset, stop))
+
+    def pending_count(self, severity: str | None = None, service: str | None = None) -> int:
+        """Number of pending escalations matching the filters, from the indexes."""
+        if severity is None and service is None:
+            return len(self._pending)
+        if service is None:
+            return len(self._by_severity.get(severity, ()))
+        if severity is None:
+            return len(self._by_service.get(service, ()))
+        return len(self._by_scope.get((severity, service), ()))
 
     def get_all(self) -> list[dict[str, Any]]:
-        """Return all escalations (pending + resolved)."""
-        return list(self._queue.values())
+        """Return all escalations (pending + archived resolved)."""
+        return [*self._pending.values(), *self._archive.values()]
 
     def resolve(
         self,
@@ -56,14 +180,35 @@ class EscalateAgent:
         Resolve an escalation.
         resolution: 'approved' | 'rejected' | 'deferred'
         """
-        record = self._queue.get(escalation_id)
+        record = self._unindex(escalation_id) or self._archive.get(escalation_id)
         if not record:
             raise KeyError(f"Escalation {escalation_id} not found")
         record["status"] = "resolved"
         record["resolution"] = resolution
         record["resolved_by"] = resolved_by
         record["resolved_at"] = datetime.utcnow().isoformat() + "Z"
+        self._archive[escalation_id] = record
+        self._archive.move_to_end(escalation_id)
+        while len(self._archive) > self.archive_size:
+            self._archive.popitem(last=False)
+            self._archived_evicted += 1
+        self._notify("escalation.resolved", {
+            "escalation_id": escalation_id,
+            "resolution": resolution,
+            "resolved_by": resolved_by,
+            "resolved_at": record["resolved_at"],
+        })
         return record
 
     def get(self, escalation_id: str) -> dict[str, Any] | None:
-        return self._queue.get(escalation_id)
+        return self._pending.get(escalation_id) or self._archive.get(escalation_id)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "pending_by_severity": {s: len(ids) for s, ids in self._by_severity.items() if ids},
+            "heap_entries": sum(len(h) for h in self._heaps.values()),
+            "archived": len(self._archive),
+            "archive_size": self.archive_size,
+            "archive_evicted": self._archived_evicted,
+        }
@@ -5,9 +5,13 @@ Uses mock data when AWS credentials are not present.
 """
 from __future__ import annotations
 
+import os
 import random
-from datetime import datetime, timedelta
-from typing import Any
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
 
 
 MOCK_ALARMS = [
@@ -79,14 +83,57 @@ MOCK_ALARMS = [
 ]
 
 
+SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+ALL_SOURCES = ("cloudwatch", "cost_explorer", "security_hub")
+
+# Cost Explorer is a global API served from us-east-1 only
+COST_EXPLORER_REGION = "us-east-1"
+
+# boto3 service name → the source whose timeout bounds its calls
+CLIENT_SOURCES = {"cloudwatch": "cloudwatch", "ce": "cost_explorer", "securityhub": "security_hub"}
+
+
+def _iso(ts: Any) -> str:
+    """ISO-8601 'Z' timestamp from a boto3 datetime or date string."""
+    if isinstance(ts, datetime):
+        if ts.tzinfo is not None:
+            ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+        return ts.isoformat() + "Z"
+    return str(ts) if ts else datetime.utcnow().isoformat() + "Z"
+
+
 class MonitorAgent:
     """
     Polls AWS CloudWatch, Cost Explorer, and Security Hub.
     Falls back to realistic mock data when credentials are absent.
+    Live collectors run concurrently per (source, region) on one shared,
+    bounded thread pool. A collector that misses its source's timeout is
+    reported in last_collection and the pass returns what the others found;
+    the next pass waits on that same job rather than starting another, so
+    stuck calls can't fill the pool.
     """
 
-    def __init__(self, use_mock: bool = True):
+    def __init__(
+        self,
+        use_mock: bool = True,
+        regions: list[str] | None = None,
+        sources: tuple[str, ...] = ALL_SOURCES,
+        max_workers: int = 16,
+        source_timeouts: dict[str, float] | None = None,
+    ):
         self.use_mock = use_mock
+        self.regions = regions or [os.getenv("AWS_REGION", "us-east-1")]
+        self.sources = tuple(s for s in sources if s in ALL_SOURCES)
+        self.max_workers = max_workers
+        self.source_timeouts = {src: 10.0 for src in ALL_SOURCES}
+        self.source_timeouts.update(source_timeouts or {})
+        self.last_collection: dict[str, Any] = {}
+        self._pool: ThreadPoolExecutor | None = None
+        self._clients: dict[tuple[str, str], Any] = {}
+        self._clients_lock = threading.Lock()
+        # (source, region) → latest collector job, reused while still running
+        self._inflight: dict[tuple[str, str], Future] = {}
 
     def collect(self) -> list[dict[str, Any]]:
         """Return list of active events sorted by severity."""
@@ -95,33 +142,169 @@ class MonitorAgent:
         return self._live_events()
 
     def _mock_events(self) -> list[dict[str, Any]]:
-        severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-        events = sorted(MOCK_ALARMS, key=lambda e: severity_order.get(e["severity"], 9))
+        events = sorted(MOCK_ALARMS, key=lambda e: SEVERITY_ORDER.get(e["severity"], 9))
         return events
 
+    def _client(self, service: str, region: str):
+        """Cached boto3 client per (service, region); creation is not thread-safe."""
+        with self._clients_lock:
+            key = (service, region)
+            if key not in self._clients:
+                import boto3  # type: ignore
+                from botocore.config import Config  # type: ignore
+
+                self._clients[key] = boto3.client(
+                    service,
+                    region_name=region,
+                    config=Config(
+                        connect_timeout=min(5.0, self.source_timeouts[CLIENT_SOURCES[service]]),
+                        read_timeout=self.source_timeouts[CLIENT_SOURCES[service]],
+                        retries={"max_attempts": 2, "mode": "adaptive"},
+                    ),
+                )
+            return self._clients[key]
+
+    def _jobs(self) -> list[tuple[str, str, Callable[[str], list[dict[str, Any]]]]]:
+        collectors = {
+            "cloudwatch": self._collect_cloudwatch,
+            "cost_explorer": self._collect_cost_anomalies,
+            "security_hub": self._collect_security_findings,
+        }
+        jobs = []
+        for source in self.sources:
+            regions = [COST_EXPLORER_REGION] if source == "cost_explorer" else self.regions
+            jobs += [(source, region, collectors[source]) for region in regions]
+        return jobs
+
     def _live_events(self) -> list[dict[str, Any]]:  # pragma: no cover
         """Real AWS integration — requires boto3 + credentials."""
         try:
-            import boto3  # type: ignore
-            events: list[dict[str, Any]] = []
-
-            cw = boto3.client("cloudwatch")
-            paginator = cw.get_paginator("describe_alarms")
-            for page in paginator.paginate(StateValue="ALARM"):
-                for alarm in page["MetricAlarms"]:
-                    events.append({
-                        "id": alarm["AlarmArn"],
-                        "source": "cloudwatch",
-                        "severity": "high",
-                        "service": alarm.get("Namespace", "AWS").split("/")[-1],
-                        "metric": alarm.get("MetricName", "Unknown"),
-                        "value": alarm.get("StateValue", 0),
-                        "threshold": alarm.get("Threshold", 0),
-                        "region": "us-east-1",
-                        "resource": alarm.get("AlarmName", ""),
-                        "message": alarm.get("StateReason", ""),
-                        "timestamp": alarm.get("StateUpdatedTimestamp", datetime.utcnow()).isoformat() + "Z",
-                    })
-            return events
-        except Exception:
+            from botocore.exceptions import NoCredentialsError  # type: ignore
+        except ImportError:
             return self._mock_events()
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="monitor")
+
+        started = time.monotonic()
+        futures = []
+        carried: set[tuple[str, str]] = set()
+        for source, region, fn in self._jobs():
+            future = self._inflight.get((source, region))
+            if future is not None and not future.done():
+                # Timed out last pass and still running — wait on it again
+                carried.add((source, region))
+            else:
+                future = self._inflight[(source, region)] = self._pool.submit(fn, region)
+            futures.append((source, region, future))
+
+        events: list[dict[str, Any]] = []
+        status: dict[str, dict[str, Any]] = {}
+        credential_failures = 0
+        for source, region, future in futures:
+            remaining = max(0.0, started + self.source_timeouts[source] - time.monotonic())
+            try:
+                found = future.result(timeout=remaining)
+                events.extend(found)
+                status[f"{source}:{region}"] = {"status": "ok", "events": len(found)}
+            except FutureTimeout:
+                status[f"{source}:{region}"] = {"status": "timeout", "events": 0}
+            except NoCredentialsError:
+                credential_failures += 1
+                status[f"{source}:{region}"] = {"status": "no_credentials", "events": 0}
+            except Exception as exc:
+                status[f"{source}:{region}"] = {"status": "error", "events": 0, "error": str(exc)}
+
+        for source, region in carried:
+            status[f"{source}:{region}"]["carried_over"] = True
+        self.last_collection = {
+            "collected_at": datetime.utcnow().isoformat() + "Z",
+            "duration_ms": round((time.monotonic() - started) * 1000, 1),
+            "collectors": status,
+        }
+        if futures and credential_failures == len(futures):
+            # No AWS credentials at all — behave like mock mode for local demos
+            return self._mock_events()
+        return sorted(events, key=lambda e: SEVERITY_ORDER.get(e["severity"], 9))
+
+    def _collect_cloudwatch(self, region: str) -> list[dict[str, Any]]:  # pragma: no cover
+        events: list[dict[str, Any]] = []
+        paginator = self._client("cloudwatch", region).get_paginator("describe_alarms")
+        for page in paginator.paginate(StateValue="ALARM"):
+            for alarm in page["MetricAlarms"]:
+                events.append({
+                    "id": alarm["AlarmArn"],
+                    "source": "cloudwatch",
+                    "severity": "high",
+                    "service": alarm.get("Namespace", "AWS").split("/")[-1],
+                    "metric": alarm.get("MetricName", "Unknown"),
+                    "value": alarm.get("StateValue", 0),
+                    "threshold": alarm.get("Threshold", 0),
+                    "region": region,
+                    "resource": alarm.get("AlarmName", ""),
+                    "message": alarm.get("StateReason", ""),
+                    "timestamp": _iso(alarm.get("StateUpdatedTimestamp")),
+                })
+        return events
+
+    def _collect_cost_anomalies(self, region: str) -> list[dict[str, Any]]:  # pragma: no cover
+        events: list[dict[str, Any]] = []
+        today = datetime.utcnow().date()
+        response = self._client("ce", region).get_anomalies(
+            DateInterval={
+                "StartDate": (today - timedelta(days=7)).isoformat(),
+                "EndDate": today.isoformat(),
+            },
+            MaxResults=100,
+        )
+        for anomaly in response.get("Anomalies", []):
+            impact = anomaly.get("Impact", {})
+            cause = (anomaly.get("RootCauses") or [{}])[0]
+            pct = impact.get("TotalImpactPercentage", 0) or 0
+            severity = "high" if pct >= 100 else "medium" if pct >= 50 else "low"
+            events.append({
+                "id": anomaly["AnomalyId"],
+                "source": "cost_explorer",
+                "severity": severity,
+                "service": cause.get("Service", anomaly.get("DimensionValue", "AWS")),
+                "metric": "DailySpend",
+                "value": impact.get("TotalActualSpend", impact.get("MaxImpact", 0)),
+                "threshold": impact.get("TotalExpectedSpend", 0),
+                "region": cause.get("Region", "global"),
+                "resource": cause.get("UsageType") or anomaly.get("DimensionValue", ""),
+                "message": f"Cost anomaly — ${impact.get('TotalImpact', 0):.2f} above expected ({pct:.0f}%)",
+                "timestamp": _iso(anomaly.get("AnomalyEndDate") or anomaly.get("AnomalyStartDate")),
+            })
+        return events
+
+    def _collect_security_findings(self, region: str) -> list[dict[str, Any]]:  # pragma: no cover
+        events: list[dict[str, Any]] = []
+        paginator = self._client("securityhub", region).get_paginator("get_findings")
+        filters = {
+            "SeverityLabel": [
+                {"Value": "CRITICAL", "Comparison": "EQUALS"},
+                {"Value": "HIGH", "Comparison": "EQUALS"},
+            ],
+            "RecordState": [{"Value": "ACTIVE", "Comparison": "EQUALS"}],
+            "WorkflowStatus": [
+                {"Value": "NEW", "Comparison": "EQUALS"},
+                {"Value": "NOTIFIED", "Comparison": "EQUALS"},
+            ],
+        }
+        for page in paginator.paginate(Filters=filters, PaginationConfig={"PageSize": 100}):
+            for finding in page["Findings"]:
+                resource = (finding.get("Resources") or [{}])[0]
+                events.append({
+                    "id": finding["Id"],
+                    "source": "security_hub",
+                    "severity": finding.get("Severity", {}).get("Label", "HIGH").lower(),
+                    "service": resource.get("Type", "AWS").removeprefix("Aws"),
+                    "metric": finding.get("Compliance", {}).get("SecurityControlId", finding.get("GeneratorId", "Finding")),
+                    "value": 1,
+                    "threshold": 0,
+                    "region": finding.get("Region", region),
+                    "resource": resource.get("Id", ""),
+                    "message": finding.get("Title", ""),
+                    "timestamp": _iso(finding.get("UpdatedAt")),
+                })
+        return events
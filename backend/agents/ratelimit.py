@@ -0,0 +1,415 @@
+"""
+Client-side rate control for Bedrock — shared by every caller in a process.
+
+Each model gets:
+  • an AIMD concurrency limit: +1 per limit's worth of successful calls,
+    halved when Bedrock throttles (at most once per round of in-flight calls),
+    never above the configured ceiling or below one;
+  • an optional token bucket capping requests per minute;
+  • jittered exponential retry for throttles and transient service errors,
+    bounded by a per-call deadline rather than an attempt count.
+
+The same controller serves async callers (`acall`) and blocking ones
+(`call`, or `instrument` for a boto3 client used by someone else's code).
+Callers waiting for a slot sleep until one is released — on a condition
+variable (threads) or a future (event loops) — rather than polling.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+from botocore.exceptions import ClientError  # type: ignore
+
+T = TypeVar("T")
+
+THROTTLE_CODES = {"ThrottlingException", "TooManyRequestsException", "ServiceQuotaExceededException"}
+TRANSIENT_CODES = {"ServiceUnavailableException", "InternalServerException", "ModelNotReadyException"}
+
+
+class RateLimitExceeded(Exception):
+    """A call could not be admitted, or kept being throttled, until its deadline."""
+
+    def __init__(self, model_id: str, reason: str):
+        super().__init__(f"Bedrock rate limit for {model_id}: {reason}")
+        self.model_id = model_id
+        self.reason = reason
+
+
+def _parse_model_values(raw: str) -> dict[str, float]:
+    """Parse 'model-a=8,model-b=16' into {model_id: value}."""
+    values: dict[str, float] = {}
+    for item in raw.split(","):
+        model_id, sep, value = item.strip().rpartition("=")
+        if sep and model_id:
+            try:
+                values[model_id] = float(value)
+            except ValueError:
+                continue
+    return values
+
+
+def classify(exc: BaseException) -> str | None:
+    """'throttle', 'transient' or None (not retryable) for an exception from a Bedrock call."""
+    if isinstance(exc, ClientError):
+        code = exc.response.get("Error", {}).get("Code", "")
+        if code in THROTTLE_CODES:
+            return "throttle"
+        if code in TRANSIENT_CODES:
+            return "transient"
+    return None
+
+
+class _ModelLimit:
+    def __init__(self, ceiling: int, rpm: float):
+        self.ceiling = max(1, ceiling)
+        self.limit = float(self.ceiling)
+        self.in_flight = 0
+        self.rate = rpm / 60.0
+        self.capacity = max(1.0, self.rate)  # up to one second of burst
+        self.tokens = self.capacity
+        self.refilled = time.monotonic()
+        self.last_decrease = 0.0
+        # Event-loop callers waiting for a slot: (loop, future) pairs
+        self.waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self.calls = 0
+        self.throttled = 0
+        self.transient = 0
+        self.retries = 0
+        self.rejected = 0
+        self.decreases = 0
+
+
+class RateController:
+    """Per-model AIMD concurrency + token bucket + deadline-bounded retry."""
+
+    def __init__(
+        self,
+        default_concurrency: int | None = None,
+        model_concurrency: dict[str, float] | None = None,
+        default_rpm: float | None = None,
+        model_rpm: dict[str, float] | None = None,
+        deadline_seconds: float | None = None,
+        base_delay: float | None = None,
+        max_delay: float = 8.0,
+    ):
+        self.default_concurrency = default_concurrency or int(os.getenv("BEDROCK_MAX_CONCURRENCY", "8"))
+        self.model_concurrency = model_concurrency if model_concurrency is not None else _parse_model_values(
+            os.getenv("BEDROCK_MODEL_CONCURRENCY", "")
+        )
+        self.default_rpm = default_rpm if default_rpm is not None else float(os.getenv("BEDROCK_DEFAULT_RPM", "0"))
+        self.model_rpm = model_rpm if model_rpm is not None else _parse_model_values(os.getenv("BEDROCK_MODEL_RPM", ""))
+        self.deadline_seconds = (
+            deadline_seconds if deadline_seconds is not None else float(os.getenv("BEDROCK_RETRY_DEADLINE_SECONDS", "30"))
+        )
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv("BEDROCK_RETRY_BASE_SECONDS", "0.25"))
+        self.max_delay = max_delay
+        self._models: dict[str, _ModelLimit] = {}
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+
+    def _state(self, model_id: str) -> _ModelLimit:
+        state = self._models.get(model_id)
+        if state is None:
+            with self._lock:
+                state = self._models.setdefault(model_id, _ModelLimit(
+                    int(self.model_concurrency.get(model_id, self.default_concurrency)),
+                    self.model_rpm.get(model_id, self.default_rpm),
+                ))
+        return state
+
+    def ceiling_for(self, model_id: str) -> int:
+        return self._state(model_id).ceiling
+
+    # ── Admission ────────────────────────────────────────────────────────────
+
+    def _try_admit(self, state: _ModelLimit) -> float | None:
+        """
+        Take a slot (and a bucket token) and return 0. Otherwise return how
+        long until the bucket refills, or None when every slot is taken.
+        Caller holds the lock.
+        """
+        if state.in_flight >= int(state.limit):
+            return None
+        if state.rate:
+            now = time.monotonic()
+            state.tokens = min(state.capacity, state.tokens + (now - state.refilled) * state.rate)
+            state.refilled = now
+            if state.tokens < 1:
+                return (1 - state.tokens) / state.rate
+            state.tokens -= 1
+        state.in_flight += 1
+        state.calls += 1
+        return 0.0
+
+    def _release(self, state: _ModelLimit) -> None:
+        """Give a slot back and wake everyone waiting for one. Caller holds the lock."""
+        state.in_flight -= 1
+        self._released.notify_all()
+        waiters, state.waiters = state.waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    def _admit(self, state: _ModelLimit, model_id: str, deadline: float) -> None:
+        """Block the calling thread until admitted, or raise RateLimitExceeded at the deadline."""
+        with self._lock:
+            while (wait := self._try_admit(state)) != 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (wait is not None and wait > remaining):
+                    state.rejected += 1
+                    raise RateLimitExceeded(model_id, "no capacity before deadline")
+                self._released.wait(remaining if wait is None else wait)
+
+    async def _aadmit(self, state: _ModelLimit, model_id: str, deadline: float) -> None:
+        """Async twin of `_admit`: awaits a release instead of blocking a thread."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                wait = self._try_admit(state)
+                if wait == 0:
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (wait is not None and wait > remaining):
+                    state.rejected += 1
+                    raise RateLimitExceeded(model_id, "no capacity before deadline")
+                future: asyncio.Future | None = None
+                if wait is None:
+                    # Registered under the lock, so a release can't slip in unseen
+                    future = loop.create_future()
+                    state.waiters.append((loop, future))
+            if future is None:
+                await asyncio.sleep(wait)
+                continue
+            try:
+                await asyncio.wait([future], timeout=remaining)
+            finally:
+                if not future.done():
+                    with self._lock:
+                        if (loop, future) in state.waiters:
+                            state.waiters.remove((loop, future))
+
+    def _settle(self, state: _ModelLimit, started: float, exc: BaseException | None) -> str | None:
+        """Release the slot and adjust the limit. Returns the error class, if any."""
+        kind = None if exc is None else classify(exc)
+        with self._lock:
+            self._release(state)
+            if kind == "throttle":
+                state.throttled += 1
+                # One decrease per round: calls already in flight at the last
+                # decrease were sent under the old limit and say nothing new
+                if started > state.last_decrease:
+                    state.limit = max(1.0, state.limit / 2)
+                    state.last_decrease = time.monotonic()
+                    state.decreases += 1
+            elif kind == "transient":
+                state.transient += 1
+            elif exc is None:
+                state.limit = min(float(state.ceiling), state.limit + 1 / state.limit)
+        return kind
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: uniform over [0, min(max_delay, base · 2^attempt)]."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _reject(self, state: _ModelLimit, model_id: str, reason: str) -> RateLimitExceeded:
+        with self._lock:
+            state.rejected += 1
+        return RateLimitExceeded(model_id, reason)
+
+    # ── Calls ────────────────────────────────────────────────────────────────
+
+    def _attempts(self, model_id: str, fn: Callable[[], T], deadline_seconds: float | None) -> tuple[T, _ModelLimit, float]:
+        """
+        Admit and run blocking fn() until it succeeds or the deadline passes.
+        Returns with the slot still held; the caller settles it.
+        """
+        state = self._state(model_id)
+        deadline = time.monotonic() + (self.deadline_seconds if deadline_seconds is None else deadline_seconds)
+        attempt = 0
+        while True:
+            self._admit(state, model_id, deadline)
+            started = time.monotonic()
+            try:
+                return fn(), state, started
+            except Exception as exc:
+                if self._settle(state, started, exc) is None:
+                    raise
+                delay = self._backoff(attempt)
+                if time.monotonic() + delay > deadline:
+                    self._reject(state, model_id, "retries exhausted")
+                    raise
+                attempt += 1
+                with self._lock:
+                    state.retries += 1
+                time.sleep(delay)
+
+    def call(self, model_id: str, fn: Callable[[], T], deadline_seconds: float | None = None) -> T:
+        """Run blocking fn() under model_id's limits, retrying until the deadline."""
+        result, state, started = self._attempts(model_id, fn, deadline_seconds)
+        self._settle(state, started, None)
+        return result
+
+    def call_stream(self, model_id: str, fn: Callable[[], dict[str, Any]], deadline_seconds: float | None = None) -> dict[str, Any]:
+        """
+        `call` for ConverseStream: opening the stream is retried like any call,
+        but the slot is held until its event stream is consumed or closed —
+        that is when the model has finished generating.
+        """
+        response, state, started = self._attempts(model_id, fn, deadline_seconds)
+        if not isinstance(response, dict) or "stream" not in response:
+            self._settle(state, started, None)
+            return response
+        return {**response, "stream": _HeldStream(response["stream"], lambda exc: self._settle(state, started, exc))}
+
+    async def acall(
+        self,
+        model_id: str,
+        fn: Callable[[], Awaitable[T]],
+        deadline_seconds: float | None = None,
+    ) -> T:
+        """
+        Async twin of `call`: awaits fn() instead of blocking a thread while
+        waiting. fn may return a future for work running elsewhere (a pool
+        thread); if the caller is cancelled or times out, the slot is held
+        until that work actually finishes.
+        """
+        state = self._state(model_id)
+        deadline = time.monotonic() + (self.deadline_seconds if deadline_seconds is None else deadline_seconds)
+        attempt = 0
+        while True:
+            await self._aadmit(state, model_id, deadline)
+            started = time.monotonic()
+            work = fn()
+            try:
+                result = await (asyncio.shield(work) if isinstance(work, asyncio.Future) else work)
+            except Exception as exc:
+                if self._settle(state, started, exc) is None:
+                    raise
+                delay = self._backoff(attempt)
+                if time.monotonic() + delay > deadline:
+                    self._reject(state, model_id, "retries exhausted")
+                    raise
+                attempt += 1
+                with self._lock:
+                    state.retries += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled — give the slot back without touching the limit, but
+                # not while the abandoned call is still running
+                if isinstance(work, asyncio.Future) and not work.done():
+                    work.add_done_callback(lambda done: self._release_abandoned(state, done))
+                else:
+                    with self._lock:
+                        self._release(state)
+                raise
+            self._settle(state, started, None)
+            return result
+
+    def _release_abandoned(self, state: _ModelLimit, done: asyncio.Future) -> None:
+        if not done.cancelled():
+            done.exception()  # retrieved, so an abandoned failure isn't reported as unhandled
+        with self._lock:
+            self._release(state)
+
+    def instrument(self, client: Any, model_id: str) -> Any:
+        """
+        Route a boto3 bedrock-runtime client's Converse / ConverseStream calls
+        through this controller, for clients owned by libraries that call
+        them directly. Create such clients with botocore retries off
+        (`retries={"total_max_attempts": 1}`) so every throttle reaches here.
+        """
+        converse, converse_stream = client.converse, client.converse_stream
+
+        def guarded(*args: Any, **kwargs: Any) -> Any:
+            return self.call(model_id, lambda: converse(*args, **kwargs))
+
+        def guarded_stream(*args: Any, **kwargs: Any) -> Any:
+            return self.call_stream(model_id, lambda: converse_stream(*args, **kwargs))
+
+        client.converse = guarded
+        client.converse_stream = guarded_stream
+        return client
+
+    def stats(self) -> dict[str, Any]:
+        """Current limits and throttle / rejection counts per model."""
+        with self._lock:
+            return {
+                "deadline_seconds": self.deadline_seconds,
+                "models": {
+                    model_id: {
+                        "concurrency_limit": round(s.limit, 2),
+                        "concurrency_ceiling": s.ceiling,
+                        "in_flight": s.in_flight,
+                        "rpm_limit": round(s.rate * 60, 1) or None,
+                        "calls": s.calls,
+                        "throttled": s.throttled,
+                        "transient_errors": s.transient,
+                        "retries": s.retries,
+                        "rejected": s.rejected,
+                        "limit_decreases": s.decreases,
+                    }
+                    for model_id, s in self._models.items()
+                },
+            }
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _HeldStream:
+    """
+    Wraps a ConverseStream event stream; calls `done(exc)` exactly once when
+    it is exhausted, fails (a mid-stream throttle counts as one), is closed,
+    or is dropped unread.
+    """
+
+    def __init__(self, stream: Any, done: Callable[[BaseException | None], Any]):
+        self._stream = stream
+        self._done: Callable[[BaseException | None], Any] | None = done
+
+    def _finish(self, exc: BaseException | None) -> None:
+        done, self._done = self._done, None
+        if done is not None:
+            done(exc)
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            yield from self._stream
+        except Exception as exc:
+            self._finish(exc)
+            raise
+        finally:
+            self._finish(None)
+
+    def close(self) -> None:
+        try:
+            if hasattr(self._stream, "close"):
+                self._stream.close()
+        finally:
+            self._finish(None)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+    def __del__(self) -> None:
+        self._finish(None)
+
+
+_shared: RateController | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_controller() -> RateController:
+    """The process-wide controller, so every Bedrock caller sees the same limits."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateController()
+        return _shared
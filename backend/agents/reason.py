@@ -4,12 +4,28 @@ structured root-cause analysis with full reasoning chain visibility.
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import os
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable
 
-import boto3  # type: ignore
-from botocore.exceptions import ClientError, NoCredentialsError
+from botocore.exceptions import NoCredentialsError
+
+from .bedrock import BedrockExecutor
+from .cache import AnalysisCache
+from .similarity import SimilarityIndex
+
+MODEL_ID = os.getenv("NOVA_MODEL_ID", "amazon.nova-pro-v1:0")
+# First-pass model for the cascade (see ReasonAgent.cascade)
+TRIAGE_MODEL_ID = os.getenv("NOVA_TRIAGE_MODEL_ID", "amazon.nova-lite-v1:0")
+
+# On-demand USD per 1K (input, output) tokens, for per-run cost estimates
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "amazon.nova-pro-v1:0": (0.0008, 0.0032),
+    "amazon.nova-lite-v1:0": (0.00006, 0.00024),
+    "amazon.nova-micro-v1:0": (0.000035, 0.00014),
+}
 
 
 SYSTEM_PROMPT = """You are an expert AWS DevOps SRE. Analyze the provided infrastructure event and produce a structured root-cause analysis.
@@ -34,69 +50,484 @@ confidence must be 0.0-1.0. recommended_action must be exactly one of: auto_fix,
 Only recommend auto_fix for high-confidence (>0.80), well-understood issues with safe automated remediation.
 """
 
+BATCH_SYSTEM_PROMPT = """You are an expert AWS DevOps SRE. You will receive several independent infrastructure events. Analyze EACH event on its own and produce a structured root-cause analysis for every one.
+
+Your response MUST be a valid JSON array containing exactly one object per event, each with this exact structure:
+[
+  {
+    "event_id": "the event ID exactly as given",
+    "root_cause": "concise root cause in 1-2 sentences",
+    "confidence": 0.85,
+    "impact": "description of business/technical impact",
+    "reasoning_steps": ["Step 1: observation or deduction", "Step 2: ..."],
+    "recommended_action": "auto_fix | escalate | monitor",
+    "fix_description": "specific remediation steps",
+    "related_services": ["ServiceA", "ServiceB"],
+    "estimated_resolution_time": "5 minutes"
+  }
+]
+
+confidence must be 0.0-1.0. recommended_action must be exactly one of: auto_fix, escalate, monitor.
+Only recommend auto_fix for high-confidence (>0.80), well-understood issues with safe automated remediation.
+"""
+
+VALID_ACTIONS = {"auto_fix", "escalate", "monitor"}
+
+# Output tokens reserved per event in a batched request
+OUTPUT_TOKENS_PER_EVENT = 400
+
+
+def prompt_version(*parts: Any) -> str:
+    """Short hash of everything that shapes an answer: models, prompts, settings."""
+    return hashlib.sha256("\n".join(str(p) for p in parts).encode()).hexdigest()[:12]
+
+
+# Cache entries are only valid for the prompts + model that produced them.
+# Batched and single-event answers share entries, so both prompts count.
+PROMPT_VERSION = prompt_version(MODEL_ID, SYSTEM_PROMPT, BATCH_SYSTEM_PROMPT)
+
+
+def _describe_event(event: dict[str, Any]) -> str:
+    text = f"""Source: {event['source']}
+Service: {event['service']}
+Resource: {event['resource']}
+Metric: {event['metric']}
+Value: {event['value']} (threshold: {event['threshold']})
+Severity: {event['severity']}
+Message: {event['message']}
+Timestamp: {event['timestamp']}"""
+    correlated = event.get("correlated_events")
+    if correlated:
+        text += "\nCorrelated events (same incident — give ONE root cause covering all of them):\n" + "\n".join(
+            f"- [{e['severity']}] {e['source']} {e['service']} {e['resource']}: "
+            f"{e['metric']}={e['value']} (threshold {e['threshold']}) — {e['message']}"
+            for e in correlated
+        )
+    return text
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars/token) — good enough for request packing."""
+    return len(text) // 4 + 1
+
+
+def _strip_fences(raw: str) -> str:
+    """Strip markdown code fences around a JSON payload."""
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("```")[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+    return raw.strip()
+
+
+def _usage(response: dict[str, Any], model_id: str, share: int = 1) -> dict[str, Any]:
+    """Token usage (split evenly across `share` events) and its estimated cost."""
+    usage = response.get("usage") or {}
+    input_tokens = usage.get("inputTokens", 0) / share
+    output_tokens = usage.get("outputTokens", 0) / share
+    # Cross-region inference profiles ("us.amazon.nova-…") bill as the base model
+    base = model_id.split(".", 1)[1] if model_id.count(".") > 1 else model_id
+    in_price, out_price = MODEL_PRICES.get(base, (0.0, 0.0))
+    return {
+        "input_tokens": round(input_tokens),
+        "output_tokens": round(output_tokens),
+        "cost_usd": round((input_tokens * in_price + output_tokens * out_price) / 1000, 6),
+    }
+
+
+def _is_valid_analysis(item: Any) -> bool:
+    """Schema check for one analysis object returned by the model."""
+    if not isinstance(item, dict):
+        return False
+    confidence = item.get("confidence")
+    return (
+        isinstance(item.get("root_cause"), str)
+        and isinstance(confidence, (int, float))
+        and 0.0 <= confidence <= 1.0
+        and isinstance(item.get("reasoning_steps"), list)
+        and item.get("recommended_action") in VALID_ACTIONS
+    )
+
 
 class ReasonAgent:
     """
     Calls Amazon Nova Pro via Bedrock to reason about infrastructure events.
-    Falls back to deterministic mock reasoning when credentials are absent.
+    Falls back to deterministic mock reasoning when credentials are absent;
+    any other Bedrock failure is reported as a failed analysis.
+
+    Cascade mode (opt-in) sends each event to a cheaper triage model first
+    and promotes it to Nova Pro only when the triage answer is low-confidence,
+    recommends auto_fix, failed, or the event's severity is in
+    promote_severities (those go straight to Pro). Every analysis records the
+    `tier` that answered; promoted ones keep the triage verdict in `promoted_from`.
+
+    With a similarity index, an event close enough to one analyzed before is
+    answered at once with that analysis, marked provisional and labelled
+    with `similar_to` (source analysis id and score); Nova then analyzes the
+    event in the background and that answer carries `confirms`. For
+    analyze() the confirmed answer is handed to `on_confirmed(event, analysis)`.
     """
 
-    def __init__(self, use_mock: bool = True):
+    def __init__(
+        self,
+        use_mock: bool = True,
+        executor: BedrockExecutor | None = None,
+        cache: AnalysisCache | None = None,
+        batch_size: int = 0,
+        batch_token_budget: int = 6000,
+        batch_severities: tuple[str, ...] = ("low", "medium"),
+        cascade: bool = False,
+        triage_model_id: str = TRIAGE_MODEL_ID,
+        promote_below: float = 0.8,
+        promote_severities: tuple[str, ...] = ("critical",),
+        similarity: SimilarityIndex | None = None,
+        on_confirmed: Callable[[dict[str, Any], dict[str, Any]], None] | None = None,
+    ):
         self.use_mock = use_mock
-        self._client = None
+        self._executor = executor
+        self.cache = cache
+        # Batch mode (opt-in): pack up to batch_size events of the given
+        # severities into one request, bounded by batch_token_budget
+        self.batch_size = batch_size
+        self.batch_token_budget = batch_token_budget
+        self.batch_severities = set(batch_severities)
+        self.batches_sent = 0
+        self.batched_events = 0
+        self.batch_retries = 0
+        self.cascade = cascade
+        self.triage_model_id = triage_model_id
+        self.promote_below = promote_below
+        self.promote_severities = set(promote_severities)
+        self.answered_by_triage = 0
+        self.sent_to_pro = 0
+        self.promotions: dict[str, int] = {}
+        # Triage answers are cached too, so the cascade settings are part of the key
+        self.prompt_version = PROMPT_VERSION if not cascade else prompt_version(
+            PROMPT_VERSION, triage_model_id, promote_below, sorted(self.promote_severities)
+        )
+        self.similarity = similarity
+        self.provisional_served = 0
+        self.confirmations = {"agreed": 0, "changed": 0, "failed": 0}
+        # Background confirmations started by analyze() — held so they aren't collected
+        self._confirming: set[asyncio.Task] = set()
+        self.on_confirmed = on_confirmed
 
-    def _get_client(self):
-        if self._client is None:
-            self._client = boto3.client("bedrock-runtime", region_name=os.getenv("AWS_REGION", "us-east-1"))
-        return self._client
+    @property
+    def executor(self) -> BedrockExecutor:
+        if self._executor is None:
+            self._executor = BedrockExecutor()
+        return self._executor
 
     async def analyze(self, event: dict[str, Any]) -> dict[str, Any]:
         """Return structured analysis for a single event."""
         if self.use_mock:
             return self._mock_analysis(event)
-        return await self._nova_analysis(event)
+        cached = self._from_cache(event)
+        if cached is not None:
+            return cached
+        similar = self._from_index(event)
+        if similar is not None:
+            task = asyncio.ensure_future(self._confirm_in_background(event, similar))
+            self._confirming.add(task)
+            task.add_done_callback(self._confirming.discard)
+            return similar
+        return await self._analyze_uncached(event)
+
+    async def analyze_many(self, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Analyze a list of events, returning analyses in input order.
+        With batch mode on, eligible events share multi-event requests.
+        Near-duplicates are returned as confirmed, not provisional.
+        """
+        results = {a["event_id"]: a async for a in self.analyze_stream(events)}
+        return [results[e["id"]] for e in events]
+
+    async def analyze_stream(self, events: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+        """
+        Yield analyses in completion order — fastest first. A near-duplicate
+        event is yielded twice: provisional at once, confirmed later.
+        """
+        hits, jobs = self._jobs(events)
+        # Started before the hits are handed out; a confirmation that is
+        # ready at once must still follow its provisional answer
+        running = [asyncio.ensure_future(job) for job in jobs]
+        for analysis in hits:
+            yield analysis
+        for job in asyncio.as_completed(running):
+            outcome = await job
+            for analysis in outcome if isinstance(outcome, list) else [outcome]:
+                yield analysis
+
+    def _jobs(self, events: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[Awaitable[Any]]]:
+        """Split events into ready answers (cache hits, provisional) and one awaitable per request."""
+        if self.use_mock:
+            return [], [self.analyze(e) for e in events]
 
-    async def _nova_analysis(self, event: dict[str, Any]) -> dict[str, Any]:
-        """Call Amazon Nova Pro via Bedrock Converse API."""
+        hits: list[dict[str, Any]] = []
+        jobs: list[Awaitable[Any]] = []
+        batchable: list[dict[str, Any]] = []
+        single: list[dict[str, Any]] = []
+        for event in events:
+            cached = self._from_cache(event)
+            if cached is not None:
+                hits.append(cached)
+                continue
+            similar = self._from_index(event)
+            if similar is not None:
+                hits.append(similar)
+                jobs.append(self._confirm(event, similar))
+            elif self.batch_size > 1 and event.get("severity") in self.batch_severities:
+                batchable.append(event)
+            else:
+                single.append(event)
+
+        batches = self._pack(batchable)
+        single += [b[0] for b in batches if len(b) == 1]
+        jobs += [self._analyze_batch(b) for b in batches if len(b) > 1]
+        jobs += [self._analyze_uncached(e) for e in single]
+        return hits, jobs
+
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            "batch_size": self.batch_size,
+            "batches_sent": self.batches_sent,
+            "batched_events": self.batched_events,
+            "batch_retries": self.batch_retries,
+        }
+        if self.cascade:
+            stats["cascade"] = {
+                "triage_model": self.triage_model_id,
+                "answered_by_triage": self.answered_by_triage,
+                "sent_to_pro": self.sent_to_pro,
+                "promotions": dict(self.promotions),
+            }
+        if self.similarity is not None:
+            stats["similarity"] = {
+                **self.similarity.stats(),
+                "provisional_served": self.provisional_served,
+                "confirmations": dict(self.confirmations),
+            }
+        return stats
+
+    def _from_cache(self, event: dict[str, Any]) -> dict[str, Any] | None:
+        if self.cache is None or not self.cache.enabled:
+            return None
+        cached = self.cache.get(self.cache.key_for(event, self.prompt_version))
+        if cached is not None:
+            # Same fingerprint, different alarm instance — report the live id
+            cached["event_id"] = event["id"]
+        return cached
+
+    def _store(self, event: dict[str, Any], analysis: dict[str, Any]) -> None:
+        # Only genuine model output is cached or indexed — never fallbacks or errors
+        models = {MODEL_ID, self.triage_model_id} if self.cascade else {MODEL_ID}
+        if analysis.get("model") not in models:
+            return
+        if self.similarity is not None and self.similarity.enabled:
+            analysis["analysis_id"] = self.similarity.add(event, analysis, self.prompt_version)
+        if self.cache is not None and self.cache.enabled:
+            self.cache.set(self.cache.key_for(event, self.prompt_version), analysis)
+
+    def _from_index(self, event: dict[str, Any]) -> dict[str, Any] | None:
+        """
+        Provisional analysis copied from the most similar indexed event, or
+        None. An auto_fix recommendation is downgraded to escalate until the
+        event's own analysis confirms it.
+        """
+        if self.similarity is None:
+            return None
+        found = self.similarity.match(event, self.prompt_version)
+        if found is None:
+            return None
+        analysis, analysis_id, source_event_id, score = found
+        for key in ("analysis_id", "cache", "usage", "latency_ms", "batch_size", "promoted_from", "confirms"):
+            analysis.pop(key, None)
+        action = analysis.get("recommended_action")
+        analysis["reasoning_steps"] = [
+            f"Provisional: reused analysis {analysis_id} of {source_event_id} "
+            f"(similarity {score:.2f}) — awaiting Nova confirmation.",
+            *analysis.get("reasoning_steps", []),
+        ]
+        analysis.update(
+            event_id=event["id"],
+            model="similarity-index",
+            tier="similar",
+            provisional=True,
+            similar_to={"analysis_id": analysis_id, "event_id": source_event_id, "similarity": score},
+            source_recommended_action=action,
+            recommended_action="escalate" if action == "auto_fix" else action,
+        )
+        self.provisional_served += 1
+        return analysis
+
+    async def _confirm(self, event: dict[str, Any], provisional: dict[str, Any]) -> dict[str, Any]:
+        """The event's own analysis, labelled with the provisional answer it confirms or replaces."""
+        analysis = await self._analyze_uncached(event)
+        if analysis.get("model") == "error":
+            outcome = "failed"
+        elif analysis.get("recommended_action") == provisional["source_recommended_action"]:
+            outcome = "agreed"
+        else:
+            outcome = "changed"
+        self.confirmations[outcome] += 1
+        analysis["confirms"] = {
+            **provisional["similar_to"],
+            "agreed": outcome == "agreed",
+            "provisional_action": provisional["recommended_action"],
+        }
+        return analysis
+
+    async def _confirm_in_background(self, event: dict[str, Any], provisional: dict[str, Any]) -> None:
+        analysis = await self._confirm(event, provisional)
+        if self.on_confirmed is not None:
+            self.on_confirmed(event, analysis)
+
+    async def _analyze_uncached(self, event: dict[str, Any]) -> dict[str, Any]:
+        if self.cascade and event.get("severity") not in self.promote_severities:
+            analysis = await self._settle_triage(event, await self._nova_analysis(event, self.triage_model_id))
+        else:
+            analysis = await self._nova_analysis(event)
+            if self.cascade:
+                self.sent_to_pro += 1
+        self._store(event, analysis)
+        return analysis
+
+    def _promotion_reason(self, event: dict[str, Any], triage: dict[str, Any]) -> str | None:
+        """Why a triage answer needs Nova Pro, or None if it stands."""
+        if triage.get("model") != self.triage_model_id:
+            return "triage_failed"
+        if event.get("severity") in self.promote_severities:
+            return "severity"
+        if triage.get("recommended_action") == "auto_fix":
+            return "auto_fix"
+        if float(triage.get("confidence") or 0.0) < self.promote_below:
+            return "low_confidence"
+        return None
+
+    async def _settle_triage(self, event: dict[str, Any], triage: dict[str, Any]) -> dict[str, Any]:
+        """Keep a triage answer, or replace it with Nova Pro's and note what triage said."""
+        if str(triage.get("model", "")).endswith("(mock)"):
+            return triage
+        reason = self._promotion_reason(event, triage)
+        if reason is None:
+            self.answered_by_triage += 1
+            return triage
+        self.promotions[reason] = self.promotions.get(reason, 0) + 1
+        self.sent_to_pro += 1
+        analysis = await self._nova_analysis(event)
+        analysis["promoted_from"] = {
+            "model": self.triage_model_id,
+            "reason": reason,
+            "confidence": triage.get("confidence"),
+            "recommended_action": triage.get("recommended_action"),
+            "latency_ms": triage.get("latency_ms"),
+            "usage": triage.get("usage"),
+        }
+        return analysis
+
+    def _tier(self, model_id: str) -> str:
+        return "triage" if self.cascade and model_id == self.triage_model_id else "pro"
+
+    def _pack(self, events: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        """Greedily pack events into batches bounded by size and token budget."""
+        batches: list[list[dict[str, Any]]] = []
+        current: list[dict[str, Any]] = []
+        used = _estimate_tokens(BATCH_SYSTEM_PROMPT)
+        for event in events:
+            cost = _estimate_tokens(_describe_event(event)) + OUTPUT_TOKENS_PER_EVENT
+            if current and (len(current) >= self.batch_size or used + cost > self.batch_token_budget):
+                batches.append(current)
+                current, used = [], _estimate_tokens(BATCH_SYSTEM_PROMPT)
+            current.append(event)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _analyze_batch(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        One Converse call for several events. The response must be a JSON
+        array keyed by event_id; missing or malformed entries are re-sent
+        individually.
+        """
+        user_message = "Analyze each of these AWS infrastructure events:\n\n" + "\n\n".join(
+            f"Event ID: {e['id']}\n{_describe_event(e)}" for e in batch
+        ) + "\n\nReturn a JSON array with one root-cause analysis per event ID."
+
+        model_id = self.triage_model_id if self.cascade else MODEL_ID
+        items: Any = []
+        latency_ms = 0.0
+        response: dict[str, Any] = {}
+        try:
+            response, latency_ms = await self.executor.converse(
+                modelId=model_id,
+                system=[{"text": BATCH_SYSTEM_PROMPT}],
+                messages=[{"role": "user", "content": [{"text": user_message}]}],
+                inferenceConfig={"maxTokens": OUTPUT_TOKENS_PER_EVENT * len(batch), "temperature": 0.1},
+            )
+            items = json.loads(_strip_fences(response["output"]["message"]["content"][0]["text"]))
+        except Exception:
+            # Whole batch lost — every event is retried on the single-event path
+            items = []
+        self.batches_sent += 1
+
+        by_id = {item.get("event_id"): item for item in items if isinstance(item, dict)} if isinstance(items, list) else {}
+        answered: list[tuple[dict[str, Any], dict[str, Any]]] = []
+        retry: list[dict[str, Any]] = []
+        for event in batch:
+            item = by_id.get(event["id"])
+            if not _is_valid_analysis(item):
+                retry.append(event)
+                continue
+            item["model"] = model_id
+            item["tier"] = self._tier(model_id)
+            item["latency_ms"] = round(latency_ms, 1)
+            item["batch_size"] = len(batch)
+            item["usage"] = _usage(response, model_id, share=len(batch))
+            answered.append((event, item))
+
+        self.batched_events += len(answered)
+        self.batch_retries += len(retry)
+        if self.cascade:
+            settled = await asyncio.gather(*[self._settle_triage(e, item) for e, item in answered])
+            answered = [(e, a) for (e, _), a in zip(answered, settled)]
+        for event, item in answered:
+            self._store(event, item)
+        analyses = [item for _, item in answered]
+        analyses += await asyncio.gather(*[self._analyze_uncached(e) for e in retry])
+        return analyses
+
+    async def _nova_analysis(self, event: dict[str, Any], model_id: str = MODEL_ID) -> dict[str, Any]:
+        """Call a Nova model (Pro unless a triage model is given) via Bedrock Converse API."""
         try:
-            client = self._get_client()
             user_message = f"""Analyze this AWS infrastructure event:
 
-Source: {event['source']}
-Service: {event['service']}
-Resource: {event['resource']}
-Metric: {event['metric']}
-Value: {event['value']} (threshold: {event['threshold']})
-Severity: {event['severity']}
-Message: {event['message']}
-Timestamp: {event['timestamp']}
+{_describe_event(event)}
 
 Provide structured root-cause analysis as JSON."""
 
-            response = client.converse(
-                modelId="amazon.nova-pro-v1:0",
+            response, latency_ms = await self.executor.converse(
+                modelId=model_id,
                 system=[{"text": SYSTEM_PROMPT}],
                 messages=[{"role": "user", "content": [{"text": user_message}]}],
                 inferenceConfig={"maxTokens": 1024, "temperature": 0.1},
             )
 
             raw = response["output"]["message"]["content"][0]["text"]
-            # Strip markdown fences
-            raw = raw.strip()
-            if raw.startswith("```"):
-                raw = raw.split("```")[1]
-                if raw.startswith("json"):
-                    raw = raw[4:]
-            raw = raw.strip()
-
-            analysis = json.loads(raw)
+            analysis = json.loads(_strip_fences(raw))
             analysis["event_id"] = event["id"]
-            analysis["model"] = "amazon.nova-pro-v1:0"
+            analysis["model"] = model_id
+            analysis["tier"] = self._tier(model_id)
+            analysis["latency_ms"] = round(latency_ms, 1)
+            analysis["usage"] = _usage(response, model_id)
             return analysis
 
-        except (NoCredentialsError, ClientError):
+        except NoCredentialsError:
             return self._mock_analysis(event)
         except Exception as exc:
+            # Includes throttling that outlasted the executor's retry deadline:
+            # surfaced as a failed analysis (and escalated), never as mock output
             return {
                 "event_id": event["id"],
                 "root_cause": f"Analysis failed: {exc}",
@@ -110,6 +541,22 @@ Provide structured root-cause analysis as JSON."""
                 "model": "error",
             }
 
+    def provisional_analysis(self, event: dict[str, Any]) -> dict[str, Any]:
+        """
+        Stand-in for an analysis that missed its run's deadline: the
+        deterministic fallback, always escalated, and marked provisional.
+        """
+        analysis = self._mock_analysis(event)
+        analysis["reasoning_steps"] = [
+            "Provisional: Nova analysis did not finish within the run deadline — fallback shown, routed to HITL.",
+            *analysis["reasoning_steps"],
+        ]
+        analysis["recommended_action"] = "escalate"
+        analysis["model"] = "fallback"
+        analysis["tier"] = "provisional"
+        analysis["provisional"] = True
+        return analysis
+
     def _mock_analysis(self, event: dict[str, Any]) -> dict[str, Any]:
         """Deterministic mock analysis for demo/testing."""
         mock_map = {
@@ -192,7 +639,8 @@ Provide structured root-cause analysis as JSON."""
             },
         }
 
-        analysis = mock_map.get(event["id"], {
+        # Correlation clusters reuse their primary event's canned analysis
+        analysis = mock_map.get(event.get("primary_event_id", event["id"]), {
             "root_cause": f"Anomaly detected in {event['service']} — {event['metric']} exceeded threshold.",
             "confidence": 0.65,
             "impact": "Service degradation detected. Scope under investigation.",
@@ -0,0 +1,196 @@
+"""
+Similarity index — near-duplicate lookup over past ReasonAgent analyses.
+
+The analysis cache only answers exact (bucketed) repeats. Alarms are
+usually near-repeats instead: same service and metric, a slightly
+different value, another instance of the same Auto Scaling group. Each
+analyzed event is reduced to a token set — normalized message words and
+bigrams, a resource *pattern* with ids masked out, a coarse value/threshold
+ratio — and indexed with MinHash/LSH. Candidates must share source,
+service, metric and severity; the best one is scored by exact Jaccard
+similarity of the token sets.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import itertools
+import os
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .cache import bucket
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9_.\-]*|\d+(?:\.\d+)?")
+# Instance / volume / hex ids and numeric suffixes: i-0a1b2c3d4e5f → i-*, web-03 → web-*
+_ID_RE = re.compile(r"(?<=-)[0-9a-f]{6,}\b|\d+")
+_PRIME = (1 << 61) - 1
+
+
+def resource_pattern(resource: str) -> str:
+    return _ID_RE.sub("*", resource.lower())
+
+
+def tokens(event: dict[str, Any]) -> frozenset[str]:
+    """The token set compared between events."""
+    # Ids and numbers in the message are masked like the resource: "CPU 94.7% on i-0a1b…" → "cpu # on i-#"
+    words = [_ID_RE.sub("#", w) for w in _WORD_RE.findall(str(event.get("message", "")).lower())]
+    features = {f"w:{w}" for w in words}
+    features.update(f"b:{a} {b}" for a, b in zip(words, words[1:]))
+    pattern = resource_pattern(str(event.get("resource", "")))
+    features.add(f"res:{pattern}")
+    features.update(f"rp:{part}" for part in re.split(r"[/:]", pattern) if part)
+    value, threshold = event.get("value"), event.get("threshold")
+    if isinstance(value, (int, float)) and isinstance(threshold, (int, float)) and threshold:
+        # ~25%-wide buckets: 94.7 vs 91.2 against a threshold of 80 land together
+        features.add(f"ratio:{bucket(value / threshold, 0.25)}")
+    return frozenset(features)
+
+
+def _block(event: dict[str, Any], version: str) -> tuple[str, ...]:
+    return (
+        version,
+        str(event.get("source", "")),
+        str(event.get("service", "")),
+        str(event.get("metric", "")),
+        str(event.get("severity", "")),
+    )
+
+
+class _Entry:
+    __slots__ = ("analysis_id", "event_id", "stored_at", "block", "tokens", "bands", "analysis")
+
+    def __init__(self, analysis_id, event_id, stored_at, block, tokens, bands, analysis):
+        self.analysis_id = analysis_id
+        self.event_id = event_id
+        self.stored_at = stored_at
+        self.block = block
+        self.tokens = tokens
+        self.bands = bands
+        self.analysis = analysis
+
+
+class SimilarityIndex:
+    """
+    Bounded MinHash/LSH index of analyzed events. `num_perm` hash functions
+    are split into `bands`; two events become candidates when any band's
+    signature slice matches (~50% Jaccard at the defaults), then only
+    matches at or above `threshold` are returned.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.0,
+        ttl_seconds: float = 3600,
+        max_entries: int = 2048,
+        num_perm: int = 64,
+        bands: int = 16,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(0x5EED)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(self.rows * bands)]
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._by_event: dict[tuple[tuple[str, ...], str], str] = {}
+        self._buckets: dict[tuple, set[str]] = {}
+        self._ids = itertools.count(1)
+        self.lookups = 0
+        self.matches = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "SimilarityIndex":
+        return cls(
+            threshold=float(os.getenv("SIMILARITY_THRESHOLD", "0")),
+            ttl_seconds=float(os.getenv("SIMILARITY_TTL", "3600")),
+            max_entries=int(os.getenv("SIMILARITY_MAX_ENTRIES", "2048")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def _bands(self, features: frozenset[str]) -> list[tuple[int, ...]]:
+        hashed = [int.from_bytes(hashlib.blake2b(f.encode(), digest_size=8).digest(), "big") for f in features]
+        signature = [min((a * h + b) % _PRIME for h in hashed) for a, b in self._perms]
+        return [tuple(signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def _remove(self, analysis_id: str) -> None:
+        entry = self._entries.pop(analysis_id, None)
+        if entry is None:
+            return
+        if self._by_event.get((entry.block, entry.event_id)) == analysis_id:
+            del self._by_event[(entry.block, entry.event_id)]
+        for i, band in enumerate(entry.bands):
+            ids = self._buckets.get((entry.block, i, band))
+            if ids is not None:
+                ids.discard(analysis_id)
+                if not ids:
+                    del self._buckets[(entry.block, i, band)]
+
+    def add(self, event: dict[str, Any], analysis: dict[str, Any], version: str) -> str:
+        """Index an analyzed event; returns the id the analysis is known by."""
+        block = _block(event, version)
+        previous = self._by_event.get((block, event["id"]))
+        if previous is not None:
+            self._remove(previous)
+        analysis_id = f"an-{next(self._ids):06d}-{hashlib.sha256(str(event['id']).encode()).hexdigest()[:6]}"
+        features = tokens(event)
+        entry = _Entry(analysis_id, event["id"], time.time(), block, features, self._bands(features), copy.deepcopy(analysis))
+        self._entries[analysis_id] = entry
+        self._by_event[(block, event["id"])] = analysis_id
+        for i, band in enumerate(entry.bands):
+            self._buckets.setdefault((block, i, band), set()).add(analysis_id)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return analysis_id
+
+    def match(self, event: dict[str, Any], version: str) -> tuple[dict[str, Any], str, str, float] | None:
+        """
+        Best indexed match for event at or above the threshold, as
+        (analysis copy, source analysis id, source event id, similarity).
+        Correlation clusters are never matched — their member set matters.
+        """
+        if not self.enabled or event.get("correlated_events"):
+            return None
+        self.lookups += 1
+        block = _block(event, version)
+        features = tokens(event)
+        candidates: set[str] = set()
+        for i, band in enumerate(self._bands(features)):
+            candidates |= self._buckets.get((block, i, band), set())
+        cutoff = time.time() - self.ttl_seconds
+        best: tuple[float, _Entry] | None = None
+        for analysis_id in candidates:
+            entry = self._entries[analysis_id]
+            if entry.stored_at < cutoff or entry.event_id == event["id"]:
+                continue
+            score = len(features & entry.tokens) / len(features | entry.tokens)
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, entry)
+        if best is None:
+            return None
+        self.matches += 1
+        score, entry = best
+        self._entries.move_to_end(entry.analysis_id)
+        return copy.deepcopy(entry.analysis), entry.analysis_id, entry.event_id, round(score, 3)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "lookups": self.lookups,
+            "matches": self.matches,
+            "match_ratio": round(self.matches / self.lookups, 3) if self.lookups else None,
+            "evictions": self.evictions,
+        }
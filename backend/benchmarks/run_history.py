@@ -0,0 +1,101 @@
+"""
+Run-history payload benchmark.
+
+Builds 1,000 pipeline run records from the mock Monitor/Reason data and
+reports, per list projection, the JSON payload size (raw and gzipped) and
+serialization time with the stdlib encoder and with orjson (if installed).
+
+    cd backend && python -m benchmarks.run_history [--runs 1000]
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from agents import MonitorAgent, ReasonAgent
+from runtime import encoding, project, summarize
+
+
+def build_runs(count: int) -> list[dict[str, Any]]:
+    events = MonitorAgent(use_mock=True).collect()
+    reason = ReasonAgent(use_mock=True)
+    results = [
+        {
+            "event": event,
+            "analysis": analysis,
+            "action_taken": analysis["recommended_action"],
+            "execution": None,
+            "escalation": None,
+        }
+        for event, analysis in ((e, reason._mock_analysis(e)) for e in events)
+    ]
+    start = datetime(2026, 1, 1)
+    runs = []
+    for i in range(count):
+        started = start + timedelta(minutes=5 * i)
+        runs.append({
+            "run_id": f"run-{started:%Y%m%d%H%M%S}-{i:06x}",
+            "started_at": started.isoformat() + "Z",
+            "completed_at": (started + timedelta(seconds=4)).isoformat() + "Z",
+            "duration_ms": 4012.5,
+            "reason_duration_ms": 3650.2,
+            "time_to_first_result_ms": 1180.4,
+            "events_processed": len(events),
+            "mode": "full",
+            "events_reasoned": len(events),
+            "events_carried_forward": 0,
+            "reasoning_calls": len(events),
+            "clusters": [],
+            "snapshot_version": i,
+            "snapshot_age_seconds": 2.1,
+            "auto_fixed": sum(r["action_taken"] == "auto_fix" for r in results),
+            "escalated": sum(r["action_taken"] != "auto_fix" for r in results),
+            "results": results,
+        })
+    return runs
+
+
+def _time_ms(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = build_runs(args.runs)
+    fields = ["run_id", "started_at", "events_processed", "auto_fixed", "escalated"]
+    projections = {
+        "full (include=results)": runs,
+        "summary (default)": [summarize(r) for r in runs],
+        f"fields={','.join(fields)}": [project(summarize(r), fields) for r in runs],
+    }
+
+    header = f"{'projection':<62} {'bytes':>11} {'gzip':>10} {'json ms':>9} {'orjson ms':>10}"
+    print(f"{args.runs} runs")
+    print(header)
+    print("-" * len(header))
+    for name, payload in projections.items():
+        body = {"runs": payload, "count": len(payload), "next_cursor": None}
+        raw = json.dumps(body, default=str).encode()
+        stdlib_ms = _time_ms(lambda: json.dumps(body, default=str), args.repeat)
+        fast_ms = _time_ms(lambda: encoding.dumps(body), args.repeat) if encoding.orjson else None
+        print(
+            f"{name:<62} {len(raw):>11,} {len(gzip.compress(raw)):>10,} "
+            f"{stdlib_ms:>9.1f} {fast_ms if fast_ms is None else round(fast_ms, 1)!s:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,22 +6,105 @@ Powered by Amazon Nova Pro via AWS Bedrock
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import logging
 import os
+import secrets
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from agents import MonitorAgent, ReasonAgent, ActAgent, EscalateAgent
+from agents import MonitorAgent, ReasonAgent, ActAgent, EscalateAgent, BedrockExecutor, AnalysisCache, SimilarityIndex
+from agents.cache import fingerprint
+from agents.correlate import Correlator
+from runtime import (
+    EventSnapshot,
+    FastJSONResponse,
+    IncrementalState,
+    RunFeed,
+    SingleFlight,
+    SnapshotPoller,
+    StreamGZipMiddleware,
+    UpdateHub,
+    open_run_store,
+    project,
+)
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # ── Config ──────────────────────────────────────────────────────────────────
 # Default to False in production — set USE_MOCK=true only for local dev
 USE_MOCK = os.getenv("USE_MOCK", "false").lower() == "true"
+# Serve a just-finished run/analysis to callers arriving within this window
+REUSE_WINDOW_SECONDS = float(os.getenv("SINGLEFLIGHT_REUSE_SECONDS", "0"))
+# Max remediations executing at once (never more than one per resource)
+ACT_MAX_CONCURRENCY = int(os.getenv("ACT_MAX_CONCURRENCY", "4"))
+# Background Monitor collection interval — read endpoints serve the snapshot
+MONITOR_REFRESH_SECONDS = float(os.getenv("MONITOR_REFRESH_SECONDS", "30"))
+# Live collection fan-out: sources × regions on one bounded pool
+MONITOR_REGIONS = [r.strip() for r in os.getenv("MONITOR_REGIONS", os.getenv("AWS_REGION", "us-east-1")).split(",") if r.strip()]
+MONITOR_SOURCES = tuple(
+    s.strip() for s in os.getenv("MONITOR_SOURCES", "cloudwatch,cost_explorer,security_hub").split(",") if s.strip()
+)
+MONITOR_MAX_WORKERS = int(os.getenv("MONITOR_MAX_WORKERS", "16"))
+MONITOR_SOURCE_TIMEOUT = float(os.getenv("MONITOR_SOURCE_TIMEOUT", "10"))
+# Incremental runs re-reason only new/changed events; state persists to this file
+PIPELINE_INCREMENTAL = os.getenv("PIPELINE_INCREMENTAL", "false").lower() == "true"
+INCREMENTAL_STATE_PATH = os.getenv("INCREMENTAL_STATE_PATH") or None
+# Pipeline run history — sqlite (durable, default) or memory
+RUN_STORE = os.getenv("RUN_STORE", "sqlite")
+RUN_STORE_PATH = os.getenv("RUN_STORE_PATH", "pipeline_runs.db")
+RUN_STORE_RETENTION_DAYS = float(os.getenv("RUN_STORE_RETENTION_DAYS", "180"))
+# Responses larger than this are gzip-compressed when the client accepts it (0 disables)
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "1024"))
+# Correlation stage — cluster related events and reason once per cluster
+PIPELINE_CORRELATE = os.getenv("PIPELINE_CORRELATE", "true").lower() == "true"
+CORRELATION_WINDOW_SECONDS = float(os.getenv("CORRELATION_WINDOW_SECONDS", "900"))
+# Per-run latency budget in seconds (0 = none); ?deadline= overrides per request
+PIPELINE_DEADLINE_SECONDS = float(os.getenv("PIPELINE_DEADLINE_SECONDS", "0"))
+# Resolved escalations kept for /escalations/all (oldest dropped first)
+ESCALATION_ARCHIVE_SIZE = int(os.getenv("ESCALATION_ARCHIVE_SIZE", "1000"))
+
+UPDATES_BUFFER_SIZE = int(os.getenv("UPDATES_BUFFER_SIZE", "256"))
+UPDATES_HISTORY_SIZE = int(os.getenv("UPDATES_HISTORY_SIZE", "1024"))
+UPDATES_HEARTBEAT_SECONDS = float(os.getenv("UPDATES_HEARTBEAT_SECONDS", "15"))
+
+# Batched reasoning — 0 disables; events of REASON_BATCH_SEVERITIES share requests
+REASON_BATCH_SIZE = int(os.getenv("REASON_BATCH_SIZE", "0"))
+REASON_BATCH_TOKEN_BUDGET = int(os.getenv("REASON_BATCH_TOKEN_BUDGET", "6000"))
+REASON_BATCH_SEVERITIES = tuple(
+    s.strip() for s in os.getenv("REASON_BATCH_SEVERITIES", "low,medium").split(",") if s.strip()
+)
+REASON_CASCADE = os.getenv("REASON_CASCADE", "false").lower() == "true"
+REASON_PROMOTE_BELOW = float(os.getenv("REASON_PROMOTE_BELOW", "0.8"))
+REASON_PROMOTE_SEVERITIES = tuple(
+    s.strip() for s in os.getenv("REASON_PROMOTE_SEVERITIES", "critical").split(",") if s.strip()
+)
+
+# ── Shared Bedrock executor (thread pool + per-model concurrency limits) ──────
+bedrock = BedrockExecutor()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    monitor_poller.start()
+    yield
+    for task in list(background_tasks):
+        task.cancel()
+    await monitor_poller.stop()
+    await run_store.close()
+    bedrock.shutdown()
+
 
 # ── App ──────────────────────────────────────────────────────────────────────
 app = FastAPI(
@@ -29,6 +112,7 @@ app = FastAPI(
     description="AI-powered DevOps assistant — Amazon Nova Pro + 4-agent pipeline",
     version="1.0.0",
     docs_url="/docs",
+    lifespan=lifespan,
 )
 
 # ── CORS — explicit origins (wildcard + credentials is invalid per CORS spec) ──
@@ -46,14 +130,92 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization"],
 )
 
+# ── Compression — run history and pipeline traces are large, repetitive JSON ──
+# Server-Sent Events are never compressed, whatever the installed Starlette does
+STREAM_PATHS = ("/pipeline/run/stream", "/stream/updates")
+if GZIP_MIN_BYTES > 0:
+    app.add_middleware(StreamGZipMiddleware, minimum_size=GZIP_MIN_BYTES, skip_paths=STREAM_PATHS)
+
+# ── Update hub — pushes queue / run changes to /stream/updates clients ───────
+update_hub = UpdateHub(
+    buffer_size=UPDATES_BUFFER_SIZE,
+    history_size=UPDATES_HISTORY_SIZE,
+    heartbeat_seconds=UPDATES_HEARTBEAT_SECONDS,
+)
+
+
+def _publish_confirmation(event: dict[str, Any], analysis: dict[str, Any]) -> None:
+    """Push the background confirmation of a provisional /analyze answer."""
+    confirms = analysis["confirms"]
+    update_hub.publish("analysis.confirmed", {
+        "event_id": event["id"],
+        "recommended_action": analysis.get("recommended_action"),
+        "action_changed": analysis.get("recommended_action") != confirms["provisional_action"],
+        "confidence": analysis.get("confidence"),
+        "confirms": confirms,
+        "analysis": analysis,
+    })
+
+
 # ── Agent singletons ─────────────────────────────────────────────────────────
-monitor_agent  = MonitorAgent(use_mock=USE_MOCK)
-reason_agent   = ReasonAgent(use_mock=USE_MOCK)
-act_agent      = ActAgent(use_mock=USE_MOCK)
-escalate_agent = EscalateAgent()
+monitor_agent  = MonitorAgent(
+    use_mock=USE_MOCK,
+    regions=MONITOR_REGIONS,
+    sources=MONITOR_SOURCES,
+    max_workers=MONITOR_MAX_WORKERS,
+    source_timeouts={src: MONITOR_SOURCE_TIMEOUT for src in MONITOR_SOURCES},
+)
+analysis_cache = AnalysisCache.from_env()
+similarity_index = SimilarityIndex.from_env()
+reason_agent   = ReasonAgent(
+    use_mock=USE_MOCK,
+    executor=bedrock,
+    cache=analysis_cache,
+    batch_size=REASON_BATCH_SIZE,
+    batch_token_budget=REASON_BATCH_TOKEN_BUDGET,
+    batch_severities=REASON_BATCH_SEVERITIES,
+    cascade=REASON_CASCADE,
+    promote_below=REASON_PROMOTE_BELOW,
+    promote_severities=REASON_PROMOTE_SEVERITIES,
+    similarity=similarity_index,
+    on_confirmed=_publish_confirmation,
+)
+act_agent      = ActAgent(use_mock=USE_MOCK, max_concurrency=ACT_MAX_CONCURRENCY)
+escalate_agent = EscalateAgent(archive_size=ESCALATION_ARCHIVE_SIZE, on_change=update_hub.publish)
+correlator     = Correlator(window_seconds=CORRELATION_WINDOW_SECONDS)
+
+# ── Monitor snapshot — refreshed in the background, shared by read endpoints ──
+monitor_poller = SnapshotPoller(monitor_agent.collect, refresh_seconds=MONITOR_REFRESH_SECONDS)
+
+# ── Pipeline run store ───────────────────────────────────────────────────────
+run_store = open_run_store(RUN_STORE, RUN_STORE_PATH, retention_days=RUN_STORE_RETENTION_DAYS)
+
+# ── Incremental state — exact (unbucketed) fingerprint of each event's last run ──
+incremental_state = IncrementalState(
+    fingerprint=lambda e: fingerprint(e, reason_agent.prompt_version, pct=0),
+    path=INCREMENTAL_STATE_PATH,
+)
+
+# ── Request coalescing — one pipeline run / analysis per input at a time ─────
+pipeline_flight = SingleFlight(reuse_window_seconds=REUSE_WINDOW_SECONDS)
+analyze_flight  = SingleFlight(reuse_window_seconds=REUSE_WINDOW_SECONDS)
+# Message feeds of in-flight runs, by pipeline key — read by /pipeline/run/stream
+run_feeds: dict[str, RunFeed] = {}
+# Runs past their deadline, still finishing late analyses / fixes
+background_tasks: set[asyncio.Task] = set()
+deadline_stats = {"runs_degraded": 0, "provisional_results": 0, "late_analyses_attached": 0}
 
-# ── In-memory pipeline run store ─────────────────────────────────────────────
-pipeline_runs: list[dict[str, Any]] = []
+
+def _pipeline_key(events: list[dict[str, Any]]) -> str:
+    """Digest of the pipeline input — identical event sets share one run."""
+    digest = hashlib.sha256()
+    for e in sorted(events, key=lambda e: e["id"]):
+        digest.update(f"{e['id']}|{e['severity']}|{e['value']}\n".encode())
+    return digest.hexdigest()
+
+
+def _run_key(snapshot: EventSnapshot, incremental: bool) -> str:
+    return ("incremental:" if incremental else "full:") + _pipeline_key(snapshot.events)
 
 
 # ── Schemas ───────────────────────────────────────────────────────────────────
@@ -81,15 +243,43 @@ async def health():
     return {"ok": True, "timestamp": datetime.utcnow().isoformat() + "Z"}
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """Runtime metrics — Bedrock call latency, concurrency and cache hit rates."""
+    return {
+        "bedrock": bedrock.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "reason": reason_agent.stats(),
+        "monitor": {**monitor_poller.stats(), "last_collection": monitor_agent.last_collection},
+        "incremental": incremental_state.stats(),
+        "run_store": run_store.stats(),
+        "escalations": escalate_agent.stats(),
+        "updates": update_hub.stats(),
+        "deadlines": {**deadline_stats, "finishing_in_background": len(background_tasks)},
+        "coalescing": {
+            "pipeline": pipeline_flight.stats(),
+            "analyze": analyze_flight.stats(),
+        },
+    }
+
+
 @app.get("/events")
 async def get_events():
-    """Fetch current infrastructure events from Monitor agent."""
-    events = monitor_agent.collect()
-    return {"events": events, "count": len(events)}
+    """Current infrastructure events from the Monitor agent's latest snapshot."""
+    snapshot = await monitor_poller.current()
+    return {"events": snapshot.events, "count": len(snapshot.events), "snapshot": snapshot.meta()}
+
+
+def _deadline(seconds: float | None) -> tuple[float | None, str]:
+    """Absolute deadline for a run starting now, plus its run-key suffix."""
+    budget = PIPELINE_DEADLINE_SECONDS if seconds is None else seconds
+    if budget <= 0:
+        return None, ""
+    return time.perf_counter() + budget, f":deadline={budget:g}"
 
 
 @app.post("/pipeline/run")
-async def run_pipeline():
+async def run_pipeline(incremental: bool | None = None, deadline: float | None = Query(None, ge=0)):
     """
     Execute full 4-agent pipeline:
     1. Monitor: collect events
@@ -97,93 +287,536 @@ async def run_pipeline():
     3. Act: auto-fix high-confidence events
     4. Escalate: queue low-confidence events for HITL
     Returns full pipeline trace with reasoning chains.
+    Concurrent calls over the same event set attach to a single run.
+    ?incremental=true re-reasons only events changed since the last run.
+    ?deadline=<seconds> bounds the run (default PIPELINE_DEADLINE_SECONDS):
+    events not analyzed in time are escalated with a provisional result.
     """
-    run_id = f"run-{int(datetime.utcnow().timestamp())}"
-    started_at = datetime.utcnow().isoformat() + "Z"
+    run_deadline, suffix = _deadline(deadline)
+    # Step 1: Monitor (latest background snapshot)
+    snapshot = await monitor_poller.current(max_wait=_remaining(run_deadline))
+    incremental = PIPELINE_INCREMENTAL if incremental is None else incremental
+
+    key = _run_key(snapshot, incremental) + suffix
+    record, shared = await pipeline_flight.do(
+        key, lambda: _execute_pipeline(snapshot, _open_feed(key), incremental, run_deadline)
+    )
+    return FastJSONResponse({**record, "coalesced": shared})
 
-    # Step 1: Monitor
-    events = monitor_agent.collect()
 
-    # Step 2: Reason (parallel analysis)
-    analyses = await asyncio.gather(
-        *[reason_agent.analyze(event) for event in events]
+@app.post("/pipeline/run/stream")
+async def run_pipeline_stream(incremental: bool | None = None, deadline: float | None = Query(None, ge=0)):
+    """
+    Same pipeline as /pipeline/run, streamed as Server-Sent Events.
+    Emits one `analysis` message per event as soon as its reasoning finishes
+    (fastest first), a `result` message once it is acted on or escalated,
+    then a final `summary` with the run record minus per-event results.
+    """
+    run_deadline, suffix = _deadline(deadline)
+    snapshot = await monitor_poller.current(max_wait=_remaining(run_deadline))
+    incremental = PIPELINE_INCREMENTAL if incremental is None else incremental
+
+    key = _run_key(snapshot, incremental) + suffix
+    flight, shared = pipeline_flight.start(
+        key, lambda: _execute_pipeline(snapshot, _open_feed(key), incremental, run_deadline)
+    )
+    feed = run_feeds.get(key)
+
+    async def event_stream() -> AsyncIterator[str]:
+        if feed is not None:
+            messages = feed.subscribe()
+        else:
+            # Served from the reuse window — replay the finished run
+            messages = _replay(await asyncio.shield(flight))
+        async for message in messages:
+            if message["type"] == "summary":
+                message = {**message, "coalesced": shared}
+            yield f"data: {json.dumps(message, default=str)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    # Step 3 & 4: Act or Escalate
+
+def _open_feed(key: str) -> RunFeed:
+    """Register the message feed for a run that is about to start."""
+    feed = RunFeed()
+    run_feeds[key] = feed
+    return feed
+
+
+async def _replay(record: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+    """Re-emit a completed run record as the stream's message sequence."""
+    for entry in record["results"]:
+        yield {"type": "analysis", "event_id": entry["event"]["id"], "event": entry["event"], "analysis": entry["analysis"]}
+        yield _result_message(entry)
+    yield _summary_message(record)
+
+
+# Run fields pushed to /stream/updates when a pipeline run completes
+RUN_UPDATE_FIELDS = ("run_id", "started_at", "completed_at", "duration_ms", "mode", "events_processed", "auto_fixed", "escalated")
+
+
+def _result_message(entry: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "type": "result",
+        "event_id": entry["event"]["id"],
+        "action_taken": entry["action_taken"],
+        "execution": entry["execution"],
+        "escalation": entry["escalation"],
+    }
+
+
+def _summary_message(record: dict[str, Any]) -> dict[str, Any]:
+    return {"type": "summary", "run": {k: v for k, v in record.items() if k != "results"}}
+
+
+async def _execute_pipeline(
+    snapshot: EventSnapshot,
+    feed: RunFeed,
+    incremental: bool = False,
+    deadline: float | None = None,
+) -> dict[str, Any]:
+    """
+    Reason → Act → Escalate over a collected event set; stores the run record.
+    Each event is acted on as soon as its own analysis completes — fixes run
+    as concurrent tasks while escalations are recorded alongside them — and
+    every step is published to the run's feed for streaming clients.
+    In incremental mode, events unchanged since the last run are not
+    re-reasoned or re-acted on; their previous result is carried forward.
+    With correlation on, each multi-event cluster is reasoned about once and
+    acted on / escalated via its primary event; the other members record
+    the shared analysis as `correlated`.
+    With a deadline (time.perf_counter() value), units still reasoning when
+    it passes get a provisional fallback analysis and are escalated, and the
+    run returns; their real analyses and any unfinished fixes are attached to
+    the stored run record in the background once they complete.
+    Near-duplicates answered from the similarity index are provisional the
+    same way, and their confirmations are attached like late analyses.
+    """
+    # Suffix keeps ids unique when several runs start within the same second
+    run_id = f"run-{int(datetime.utcnow().timestamp())}-{secrets.token_hex(3)}"
+    started_at = datetime.utcnow().isoformat() + "Z"
+    t0 = time.perf_counter()
+    events = snapshot.events
+    events_by_id = {e["id"]: e for e in events}
+    order = {e["id"]: i for i, e in enumerate(events)}
+
     results = []
     auto_fixed = 0
     escalated = 0
+    first_result_ms = None
+    reason_ms = 0.0
+    tiers: dict[str, int] = {}
+    model_cost_usd = 0.0
+    fixes: list[asyncio.Task] = []
+    fix_entries: dict[asyncio.Task, dict[str, Any]] = {}
+    # Result entries per reasoning unit — where a late analysis gets attached
+    unit_entries: dict[str, list[dict[str, Any]]] = {}
+    reasoning: asyncio.Task | None = None
+
+    async def act(event: dict[str, Any], analysis: dict[str, Any], entry: dict[str, Any]) -> None:
+        entry["execution"] = await act_agent.execute(event, analysis)
+        feed.publish(_result_message(entry))
 
-    for event, analysis in zip(events, analyses):
-        action = analysis.get("recommended_action", "escalate")
-        entry: dict[str, Any] = {
-            "event": event,
-            "analysis": analysis,
-            "action_taken": action,
-            "execution": None,
-            "escalation": None,
+    try:
+        to_reason = events
+        if incremental:
+            to_reason, unchanged = incremental_state.partition(events)
+            for event, seen in unchanged:
+                entry = {
+                    "event": event,
+                    "analysis": seen["analysis"],
+                    "action_taken": seen["action_taken"],
+                    "execution": seen["execution"],
+                    "escalation": seen["escalation"],
+                    "carried_from_run": seen["run_id"],
+                }
+                results.append(entry)
+                feed.publish({"type": "analysis", "event_id": event["id"], "event": event, "analysis": entry["analysis"]})
+                feed.publish(_result_message(entry))
+
+        # Correlate: one reasoning unit per cluster (synthetic event for multi-event clusters)
+        units = to_reason
+        clusters: list[dict[str, Any]] = []
+        if PIPELINE_CORRELATE and to_reason:
+            clusters = [c for c in correlator.correlate(to_reason) if len(c["event_ids"]) > 1]
+            clustered = {eid for c in clusters for eid in c["event_ids"]}
+            units = [e for e in to_reason if e["id"] not in clustered]
+            units += [Correlator.cluster_event(c, events_by_id) for c in clusters]
+        clusters_by_id = {c["cluster_id"]: c for c in clusters}
+
+        def record_unit(analysis: dict[str, Any]) -> None:
+            """Act on / escalate one reasoning unit's analysis and add its result entries."""
+            nonlocal auto_fixed, escalated, first_result_ms, reason_ms, model_cost_usd
+            unit_id = analysis["event_id"]
+            cluster = clusters_by_id.get(analysis["event_id"])
+            if cluster is None:
+                event = events_by_id[analysis["event_id"]]
+            else:
+                event = events_by_id[cluster["primary_event_id"]]
+                analysis = {
+                    **analysis,
+                    "event_id": event["id"],
+                    "cluster_id": cluster["cluster_id"],
+                    # Listed so an escalation of the cluster shows every alarm it covers
+                    "correlated_event_ids": [eid for eid in cluster["event_ids"] if eid != event["id"]],
+                }
+            if not analysis.get("provisional"):
+                reason_ms = (time.perf_counter() - t0) * 1000
+                if first_result_ms is None:
+                    first_result_ms = reason_ms
+            if analysis.get("cache"):
+                tier = "cache"
+            else:
+                tier = analysis.get("tier") or ("mock" if str(analysis.get("model", "")).endswith("(mock)") else "error")
+                for usage in (analysis.get("usage"), (analysis.get("promoted_from") or {}).get("usage")):
+                    model_cost_usd += (usage or {}).get("cost_usd", 0.0)
+            tiers[tier] = tiers.get(tier, 0) + 1
+            feed.publish({"type": "analysis", "event_id": event["id"], "event": event, "analysis": analysis})
+
+            # Step 3 & 4: Act or Escalate
+            action = analysis.get("recommended_action", "escalate")
+            entry: dict[str, Any] = {
+                "event": event,
+                "analysis": analysis,
+                "action_taken": action,
+                "execution": None,
+                "escalation": None,
+            }
+            if analysis.get("provisional"):
+                entry["provisional"] = True
+            unit_entries[unit_id] = [entry]
+
+            if action == "auto_fix":
+                fix = asyncio.create_task(act(event, analysis, entry))
+                fixes.append(fix)
+                fix_entries[fix] = entry
+                auto_fixed += 1
+            else:
+                escalation = escalate_agent.escalate(event, analysis)
+                entry["escalation"] = escalation
+                escalated += 1
+                feed.publish(_result_message(entry))
+
+            if cluster is not None:
+                entry["cluster_id"] = cluster["cluster_id"]
+                for member_id in cluster["event_ids"]:
+                    if member_id == event["id"]:
+                        continue
+                    member = events_by_id[member_id]
+                    member_entry = {
+                        "event": member,
+                        "analysis": {**analysis, "event_id": member_id},
+                        "action_taken": "correlated",
+                        "execution": None,
+                        # Covered by the cluster's escalation, resolved as one
+                        "escalation": entry["escalation"],
+                        "cluster_id": cluster["cluster_id"],
+                        "primary_event_id": event["id"],
+                    }
+                    if analysis.get("provisional"):
+                        member_entry["provisional"] = True
+                    unit_entries[unit_id].append(member_entry)
+                    results.append(member_entry)
+                    feed.publish({"type": "analysis", "event_id": member_id, "event": member, "analysis": member_entry["analysis"]})
+                    feed.publish(_result_message(member_entry))
+
+            results.append(entry)
+
+        # Step 2: Reason (parallel analysis — Bedrock calls run on the executor pool).
+        # Analyses arrive through a queue so the run can stop waiting at its
+        # deadline while the late ones keep running in the background.
+        arrivals: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        reasoning = asyncio.create_task(_pump(reason_agent.analyze_stream(units), arrivals))
+        waiting = {u["id"]: u for u in units}
+        while waiting:
+            if not arrivals.empty():
+                analysis = arrivals.get_nowait()
+            else:
+                try:
+                    analysis = await asyncio.wait_for(arrivals.get(), _remaining(deadline))
+                except asyncio.TimeoutError:
+                    break
+            if analysis is None:
+                await reasoning  # re-raises a reasoning failure
+                break
+            if analysis["event_id"] in unit_entries:
+                # A near-duplicate's confirmation, in before the run is saved
+                _attach_final(run_id, unit_entries[analysis["event_id"]], analysis)
+                continue
+            waiting.pop(analysis["event_id"], None)
+            record_unit(analysis)
+
+        # Past the deadline: a provisional, escalated fallback for every unit still reasoning
+        late_units = list(waiting)
+        for unit in waiting.values():
+            record_unit(reason_agent.provisional_analysis(unit))
+        # Provisional results still owed their real analysis: deadline misses and near-duplicates
+        unsettled = [
+            unit_id for unit_id, entries in unit_entries.items()
+            if entries[0].get("provisional") and "final_analysis" not in entries[0]
+        ]
+
+        running_fixes: set[asyncio.Task] = set()
+        if fixes:
+            done, running_fixes = await asyncio.wait(fixes, timeout=_remaining(deadline))
+            for fix in done:
+                fix.result()
+            for fix in running_fixes:
+                fix_entries[fix]["execution"] = {"status": "in_progress"}
+
+        results.sort(key=lambda r: order[r["event"]["id"]])
+        run_record = {
+            "run_id": run_id,
+            "started_at": started_at,
+            "completed_at": datetime.utcnow().isoformat() + "Z",
+            "duration_ms": round((time.perf_counter() - t0) * 1000, 1),
+            "reason_duration_ms": round(reason_ms, 1),
+            "time_to_first_result_ms": round(first_result_ms, 1) if first_result_ms is not None else None,
+            "events_processed": len(events),
+            "mode": "incremental" if incremental else "full",
+            "events_reasoned": len(to_reason),
+            "events_carried_forward": len(events) - len(to_reason),
+            "reasoning_calls": len(units),
+            # Which model tier answered each reasoning unit, and what the calls cost
+            "tiers": tiers,
+            "model_cost_usd": round(model_cost_usd, 6),
+            "clusters": clusters,
+            "snapshot_version": snapshot.version,
+            "snapshot_age_seconds": snapshot.age_seconds,
+            "auto_fixed": auto_fixed,
+            "escalated": escalated,
+            "deadline_seconds": round(deadline - t0, 3) if deadline is not None else None,
+            "provisional_events": unsettled,
+            "finalized": not (unsettled or running_fixes),
+            "results": results,
         }
 
-        if action == "auto_fix":
-            execution = await act_agent.execute(event, analysis)
-            entry["execution"] = execution
-            auto_fixed += 1
-        else:
-            escalation = escalate_agent.escalate(event, analysis)
-            entry["escalation"] = escalation
-            escalated += 1
+        run_store.save(run_record)
+        update_hub.publish("run.completed", {
+            **project(run_record, list(RUN_UPDATE_FIELDS)),
+            "pending": escalate_agent.pending_count(),
+        })
+        # Full runs also commit, so the next incremental run has a baseline.
+        # Unfinished results are left out, so they are re-reasoned next time
+        incremental_state.commit(
+            run_id,
+            [r for r in results if not r.get("provisional") and (r["execution"] or {}).get("status") != "in_progress"],
+            snapshot.version,
+        )
+        if late_units or running_fixes:
+            deadline_stats["runs_degraded"] += 1
+            deadline_stats["provisional_results"] += len(late_units)
+        if unsettled or running_fixes:
+            _spawn(_finish_late(run_record, reasoning, arrivals, {u: unit_entries[u] for u in unsettled}, running_fixes))
+        elif reasoning is not None:
+            await reasoning
+
+        feed.publish(_summary_message(run_record))
+        return run_record
+    except Exception as exc:
+        for fix in fixes:
+            fix.cancel()
+        if reasoning is not None:
+            reasoning.cancel()
+        feed.publish({"type": "error", "detail": str(exc)})
+        raise
+    finally:
+        feed.close()
+        for key in [k for k, f in run_feeds.items() if f is feed]:
+            del run_feeds[key]
+
+
+def _remaining(deadline: float | None) -> float | None:
+    """Seconds left before a run deadline (None = no deadline)."""
+    return None if deadline is None else max(0.0, deadline - time.perf_counter())
+
+
+async def _pump(stream: AsyncIterator[dict[str, Any]], queue: asyncio.Queue) -> None:
+    """Move a run's analyses onto its queue; None marks the end of the stream."""
+    try:
+        async for analysis in stream:
+            queue.put_nowait(analysis)
+    finally:
+        queue.put_nowait(None)
+
 
-        results.append(entry)
+def _spawn(coro: Awaitable[Any]) -> None:
+    task = asyncio.ensure_future(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
 
-    run_record = {
+
+def _attach_final(run_id: str, entries: list[dict[str, Any]], analysis: dict[str, Any]) -> None:
+    """
+    Attach a unit's real analysis to its provisional entries as
+    `final_analysis`. A still-pending escalation is refreshed with it.
+    Provisional results are always escalated, and a late answer never
+    starts a fix: if it recommends auto_fix the escalation stays pending,
+    downgraded the same way as a near-duplicate, for a human to approve.
+    """
+    finalized_at = datetime.utcnow().isoformat() + "Z"
+    for entry in entries:
+        entry["final_analysis"] = {
+            **analysis,
+            "event_id": entry["event"]["id"],
+            **({"cluster_id": entry["cluster_id"]} if "cluster_id" in entry else {}),
+        }
+        entry["finalized_at"] = finalized_at
+    # entries[0] is the unit's primary; cluster members share its escalation
+    escalation = entries[0]["escalation"]
+    if escalation is not None and escalate_agent.get(escalation["escalation_id"]) is escalation \
+            and escalation["status"] == "pending":
+        final = entries[0]["final_analysis"]
+        if final.get("recommended_action") == "auto_fix":
+            final = {
+                **final,
+                "recommended_action": "escalate",
+                "source_recommended_action": "auto_fix",
+                "reasoning_steps": [
+                    "Confirmed auto_fix arrived after the event was escalated — held for approval.",
+                    *final.get("reasoning_steps", []),
+                ],
+            }
+        escalation = escalate_agent.escalate(entries[0]["event"], final)
+        for entry in entries:
+            entry["escalation"] = escalation
+    update_hub.publish("run.analysis_finalized", {
         "run_id": run_id,
-        "started_at": started_at,
-        "completed_at": datetime.utcnow().isoformat() + "Z",
-        "events_processed": len(events),
-        "auto_fixed": auto_fixed,
-        "escalated": escalated,
-        "results": results,
-    }
+        "event_id": entries[0]["event"]["id"],
+        "recommended_action": analysis.get("recommended_action"),
+        "action_changed": analysis.get("recommended_action") != entries[0]["analysis"].get("recommended_action"),
+        "confidence": analysis.get("confidence"),
+        "confirms": analysis.get("confirms"),
+    })
+
+
+async def _finish_late(
+    record: dict[str, Any],
+    reasoning: asyncio.Task,
+    arrivals: asyncio.Queue,
+    late: dict[str, list[dict[str, Any]]],
+    fixes: set[asyncio.Task],
+) -> None:
+    """
+    Attach the analyses a saved run is still owed — deadline misses and
+    near-duplicate confirmations — and wait for unfinished fixes; then
+    re-save the run.
+    """
+    try:
+        while late:
+            analysis = await arrivals.get()
+            if analysis is None:
+                break
+            entries = late.pop(analysis["event_id"], None)
+            if entries is None:
+                continue
+            _attach_final(record["run_id"], entries, analysis)
+            if not analysis.get("confirms"):
+                deadline_stats["late_analyses_attached"] += 1
+        if fixes:
+            await asyncio.wait(fixes)
+        await reasoning
+    except Exception:
+        logger.exception("Finishing late results for %s failed", record["run_id"])
+    finally:
+        record["finalized"] = not late
+        record["finalized_at"] = datetime.utcnow().isoformat() + "Z"
+        run_store.save(record)
+        update_hub.publish("run.finalized", project(record, list(RUN_UPDATE_FIELDS) + ["finalized"]))
+
+
+@app.get("/stream/updates")
+async def stream_updates(
+    since: int | None = Query(None, ge=0),
+    last_event_id: str | None = Header(None),
+):
+    """
+    Server-Sent Events feed of escalation and pipeline-run changes.
+    Each message carries a `seq` (also the SSE id); reconnect with
+    ?since=<seq> or Last-Event-ID to replay missed updates. Idle streams get
+    `heartbeat` messages; clients that fall behind receive `dropped` and
+    should reconnect.
+    """
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
 
-    pipeline_runs.insert(0, run_record)
-    # Keep last 20 runs
-    if len(pipeline_runs) > 20:
-        pipeline_runs.pop()
+    async def event_stream() -> AsyncIterator[str]:
+        async for message in update_hub.subscribe(since):
+            yield f"id: {message['seq']}\ndata: {json.dumps(message, default=str)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    return run_record
+
+def _split_fields(fields: str | None) -> list[str] | None:
+    return [f.strip() for f in fields.split(",") if f.strip()] if fields else None
 
 
 @app.get("/pipeline/runs")
-async def get_pipeline_runs():
-    """Return recent pipeline run history."""
-    return {"runs": pipeline_runs, "count": len(pipeline_runs)}
+async def get_pipeline_runs(
+    limit: int = Query(20, ge=1, le=200),
+    cursor: str | None = None,
+    fields: str | None = None,
+    include: str | None = None,
+):
+    """
+    Return pipeline run history, newest first. Pass next_cursor to page back.
+    Runs are summaries without per-event results unless ?include=results;
+    ?fields=run_id,started_at,... trims each run to the listed fields.
+    """
+    include_results = "results" in (_split_fields(include) or [])
+    try:
+        page = await run_store.list(limit=limit, cursor=cursor, include_results=include_results)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from exc
+    selected = _split_fields(fields)
+    runs = [project(run, selected) for run in page["runs"]]
+    return FastJSONResponse({"runs": runs, "count": len(runs), "next_cursor": page["next_cursor"]})
 
 
 @app.get("/pipeline/runs/{run_id}")
-async def get_pipeline_run(run_id: str):
-    """Get a specific pipeline run by ID."""
-    for run in pipeline_runs:
-        if run["run_id"] == run_id:
-            return run
-    raise HTTPException(404, f"Run {run_id} not found")
+async def get_pipeline_run(run_id: str, fields: str | None = None):
+    """Get a specific pipeline run by ID (full record unless ?fields= is given)."""
+    run = await run_store.get(run_id)
+    if run is None:
+        raise HTTPException(404, f"Run {run_id} not found")
+    return FastJSONResponse(project(run, _split_fields(fields)))
 
 
 @app.get("/escalations")
-async def get_escalations():
-    """Return pending HITL escalation queue."""
+async def get_escalations(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    severity: str | None = None,
+    service: str | None = None,
+):
+    """
+    Return the pending HITL escalation queue, highest priority first
+    (severity, then least confident, then oldest). Filter by severity/service.
+    """
+    escalations = escalate_agent.get_queue(limit=limit, offset=offset, severity=severity, service=service)
     return {
-        "escalations": escalate_agent.get_queue(),
-        "count": len(escalate_agent.get_queue()),
+        "escalations": escalations,
+        "count": len(escalations),
+        "total": escalate_agent.pending_count(severity=severity, service=service),
+        "offset": offset,
+        "limit": limit,
     }
 
 
 @app.get("/escalations/all")
 async def get_all_escalations():
-    """Return all escalations including resolved."""
-    return {
-        "escalations": escalate_agent.get_all(),
-        "count": len(escalate_agent.get_all()),
-    }
+    """Return all escalations including resolved (archive is bounded)."""
+    escalations = escalate_agent.get_all()
+    return {"escalations": escalations, "count": len(escalations)}
 
 
 @app.post("/escalations/{escalation_id}/resolve")
@@ -204,32 +837,40 @@ async def resolve_escalation(escalation_id: str, req: ResolveRequest):
 
 @app.get("/analyze/{event_id}")
 async def analyze_single_event(event_id: str):
-    """Analyze a single event by ID."""
-    events = monitor_agent.collect()
-    event = next((e for e in events if e["id"] == event_id), None)
+    """
+    Analyze a single event by ID. A provisional (near-duplicate) answer is
+    confirmed in the background and pushed on /stream/updates as
+    `analysis.confirmed`; subscribe with since=`updates_seq` to receive it.
+    """
+    snapshot = await monitor_poller.current()
+    event = next((e for e in snapshot.events if e["id"] == event_id), None)
     if not event:
         raise HTTPException(404, f"Event {event_id} not found")
-    analysis = await reason_agent.analyze(event)
-    return {"event": event, "analysis": analysis}
+    seq = update_hub.seq
+    analysis, shared = await analyze_flight.do(event_id, lambda: reason_agent.analyze(event))
+    return {"event": event, "analysis": analysis, "coalesced": shared, "updates_seq": seq}
 
 
 @app.get("/dashboard/summary")
 async def dashboard_summary():
     """High-level dashboard metrics."""
-    events = monitor_agent.collect()
+    snapshot = await monitor_poller.current()
+    events = snapshot.events
     severity_counts = {}
     source_counts = {}
     for e in events:
         severity_counts[e["severity"]] = severity_counts.get(e["severity"], 0) + 1
         source_counts[e["source"]] = source_counts.get(e["source"], 0) + 1
+    last_run = await run_store.latest()
 
     return {
         "total_events": len(events),
         "severity_breakdown": severity_counts,
         "source_breakdown": source_counts,
-        "pending_escalations": len(escalate_agent.get_queue()),
-        "total_pipeline_runs": len(pipeline_runs),
-        "last_run": pipeline_runs[0]["started_at"] if pipeline_runs else None,
+        "pending_escalations": escalate_agent.pending_count(),
+        "total_pipeline_runs": await run_store.count(),
+        "last_run": last_run["started_at"] if last_run else None,
         "model": "amazon.nova-pro-v1:0",
         "mode": "mock" if USE_MOCK else "live",
+        "snapshot": snapshot.meta(),
     }
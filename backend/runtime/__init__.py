@@ -0,0 +1,25 @@
+"""Nova DevOps Copilot — shared runtime services for the API layer."""
+
+from .encoding import FastJSONResponse, StreamGZipMiddleware
+from .feed import RunFeed
+from .hub import UpdateHub
+from .incremental import IncrementalState
+from .poller import EventSnapshot, SnapshotPoller
+from .run_store import MemoryRunStore, SQLiteRunStore, open_run_store, project, summarize
+from .singleflight import SingleFlight
+
+__all__ = [
+    "EventSnapshot",
+    "FastJSONResponse",
+    "IncrementalState",
+    "MemoryRunStore",
+    "RunFeed",
+    "SQLiteRunStore",
+    "SingleFlight",
+    "SnapshotPoller",
+    "StreamGZipMiddleware",
+    "UpdateHub",
+    "open_run_store",
+    "project",
+    "summarize",
+]
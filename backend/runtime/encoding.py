@@ -0,0 +1,52 @@
+"""
+Response encoding — fast JSON serialization for large payloads.
+
+Uses orjson (a declared dependency); the stdlib encoder is only a fallback
+for environments installed without it. Routes that return big documents
+(run history) build a FastJSONResponse directly, which also skips
+FastAPI's per-field jsonable_encoder pass. StreamGZipMiddleware compresses
+everything except the Server-Sent Events routes.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable
+
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from starlette.types import Receive, Scope, Send
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover — optional speed-up
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=str, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class StreamGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that passes the given paths through untouched. Gzip
+    buffers an SSE stream until its compressor flushes, so events arrive
+    late or in bursts; only recent Starlette releases skip
+    text/event-stream on their own, so the stream routes are excluded here.
+    """
+
+    def __init__(self, app, skip_paths: Iterable[str] = (), **kwargs: Any):
+        super().__init__(app, **kwargs)
+        self.skip_paths = frozenset(skip_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,42 @@
+"""
+Run feed — replayable, append-only message log for one in-flight run.
+
+Every subscriber receives the full sequence from the first message, so a
+client attaching to a run that is already halfway done still sees it all.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator
+
+
+class RunFeed:
+    """Messages published by a pipeline run, streamed to any number of readers."""
+
+    def __init__(self):
+        self.messages: list[dict[str, Any]] = []
+        self.closed = False
+        self._changed = asyncio.Event()
+
+    def publish(self, message: dict[str, Any]) -> None:
+        self.messages.append(message)
+        self._wake()
+
+    def close(self) -> None:
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        # Swap the event so readers that wake up wait on a fresh one
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def subscribe(self) -> AsyncIterator[dict[str, Any]]:
+        index = 0
+        while True:
+            while index < len(self.messages):
+                yield self.messages[index]
+                index += 1
+            if self.closed:
+                return
+            await self._changed.wait()
@@ -0,0 +1,108 @@
+"""
+Update hub — fans backend state changes out to connected dashboards.
+
+Publishers (escalation queue, pipeline runs) push compact diffs tagged with
+a monotonically increasing sequence number. Each client gets a bounded
+buffer; a client that falls behind is dropped rather than slowing everyone
+else down, and can reconnect with `since=<seq>` to replay what it missed
+from the recent history.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator
+
+
+class _Client:
+    def __init__(self, buffer_size: int):
+        self.queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = False
+
+
+class UpdateHub:
+    """In-process pub/sub with per-client bounded buffers and resumable history."""
+
+    def __init__(self, buffer_size: int = 256, history_size: int = 1024, heartbeat_seconds: float = 15):
+        self.buffer_size = buffer_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.seq = 0
+        self._history: deque[dict[str, Any]] = deque(maxlen=history_size)
+        self._clients: set[_Client] = set()
+        self.published = 0
+        self.dropped_clients = 0
+
+    def publish(self, kind: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Record an update and hand it to every connected client. Never blocks."""
+        self.seq += 1
+        message = {"seq": self.seq, "type": kind, "ts": round(time.time(), 3), "data": data}
+        self._history.append(message)
+        self.published += 1
+        for client in list(self._clients):
+            try:
+                client.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(client)
+        return message
+
+    def _drop(self, client: _Client) -> None:
+        self._clients.discard(client)
+        client.dropped = True
+        self.dropped_clients += 1
+        # Free the buffer so the reader wakes up on the sentinel straight away
+        while not client.queue.empty():
+            client.queue.get_nowait()
+        client.queue.put_nowait(None)
+
+    async def subscribe(self, since: int | None = None) -> AsyncIterator[dict[str, Any]]:
+        """
+        Yield updates with seq > since (live only when since is None).
+        Emits `heartbeat` when idle, `reset` when `since` is older than the
+        retained history, and `dropped` before closing a client that fell behind.
+        """
+        client = _Client(self.buffer_size)
+        # Register and snapshot history in one step so nothing is missed or repeated
+        self._clients.add(client)
+        backlog: list[dict[str, Any]] = []
+        if since is not None:
+            if since > self.seq:
+                since = self.seq
+            oldest = self._history[0]["seq"] if self._history else self.seq + 1
+            if since < oldest - 1:
+                # Carries seq=since so SSE ids never go backwards: a client that
+                # reconnects mid-backlog resumes from where it really was
+                backlog.append({
+                    "seq": since, "type": "reset", "ts": round(time.time(), 3),
+                    "data": {"since": since, "oldest": oldest},
+                })
+            backlog.extend(m for m in self._history if m["seq"] > since)
+        last = backlog[-1]["seq"] if backlog else (since if since is not None else self.seq)
+        try:
+            for message in backlog:
+                yield message
+            while True:
+                try:
+                    message = await asyncio.wait_for(client.queue.get(), timeout=self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield {"seq": last, "type": "heartbeat", "ts": round(time.time(), 3), "data": {}}
+                    continue
+                if message is None:
+                    yield {"seq": last, "type": "dropped", "ts": round(time.time(), 3), "data": {"resume_from": last}}
+                    return
+                if message["seq"] <= last:
+                    continue
+                last = message["seq"]
+                yield message
+        finally:
+            self._clients.discard(client)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "clients": len(self._clients),
+            "published": self.published,
+            "dropped_clients": self.dropped_clients,
+            "history": len(self._history),
+            "buffer_size": self.buffer_size,
+        }
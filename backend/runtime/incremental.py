@@ -0,0 +1,85 @@
+"""
+Incremental run state — watermark + per-event fingerprints between runs.
+
+An incremental pipeline run only re-reasons events that are new or whose
+fingerprint changed since the last committed run; unchanged events carry
+their previous result forward. State is kept in memory and, when a path is
+configured, persisted as JSON so it survives restarts.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalState:
+    """Last-seen fingerprint and pipeline result for every active event."""
+
+    def __init__(self, fingerprint: Callable[[dict[str, Any]], str], path: str | None = None):
+        self.fingerprint = fingerprint
+        self.path = path
+        self.watermark: dict[str, Any] | None = None
+        self._events: dict[str, dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            self._load()
+
+    def partition(
+        self, events: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], list[tuple[dict[str, Any], dict[str, Any]]]]:
+        """
+        Split events into (changed, unchanged). Unchanged events are paired
+        with the result entry recorded for them by the last committed run.
+        """
+        changed: list[dict[str, Any]] = []
+        unchanged: list[tuple[dict[str, Any], dict[str, Any]]] = []
+        for event in events:
+            seen = self._events.get(event["id"])
+            if seen is not None and seen["fingerprint"] == self.fingerprint(event):
+                unchanged.append((event, seen))
+            else:
+                changed.append(event)
+        return changed, unchanged
+
+    def commit(self, run_id: str, results: list[dict[str, Any]], snapshot_version: int) -> None:
+        """Record a finished run. Events absent from it are dropped — they resolved."""
+        self._events = {
+            entry["event"]["id"]: {
+                "fingerprint": self.fingerprint(entry["event"]),
+                "run_id": entry.get("carried_from_run") or run_id,
+                "analysis": entry["analysis"],
+                "action_taken": entry["action_taken"],
+                "execution": entry["execution"],
+                "escalation": entry["escalation"],
+            }
+            for entry in results
+        }
+        self.watermark = {
+            "run_id": run_id,
+            "snapshot_version": snapshot_version,
+            "committed_at": datetime.utcnow().isoformat() + "Z",
+        }
+        if self.path:
+            self._save()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as fh:
+                data = json.load(fh)
+            self.watermark = data.get("watermark")
+            self._events = data.get("events", {})
+        except (OSError, ValueError):
+            logger.exception("Could not load incremental state from %s — starting fresh", self.path)
+
+    def _save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({"watermark": self.watermark, "events": self._events}, fh, default=str)
+        os.replace(tmp, self.path)
+
+    def stats(self) -> dict[str, Any]:
+        return {"tracked_events": len(self._events), "watermark": self.watermark}
@@ -0,0 +1,128 @@
+"""
+Snapshot poller — background collection loop for MonitorAgent.
+
+Read endpoints serve the latest in-memory snapshot instead of re-querying
+CloudWatch on every request. Each snapshot carries a version (bumped only
+when the event set changes) and its age.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class EventSnapshot:
+    """Immutable view of one collection pass."""
+
+    def __init__(self, events: list[dict[str, Any]], version: int, digest: str):
+        self.events = events
+        self.version = version
+        self.digest = digest
+        self.collected_at = datetime.utcnow().isoformat() + "Z"
+        self._collected_monotonic = time.monotonic()
+
+    @property
+    def age_seconds(self) -> float:
+        return round(time.monotonic() - self._collected_monotonic, 1)
+
+    def meta(self) -> dict[str, Any]:
+        return {"version": self.version, "collected_at": self.collected_at, "age_seconds": self.age_seconds}
+
+
+class SnapshotPoller:
+    """
+    Calls collect() every refresh_seconds on a worker thread and keeps the
+    latest result. Without a running loop (e.g. serverless with lifespan off),
+    current() refreshes on demand once the snapshot is older than the interval.
+    """
+
+    def __init__(self, collect: Callable[[], list[dict[str, Any]]], refresh_seconds: float = 30.0):
+        self.collect = collect
+        self.refresh_seconds = refresh_seconds
+        self.refreshes = 0
+        self.failures = 0
+        self.stale_served = 0
+        self._snapshot: EventSnapshot | None = None
+        self._refresh_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def refresh(self) -> EventSnapshot:
+        async with self._refresh_lock:
+            events = await asyncio.to_thread(self.collect)
+            digest = hashlib.sha256(json.dumps(events, sort_keys=True, default=str).encode()).hexdigest()
+            previous = self._snapshot
+            if previous is None or previous.digest != digest:
+                version = previous.version + 1 if previous else 1
+            else:
+                version = previous.version
+            self._snapshot = EventSnapshot(events, version, digest)
+            self.refreshes += 1
+            return self._snapshot
+
+    async def current(self, max_wait: float | None = None) -> EventSnapshot:
+        """
+        Latest snapshot, refreshed first when stale. With max_wait, a stale
+        snapshot is returned if the refresh takes longer than that; the
+        refresh carries on and serves the next caller.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or (self._task is None and snapshot.age_seconds >= self.refresh_seconds):
+            fresh = asyncio.ensure_future(self._refresh_or_join())
+            if max_wait is None or snapshot is None:
+                return await fresh
+            try:
+                return await asyncio.wait_for(asyncio.shield(fresh), max(0.0, max_wait))
+            except asyncio.TimeoutError:
+                self.stale_served += 1
+                return snapshot
+        return snapshot
+
+    async def _refresh_or_join(self) -> EventSnapshot:
+        if self._refresh_lock.locked():
+            # Another request is already refreshing — wait for it instead of re-collecting
+            async with self._refresh_lock:
+                pass
+            if self._snapshot is not None:
+                return self._snapshot
+        return await self.refresh()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failures += 1
+                logger.exception("Monitor snapshot refresh failed — keeping previous snapshot")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "refresh_seconds": self.refresh_seconds,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "stale_served": self.stale_served,
+            "snapshot": self._snapshot.meta() if self._snapshot else None,
+        }
@@ -0,0 +1,257 @@
+"""
+Pipeline run store — durable, indexed history of pipeline runs.
+
+The default backend is an embedded SQLite database in WAL mode, indexed by
+run_id and started_at. Writes are queued to a dedicated writer thread so
+the request path never waits on disk; records not yet flushed are served
+from a small pending map. Listing is cursor-paginated, newest first.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(record: dict[str, Any]) -> str:
+    raw = json.dumps([record["started_at"], record["run_id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        started_at, run_id = json.loads(raw)
+        return str(started_at), str(run_id)
+    except Exception as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
+
+
+def summarize(record: dict[str, Any]) -> dict[str, Any]:
+    """Run record without per-event results — what list views need."""
+    return {k: v for k, v in record.items() if k != "results"}
+
+
+def project(record: dict[str, Any], fields: list[str] | None) -> dict[str, Any]:
+    """Keep only the requested top-level fields (run_id is always kept)."""
+    if not fields:
+        return record
+    return {k: v for k, v in record.items() if k in fields or k == "run_id"}
+
+
+def _before(record: dict[str, Any], cursor: tuple[str, str] | None) -> bool:
+    """True when record sorts after the cursor position (newest-first order)."""
+    return cursor is None or (record["started_at"], record["run_id"]) < cursor
+
+
+def _page(records: list[dict[str, Any]], limit: int) -> dict[str, Any]:
+    records = sorted(records, key=lambda r: (r["started_at"], r["run_id"]), reverse=True)
+    page = records[:limit]
+    more = len(records) > limit
+    return {"runs": page, "next_cursor": encode_cursor(page[-1]) if more and page else None}
+
+
+class MemoryRunStore:
+    """Bounded in-process store — for local dev and read-only filesystems."""
+
+    backend = "memory"
+
+    def __init__(self, max_runs: int = 1000):
+        self.max_runs = max_runs
+        self._runs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def save(self, record: dict[str, Any]) -> None:
+        self._runs[record["run_id"]] = record
+        if len(self._runs) > self.max_runs:
+            self._runs.popitem(last=False)
+
+    async def get(self, run_id: str) -> dict[str, Any] | None:
+        return self._runs.get(run_id)
+
+    async def list(self, limit: int = 20, cursor: str | None = None, include_results: bool = False) -> dict[str, Any]:
+        position = decode_cursor(cursor) if cursor else None
+        page = _page([r for r in self._runs.values() if _before(r, position)], limit)
+        if not include_results:
+            page["runs"] = [summarize(r) for r in page["runs"]]
+        return page
+
+    async def count(self) -> int:
+        return len(self._runs)
+
+    async def latest(self) -> dict[str, Any] | None:
+        page = await self.list(limit=1)
+        return page["runs"][0] if page["runs"] else None
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": self.backend, "runs": len(self._runs), "max_runs": self.max_runs}
+
+
+class SQLiteRunStore:
+    """
+    SQLite (WAL) run history. One writer thread owns all inserts and
+    retention pruning; reads run on worker threads over a second connection.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, retention_days: float = 180):
+        self.path = path
+        self.retention_days = retention_days
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-store")
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._writes = 0
+        self._write_errors = 0
+        self._write_conn = self._connect()
+        self._write_conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS pipeline_runs (
+                run_id TEXT PRIMARY KEY,
+                started_at TEXT NOT NULL,
+                completed_at TEXT,
+                record TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_pipeline_runs_started
+                ON pipeline_runs(started_at DESC, run_id DESC);
+            """
+        )
+        # Summary column lets list views skip decoding full results
+        columns = {row[1] for row in self._write_conn.execute("PRAGMA table_info(pipeline_runs)")}
+        if "summary" not in columns:
+            self._write_conn.execute("ALTER TABLE pipeline_runs ADD COLUMN summary TEXT")
+        self._read_conn = self._connect()
+        self._read_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+    def save(self, record: dict[str, Any]) -> None:
+        """Queue a run for persistence; visible to reads immediately."""
+        # Shallow snapshot down to the result entries, which the caller keeps
+        # updating (late analyses, fixes) — serialized on the writer thread
+        snapshot = dict(record)
+        if "results" in record:
+            snapshot["results"] = [dict(entry) for entry in record["results"]]
+        self._pending[record["run_id"]] = record
+        self._writer.submit(self._write, snapshot, record)
+
+    def _write(self, snapshot: dict[str, Any], record: dict[str, Any]) -> None:
+        try:
+            self._write_conn.execute(
+                "INSERT OR REPLACE INTO pipeline_runs (run_id, started_at, completed_at, record, summary) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    snapshot["run_id"],
+                    snapshot["started_at"],
+                    snapshot.get("completed_at"),
+                    json.dumps(snapshot, default=str),
+                    json.dumps(summarize(snapshot), default=str),
+                ),
+            )
+            self._writes += 1
+            if self._pending.get(record["run_id"]) is record:
+                del self._pending[record["run_id"]]
+            if self._writes % 100 == 1:
+                cutoff = (datetime.utcnow() - timedelta(days=self.retention_days)).isoformat() + "Z"
+                self._write_conn.execute("DELETE FROM pipeline_runs WHERE started_at < ?", (cutoff,))
+        except (sqlite3.Error, ValueError, RuntimeError):
+            # Nobody waits on the writer's futures — log instead of raising into
+            # one. The record stays pending, so reads still see it.
+            self._write_errors += 1
+            logger.exception("Persisting run %s failed", snapshot["run_id"])
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._read_lock:
+            return self._read_conn.execute(sql, params).fetchall()
+
+    async def get(self, run_id: str) -> dict[str, Any] | None:
+        if run_id in self._pending:
+            return self._pending[run_id]
+        rows = await asyncio.to_thread(
+            self._query, "SELECT record FROM pipeline_runs WHERE run_id = ?", (run_id,)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    async def list(self, limit: int = 20, cursor: str | None = None, include_results: bool = False) -> dict[str, Any]:
+        position = decode_cursor(cursor) if cursor else None
+        column = "record" if include_results else "COALESCE(summary, record)"
+        if position is None:
+            sql = f"SELECT {column} FROM pipeline_runs ORDER BY started_at DESC, run_id DESC LIMIT ?"
+            params: tuple = (limit + 1,)
+        else:
+            sql = (
+                f"SELECT {column} FROM pipeline_runs WHERE (started_at, run_id) < (?, ?) "
+                "ORDER BY started_at DESC, run_id DESC LIMIT ?"
+            )
+            params = (*position, limit + 1)
+        rows = await asyncio.to_thread(self._query, sql, params)
+        records = {r["run_id"]: r for r in (json.loads(row[0]) for row in rows)}
+        # Copy first — the writer thread removes entries as they are flushed
+        records.update({k: r for k, r in dict(self._pending).items() if _before(r, position)})
+        page = _page(list(records.values()), limit)
+        if not include_results:
+            page["runs"] = [summarize(r) for r in page["runs"]]
+        return page
+
+    async def count(self) -> int:
+        pending = list(self._pending)
+        # One statement, so a flush between the two counts can't skew the total
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT (SELECT COUNT(*) FROM pipeline_runs), "
+            f"(SELECT COUNT(*) FROM pipeline_runs WHERE run_id IN ({', '.join('?' * len(pending))}))",
+            tuple(pending),
+        )
+        stored, pending_stored = rows[0]
+        # Re-saved runs are pending and already in the table — count them once
+        return stored + len(pending) - pending_stored
+
+    async def latest(self) -> dict[str, Any] | None:
+        page = await self.list(limit=1)
+        return page["runs"][0] if page["runs"] else None
+
+    async def close(self) -> None:
+        """Flush queued writes and release the connections."""
+        await asyncio.to_thread(self._writer.shutdown, wait=True)
+        self._write_conn.close()
+        self._read_conn.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "path": self.path,
+            "pending_writes": len(self._pending),
+            "writes": self._writes,
+            "write_errors": self._write_errors,
+            "retention_days": self.retention_days,
+        }
+
+
+def open_run_store(backend: str, path: str, retention_days: float = 180) -> MemoryRunStore | SQLiteRunStore:
+    """
+    The configured store. A SQLite path that cannot be opened (e.g. a
+    read-only serverless filesystem) falls back to the in-memory store.
+    """
+    if backend == "memory":
+        return MemoryRunStore()
+    try:
+        return SQLiteRunStore(path, retention_days=retention_days)
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Run store %s unavailable (%s) — keeping run history in memory", path, exc)
+        return MemoryRunStore()
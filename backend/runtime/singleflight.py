@@ -0,0 +1,85 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key attach to the one execution
+already in flight and all receive its result. Results can optionally be
+reused for a short window after completion.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async work by key.
+    The underlying task is shielded, so a caller disconnecting mid-run does
+    not cancel the work the other callers are waiting on.
+    """
+
+    def __init__(self, reuse_window_seconds: float = 0.0):
+        self.reuse_window_seconds = reuse_window_seconds
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._completed: dict[str, tuple[float, Any]] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.reused = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """
+        Run fn() once per key. Returns (result, shared) where shared is True
+        when the result came from another caller's run.
+        """
+        future, shared = self.start(key, fn)
+        return await asyncio.shield(future), shared
+
+    def start(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[asyncio.Future, bool]:
+        """
+        Synchronous half of do(): returns the shared future for key without
+        awaiting it. fn() is invoked here, before start() returns, only when
+        no run is in flight or reusable.
+        """
+        recent = self._completed.get(key)
+        if recent is not None:
+            completed_at, result = recent
+            if time.monotonic() - completed_at <= self.reuse_window_seconds:
+                self.reused += 1
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(result)
+                return future, True
+            del self._completed[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task, True
+
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        self.executions += 1
+        task.add_done_callback(lambda t: self._finish(key, t))
+        return task, False
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if self.reuse_window_seconds <= 0 or task.cancelled() or task.exception() is not None:
+            return
+        now = time.monotonic()
+        # Drop stale entries so keys seen once (e.g. event ids) don't accumulate
+        for stale in [k for k, (t, _) in self._completed.items() if now - t > self.reuse_window_seconds]:
+            del self._completed[stale]
+        self._completed[key] = (now, task.result())
+
+    def in_flight(self) -> list[str]:
+        return list(self._inflight)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "reused": self.reused,
+            "reuse_window_seconds": self.reuse_window_seconds,
+        }
@@ -0,0 +1,102 @@
+"""
+Agent pool — process-wide BedrockModel clients shared across pipeline runs.
+
+Building a BedrockModel creates a boto3 session and bedrock-runtime client,
+which is most of the cost of building an agent and throws away warm HTTPS
+connections. Models are cached per (model id, region, temperature,
+streaming); each run still gets a fresh Agent, so conversation state is
+never shared. Every pooled client's Converse / ConverseStream calls go
+through the process-wide Bedrock rate controller (agents/ratelimit.py).
+"""
+import threading
+import time
+from typing import Any, Callable
+
+from botocore.config import Config
+from strands import Agent
+from strands.models import BedrockModel
+
+from agents.ratelimit import RateController, shared_controller
+from src.config import BEDROCK_POOL_CONNECTIONS
+
+ModelKey = tuple[str, str, float, bool]
+
+
+class AgentPool:
+    """Caches configured models; hands out fresh Agents bound to them."""
+
+    def __init__(self, max_pool_connections: int = BEDROCK_POOL_CONNECTIONS, rate: RateController | None = None):
+        # botocore's own retries would hide throttles from the rate controller
+        self._client_config = Config(max_pool_connections=max_pool_connections, retries={"total_max_attempts": 1})
+        self.rate = rate or shared_controller()
+        self._models: dict[ModelKey, BedrockModel] = {}
+        self._build_ms: dict[ModelKey, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+
+    def model(self, model_id: str, region_name: str, temperature: float, streaming: bool = False) -> BedrockModel:
+        key = (model_id, region_name, temperature, streaming)
+        model = self._models.get(key)
+        if model is None:
+            with self._lock:
+                model = self._models.get(key)
+                if model is None:
+                    started = time.perf_counter()
+                    model = BedrockModel(
+                        model_id=model_id,
+                        region_name=region_name,
+                        temperature=temperature,
+                        streaming=streaming,
+                        boto_client_config=self._client_config,
+                    )
+                    self.rate.instrument(model.client, model_id)
+                    self._build_ms[key] = (time.perf_counter() - started) * 1000
+                    self._models[key] = model
+                    self.misses += 1
+                    return model
+        with self._lock:
+            self.hits += 1
+            self.saved_ms += self._build_ms[key]
+        return model
+
+    def agent(
+        self,
+        model_id: str,
+        region_name: str,
+        temperature: float,
+        system_prompt: str,
+        tools: list[Any] | None = None,
+        streaming: bool = False,
+        callback_handler: Callable[..., Any] | None = None,
+    ) -> Agent:
+        """
+        A new Agent (empty conversation) on the pooled model for this key.
+        With streaming, the model uses ConverseStream and `callback_handler`
+        receives each text chunk as `data=`. Without one, Strands gets an
+        explicit None rather than its default PrintingCallbackHandler, which
+        would echo every response to stdout.
+        """
+        return Agent(
+            model=self.model(model_id, region_name, temperature, streaming),
+            tools=tools or [],
+            system_prompt=system_prompt,
+            # Throttles were already retried by the rate controller, under its deadline
+            retry_strategy=None,
+            callback_handler=callback_handler,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "models": [
+                {"model_id": k[0], "region": k[1], "temperature": k[2], "streaming": k[3], "build_ms": round(ms, 1)}
+                for k, ms in self._build_ms.items()
+            ],
+            "hits": self.hits,
+            "misses": self.misses,
+            "construction_ms_avoided": round(self.saved_ms, 1),
+        }
+
+
+AGENT_POOL = AgentPool()
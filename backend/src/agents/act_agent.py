@@ -2,16 +2,21 @@
 Act Agent — executes approved remediation playbooks.
 Playbooks: EC2_RIGHTSIZE, S3_REVOKE_PUBLIC, TAG_RESOURCES
 In demo mode, simulates actions and returns audit trail.
+Known actions are dispatched straight to their playbook; the LLM agent is
+only consulted for actions the registry cannot resolve.
 """
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 
 from strands import Agent, tool
-from strands.models import BedrockModel
 
-from src.config import AWS_REGION, DEMO_MODE, NOVA_PRO_MODEL_ID
+from src.agent_pool import AGENT_POOL
+from src.config import AWS_REGION, DEMO_MODE, NOVA_PRO_MODEL_ID, PLAYBOOK_MAX_WORKERS
+from src.prompt_encoding import ACT_INCIDENT_FIELDS, encode_incidents, prompt_report
 
 logger = logging.getLogger(__name__)
 
@@ -146,17 +151,7 @@ def playbook_tag_resources(resource_id: str, resource_type: str, tags: str) -> s
 
 # ── Agent factory ─────────────────────────────────────────────────────────────
 
-def build_act_agent() -> Agent:
-    model = BedrockModel(
-        model_id=NOVA_PRO_MODEL_ID,
-        region_name=AWS_REGION,
-        temperature=0.1,
-        streaming=False,
-    )
-    return Agent(
-        model=model,
-        tools=[playbook_ec2_rightsize, playbook_s3_revoke_public, playbook_tag_resources],
-        system_prompt="""You are the Act Agent for Nova DevOps Copilot.
+ACT_SYSTEM_PROMPT = """You are the Act Agent for Nova DevOps Copilot.
 You execute approved remediation playbooks against AWS resources.
 
 Rules:
@@ -167,12 +162,168 @@ Rules:
 5. For TAG_RESOURCES: use playbook_tag_resources with default tags {"cost-center":"unassigned","owner":"platform-team"}
 6. Return a JSON object with key "remediations" — a list of action results
 
-Never execute playbooks for incidents with auto_remediable=false or status=APPROVED_HITL unless explicitly told.""",
+Never execute playbooks for incidents with auto_remediable=false or status=APPROVED_HITL unless explicitly told."""
+
+
+def build_act_agent() -> Agent:
+    return AGENT_POOL.agent(
+        model_id=NOVA_PRO_MODEL_ID,
+        region_name=AWS_REGION,
+        temperature=0.1,
+        tools=[playbook_ec2_rightsize, playbook_s3_revoke_public, playbook_tag_resources],
+        system_prompt=ACT_SYSTEM_PROMPT,
     )
 
 
+# ── Playbook registry ─────────────────────────────────────────────────────────
+
+DEFAULT_TAGS = {"cost-center": "unassigned", "owner": "platform-team"}
+
+
+def _instance_id(resource: str) -> str | None:
+    """i-… from a bare instance id or an EC2 instance ARN."""
+    candidate = resource.rsplit("/", 1)[-1] if ":instance/" in resource else resource
+    return candidate if candidate.startswith("i-") else None
+
+
+def _bucket_name(resource: str) -> str | None:
+    """
+    Bucket from an S3 ARN or s3:// URI. A bare id could be anything (a
+    security group, a service name), so it is left to the LLM fallback.
+    """
+    for prefix in ("arn:aws:s3:::", "s3://"):
+        if resource.startswith(prefix):
+            return resource[len(prefix):].split("/", 1)[0] or None
+    return None
+
+
+def _resource_type(resource: str) -> str:
+    if _instance_id(resource):
+        return "EC2"
+    if resource.startswith("arn:aws:"):
+        return resource.split(":")[2].upper()
+    return "UNKNOWN"
+
+
+def _rightsize_args(incident: dict[str, Any], resource: str) -> dict[str, Any] | None:
+    instance_id = _instance_id(resource)
+    if instance_id is None:
+        return None
+    return {"instance_id": instance_id, "target_instance_type": incident.get("target_instance_type", "t3.small")}
+
+
+def _revoke_public_args(incident: dict[str, Any], resource: str) -> dict[str, Any] | None:
+    bucket = _bucket_name(resource)
+    return {"bucket_name": bucket} if bucket else None
+
+
+def _tag_args(incident: dict[str, Any], resource: str) -> dict[str, Any] | None:
+    resource_type = _resource_type(resource)
+    if resource_type == "UNKNOWN":
+        return None
+    resource_id = _instance_id(resource) or resource
+    return {"resource_id": resource_id, "resource_type": resource_type, "tags": json.dumps(DEFAULT_TAGS)}
+
+
+# recommended_action → (playbook tool, extractor of its typed arguments from one resource)
+PLAYBOOKS = {
+    "EC2_RIGHTSIZE": (playbook_ec2_rightsize, _rightsize_args),
+    "S3_REVOKE_PUBLIC": (playbook_s3_revoke_public, _revoke_public_args),
+    "TAG_RESOURCES": (playbook_tag_resources, _tag_args),
+}
+
+
+def resolve_playbook(incident: dict[str, Any]) -> list[tuple[Any, dict[str, Any]]] | None:
+    """
+    One (playbook, kwargs) per affected resource, or None unless the action
+    applies to every one of them — a partial fix must not pass as a fix.
+    """
+    entry = PLAYBOOKS.get(incident.get("recommended_action", ""))
+    if entry is None:
+        return None
+    playbook, extract = entry
+    calls = []
+    for resource in dict.fromkeys(str(r) for r in incident.get("affected_resources", [])):
+        kwargs = extract(incident, resource)
+        if kwargs is None:
+            return None
+        calls.append((playbook, kwargs))
+    return calls or None
+
+
+def _resource_key(kwargs: dict[str, Any]) -> str:
+    return kwargs.get("instance_id") or kwargs.get("bucket_name") or kwargs.get("resource_id")
+
+
+def _run_resource_jobs(jobs: list[tuple[int, dict[str, Any], Any, dict[str, Any]]]) -> list[tuple[int, dict[str, Any]]]:
+    """Playbooks touching the same resource run one after another."""
+    steps = []
+    for index, incident, playbook, kwargs in jobs:
+        started = time.perf_counter()
+        try:
+            result = json.loads(playbook(**kwargs))
+        except Exception as e:
+            logger.exception("Playbook %s failed for %s", incident.get("recommended_action"), incident.get("incident_id"))
+            result = {"status": "FAILED", "error": str(e)}
+        steps.append((index, {
+            "resource": _resource_key(kwargs),
+            "result": result,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }))
+    return steps
+
+
+def _remediation(incident: dict[str, Any], steps: list[dict[str, Any]]) -> dict[str, Any]:
+    """One remediation per incident; several resources report FAILED unless every playbook succeeded."""
+    if len(steps) == 1:
+        result = steps[0]["result"]
+    else:
+        failed = [s["resource"] for s in steps if s["result"].get("status") in ("FAILED", "UNRESOLVED")]
+        result = {"status": "FAILED" if failed else "SUCCESS", "failed_resources": failed, "resources": steps}
+    return {
+        "incident_id": incident.get("incident_id"),
+        "action": incident.get("recommended_action"),
+        "result": result,
+        "dispatch": "direct",
+        # Resources run concurrently, so the incident took as long as its slowest one
+        "duration_ms": max(s["duration_ms"] for s in steps),
+    }
+
+
+def dispatch_playbooks(
+    incidents: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Run every incident whose action resolves through PLAYBOOKS for all of
+    its affected resources, concurrently across resources.
+    Returns (remediations, unresolved incidents).
+    """
+    by_resource: dict[str, list[tuple[int, dict[str, Any], Any, dict[str, Any]]]] = {}
+    unresolved = []
+    for index, incident in enumerate(incidents):
+        calls = resolve_playbook(incident)
+        if calls is None:
+            unresolved.append(incident)
+            continue
+        for playbook, kwargs in calls:
+            by_resource.setdefault(_resource_key(kwargs), []).append((index, incident, playbook, kwargs))
+
+    steps: dict[int, list[dict[str, Any]]] = {}
+    if by_resource:
+        workers = min(len(by_resource), PLAYBOOK_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="playbook") as pool:
+            for batch in pool.map(_run_resource_jobs, by_resource.values()):
+                for index, step in batch:
+                    steps.setdefault(index, []).append(step)
+    remediations = [_remediation(incidents[i], steps[i]) for i in sorted(steps)]
+    return remediations, unresolved
+
+
 def run_act_agent(incidents: list[dict[str, Any]]) -> dict[str, Any]:
-    """Execute remediation playbooks for auto-remediable incidents."""
+    """
+    Execute remediation playbooks for auto-remediable incidents.
+    Actions that map onto PLAYBOOKS run directly; only the rest go to the LLM.
+    """
     auto_incidents = [i for i in incidents if i.get("auto_remediable")]
 
     if not auto_incidents:
@@ -182,12 +333,21 @@ def run_act_agent(incidents: list[dict[str, Any]]) -> dict[str, Any]:
             "executed_at": datetime.now(timezone.utc).isoformat(),
         }
 
+    remediations, unresolved = dispatch_playbooks(auto_incidents)
+    if not unresolved:
+        return {
+            "remediations": remediations,
+            "executed_at": datetime.now(timezone.utc).isoformat(),
+        }
+
     agent = build_act_agent()
-    prompt = f"""Execute remediation playbooks for these auto-approved incidents:
+    encoded, stats, omitted = encode_incidents(unresolved, ACT_INCIDENT_FIELDS)
+    prompt = f"""Execute remediation playbooks for these auto-approved incidents (pipe-delimited, header row first):
 
-{json.dumps(auto_incidents, indent=2)}
+{encoded}
 
 Call the appropriate playbook tool for each incident and return results."""
+    report = prompt_report(ACT_SYSTEM_PROMPT, prompt, stats)
 
     response = agent(prompt)
     raw = str(response)
@@ -197,39 +357,27 @@ Call the appropriate playbook tool for each incident and return results."""
     if match:
         try:
             result = json.loads(match.group())
-            return {**result, "executed_at": datetime.now(timezone.utc).isoformat()}
+            llm_remediations = [{**r, "dispatch": "llm"} for r in result.get("remediations", [])]
+            # Incidents trimmed by the prompt budget are reported, not guessed at
+            result["remediations"] = remediations + llm_remediations + _unresolved(omitted)
+            return {**result, "prompt_tokens": report, "executed_at": datetime.now(timezone.utc).isoformat()}
         except json.JSONDecodeError:
             pass
 
-    # Fallback: run playbooks directly
-    remediations = []
-    for inc in auto_incidents:
-        action = inc.get("recommended_action")
-        resources = inc.get("affected_resources", [])
-        if not resources:
-            continue
-        resource = resources[0]
-
-        if action == "EC2_RIGHTSIZE":
-            result = json.loads(playbook_ec2_rightsize(resource, "t3.small"))
-        elif action == "S3_REVOKE_PUBLIC":
-            bucket = resource.split(":::")[-1] if ":::" in resource else resource
-            result = json.loads(playbook_s3_revoke_public(bucket))
-        elif action == "TAG_RESOURCES":
-            result = json.loads(playbook_tag_resources(
-                resource, "EC2",
-                json.dumps({"cost-center": "unassigned", "owner": "platform-team"})
-            ))
-        else:
-            continue
-
-        remediations.append({
-            "incident_id": inc.get("incident_id"),
-            "action": action,
-            "result": result,
-        })
-
     return {
-        "remediations": remediations,
+        "remediations": remediations + _unresolved(unresolved),
+        "prompt_tokens": report,
         "executed_at": datetime.now(timezone.utc).isoformat(),
     }
+
+
+def _unresolved(incidents: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        {
+            "incident_id": inc.get("incident_id"),
+            "action": inc.get("recommended_action"),
+            "result": {"status": "UNRESOLVED", "error": "No playbook matched this action and resource"},
+            "dispatch": "none",
+        }
+        for inc in incidents
+    ]
@@ -8,9 +8,10 @@ from datetime import datetime, timezone
 from typing import Any
 
 from strands import Agent
-from strands.models import BedrockModel
 
+from src.agent_pool import AGENT_POOL
 from src.config import AWS_REGION, NOVA_PRO_MODEL_ID
+from src.prompt_encoding import ESCALATE_INCIDENT_FIELDS, encode_incidents, prompt_report
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +30,10 @@ Format as JSON with key "escalations" containing a list of escalation objects.""
 
 
 def build_escalate_agent() -> Agent:
-    model = BedrockModel(
+    return AGENT_POOL.agent(
         model_id=NOVA_PRO_MODEL_ID,
         region_name=AWS_REGION,
         temperature=0.3,
-        streaming=False,
-    )
-    return Agent(
-        model=model,
         system_prompt=ESCALATE_SYSTEM_PROMPT,
     )
 
@@ -53,11 +50,13 @@ def run_escalate_agent(incidents: list[dict[str, Any]]) -> dict[str, Any]:
         }
 
     agent = build_escalate_agent()
-    prompt = f"""Prepare HITL approval summaries for these incidents:
+    encoded, stats, omitted = encode_incidents(hitl_incidents, ESCALATE_INCIDENT_FIELDS)
+    prompt = f"""Prepare HITL approval summaries for these incidents (pipe-delimited, header row first):
 
-{json.dumps(hitl_incidents, indent=2)}
+{encoded}
 
 Return a JSON object with key "escalations"."""
+    report = prompt_report(ESCALATE_SYSTEM_PROMPT, prompt, stats)
 
     response = agent(prompt)
     raw = str(response)
@@ -67,7 +66,9 @@ Return a JSON object with key "escalations"."""
     if match:
         try:
             result = json.loads(match.group())
-            return {**result, "generated_at": datetime.now(timezone.utc).isoformat()}
+            # Incidents trimmed by the prompt budget get a summary built from their own fields
+            result["escalations"] = result.get("escalations", []) + [_basic_escalation(i) for i in omitted]
+            return {**result, "prompt_tokens": report, "generated_at": datetime.now(timezone.utc).isoformat()}
         except json.JSONDecodeError:
             pass
 
@@ -90,5 +91,21 @@ Return a JSON object with key "escalations"."""
                 "requires_approval": True,
             }
         ],
+        "prompt_tokens": report,
         "generated_at": datetime.now(timezone.utc).isoformat(),
     }
+
+
+def _basic_escalation(incident: dict[str, Any]) -> dict[str, Any]:
+    """Escalation summary assembled from the incident itself, without the model."""
+    return {
+        "incident_id": incident.get("incident_id"),
+        "title": incident.get("title", ""),
+        "summary": incident.get("root_cause", ""),
+        "proposed_action": incident.get("recommended_action", "MANUAL_REVIEW"),
+        "risk_of_inaction": "Not assessed — incident exceeded the escalation prompt budget.",
+        "risk_of_action": "Not assessed — review the reasoning chain before approving.",
+        "recommendation": "REVIEW",
+        "confidence_score": incident.get("confidence_score", 0.0),
+        "requires_approval": True,
+    }
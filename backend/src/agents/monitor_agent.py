@@ -2,16 +2,19 @@
 Monitor Agent — polls CloudWatch, Cost Explorer, Security Hub.
 In demo mode returns pre-seeded sandbox data.
 In live mode calls real AWS APIs.
+By default the collectors are called directly; MONITOR_MODE=agent routes
+them through Nova Pro tool calls instead.
 """
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 
 from strands import Agent, tool
-from strands.models import BedrockModel
 
-from src.config import AWS_REGION, DEMO_MODE, NOVA_PRO_MODEL_ID
+from src.agent_pool import AGENT_POOL
+from src.config import AWS_REGION, DEMO_MODE, MONITOR_MODE, NOVA_PRO_MODEL_ID
 from src import sandbox_data
 
 logger = logging.getLogger(__name__)
@@ -56,17 +59,7 @@ def get_security_findings() -> str:
 
 # ── Agent factory ─────────────────────────────────────────────────────────────
 
-def build_monitor_agent() -> Agent:
-    model = BedrockModel(
-        model_id=NOVA_PRO_MODEL_ID,
-        region_name=AWS_REGION,
-        temperature=0.1,
-        streaming=False,
-    )
-    return Agent(
-        model=model,
-        tools=[get_cloudwatch_metrics, get_cost_anomalies, get_security_findings],
-        system_prompt="""You are the Monitor Agent for Nova DevOps Copilot.
+MONITOR_SYSTEM_PROMPT = """You are the Monitor Agent for Nova DevOps Copilot.
 Your job is to collect raw infrastructure signals from AWS services.
 
 Steps:
@@ -80,12 +73,51 @@ Return a structured JSON summary with keys:
   - security_findings: list of security findings
   - collected_at: ISO timestamp
 
-Do not interpret or remediate — only collect and structure the data.""",
+Do not interpret or remediate — only collect and structure the data."""
+
+
+def build_monitor_agent() -> Agent:
+    return AGENT_POOL.agent(
+        model_id=NOVA_PRO_MODEL_ID,
+        region_name=AWS_REGION,
+        temperature=0.1,
+        tools=[get_cloudwatch_metrics, get_cost_anomalies, get_security_findings],
+        system_prompt=MONITOR_SYSTEM_PROMPT,
     )
 
 
-def run_monitor_agent() -> dict[str, Any]:
-    """Run the monitor agent and return structured signals."""
+# Signal key → collector tool
+COLLECTORS = {
+    "cloudwatch": get_cloudwatch_metrics,
+    "cost_anomalies": get_cost_anomalies,
+    "security_findings": get_security_findings,
+}
+
+
+def collect_signals() -> dict[str, Any]:
+    """Call every collector concurrently and assemble the signals dict in code."""
+    signals: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=len(COLLECTORS), thread_name_prefix="monitor") as pool:
+        futures = {key: pool.submit(collector) for key, collector in COLLECTORS.items()}
+        for key, future in futures.items():
+            try:
+                signals[key] = json.loads(future.result())
+            except Exception as e:
+                logger.warning("Collector %s failed: %s", key, e)
+                signals[key] = []
+                errors[key] = str(e)
+    signals["collected_at"] = datetime.now(timezone.utc).isoformat()
+    if errors:
+        signals["collection_errors"] = errors
+    return signals
+
+
+def run_monitor_agent(mode: str | None = None) -> dict[str, Any]:
+    """Collect structured signals — directly by default, or via the LLM agent."""
+    if (mode or MONITOR_MODE) != "agent":
+        return collect_signals()
+
     agent = build_monitor_agent()
     response = agent(
         "Collect all current infrastructure signals: CloudWatch metrics, "
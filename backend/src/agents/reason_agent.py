@@ -5,14 +5,27 @@ Correlates Cost + Security + CloudWatch together (DevOps Guru cannot do this).
 """
 import json
 import logging
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
 from strands import Agent, tool
-from strands.models import BedrockModel
 
-from src.config import AWS_REGION, NOVA_PRO_MODEL_ID, AUTO_REMEDIATE_THRESHOLD
+from src.agent_pool import AGENT_POOL
+from src.config import (
+    AUTO_REMEDIATE_THRESHOLD,
+    AWS_REGION,
+    NOVA_PRO_MODEL_ID,
+    REASON_SHARD_WORKERS,
+    REASON_SHARDED,
+    REASON_STREAMING,
+)
+from src.incident_stream import IncidentStreamParser
+from src.prompt_encoding import encode_signals, prompt_report
+from src.signal_shards import resource_keys, shard_signals
 
 logger = logging.getLogger(__name__)
 
@@ -44,51 +57,115 @@ Be thorough in reasoning_chain — operators rely on it for audit and trust.
 DO NOT skip reasoning steps. Every conclusion must be traceable."""
 
 
-def build_reason_agent() -> Agent:
-    model = BedrockModel(
+def build_reason_agent(
+    streaming: bool = REASON_STREAMING,
+    callback_handler: Callable[..., Any] | None = None,
+) -> Agent:
+    return AGENT_POOL.agent(
         model_id=NOVA_PRO_MODEL_ID,
         region_name=AWS_REGION,
         temperature=0.2,
-        streaming=False,
-    )
-    return Agent(
-        model=model,
         system_prompt=REASON_SYSTEM_PROMPT,
+        streaming=streaming,
+        callback_handler=callback_handler,
     )
 
 
-def run_reason_agent(signals: dict[str, Any]) -> dict[str, Any]:
+class _IncidentEmitter:
     """
-    Run the Reason Agent with collected signals.
-    Returns structured incidents with reasoning chains.
+    Finalizes incidents as they complete and hands each one on exactly once.
+    Shared by all shards of a run, so duplicates across shards are dropped
+    and colliding ids are re-numbered before anything downstream sees them.
+    The first copy of a duplicate wins — unlike _merge_incidents, which keeps
+    the most confident one — because it may already be in Act or Escalate.
+    """
+
+    def __init__(self, on_incident: Callable[[dict[str, Any]], Any]):
+        self.on_incident = on_incident
+        self.incidents: list[dict] = []
+        self.first_incident_ms: float | None = None
+        self._started = time.perf_counter()
+        self._keys: set[tuple] = set()
+        self._ids: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, inc: dict[str, Any], shard: int = 0) -> None:
+        with self._lock:
+            key = _incident_key(inc)
+            if key in self._keys:
+                return
+            self._keys.add(key)
+            _finalize([inc])
+            if inc["incident_id"] in self._ids:
+                inc["incident_id"] = f"{inc['incident_id']}-s{shard}"
+            self._ids.add(inc["incident_id"])
+            self.incidents.append(inc)
+            if self.first_incident_ms is None:
+                self.first_incident_ms = round((time.perf_counter() - self._started) * 1000, 1)
+                logger.info("Reason: first incident after %.1f ms", self.first_incident_ms)
+        self.on_incident(inc)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "time_to_first_incident_ms": self.first_incident_ms,
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 1),
+            "incidents": len(self.incidents),
+        }
+
+
+def _reason_over(
+    signals: dict[str, Any],
+    emit: Callable[[dict[str, Any]], None] | None = None,
+) -> tuple[list[dict] | None, dict[str, Any], str]:
     """
-    agent = build_reason_agent()
+    One model call over `signals`. Returns (incidents or None if unparseable, token report, raw).
+    With `emit`, the response is streamed and each incident is emitted as soon as it is complete.
+    """
+    parser = IncidentStreamParser()
+
+    def on_chunk(**event: Any) -> None:
+        if event.get("data"):
+            for inc in parser.feed(event["data"]):
+                emit(inc)
+
+    if emit is None:
+        agent = build_reason_agent(streaming=False)
+    else:
+        agent = build_reason_agent(streaming=True, callback_handler=on_chunk)
 
+    encoded, stats = encode_signals(signals)
     prompt = f"""Analyze these AWS infrastructure signals and identify all incidents.
 Correlate signals across CloudWatch, Cost Explorer, and Security Hub.
 
-SIGNALS:
-{json.dumps(signals, indent=2)}
+SIGNALS (pipe-delimited tables, header row first):
+{encoded}
 
 Return a JSON object with key "incidents" containing all identified incidents.
 Each incident must include a detailed reasoning_chain showing every analytical step."""
 
     response = agent(prompt)
     raw = str(response)
+    report = prompt_report(REASON_SYSTEM_PROMPT, prompt, stats)
+    if parser.found_array:
+        return parser.incidents, report, raw
 
     # Parse JSON from response
     import re
     match = re.search(r"\{.*\}", raw, re.DOTALL)
     if match:
         try:
-            result = json.loads(match.group())
-            incidents = result.get("incidents", [])
+            incidents = json.loads(match.group()).get("incidents", [])
         except json.JSONDecodeError:
-            incidents = _fallback_incidents(signals)
-    else:
-        incidents = _fallback_incidents(signals)
+            return None, report, raw
+        if emit is not None:
+            for inc in incidents:
+                emit(inc)
+        return incidents, report, raw
+    return None, report, raw
 
-    # Ensure each incident has required fields + auto_remediable flag
+
+def _finalize(incidents: list[dict]) -> None:
+    """Ensure each incident has required fields + auto_remediable flag."""
     for inc in incidents:
         if "incident_id" not in inc:
             inc["incident_id"] = str(uuid.uuid4())[:8]
@@ -101,11 +178,168 @@ Each incident must include a detailed reasoning_chain showing every analytical s
         inc.setdefault("status", "PENDING")
         inc.setdefault("created_at", datetime.now(timezone.utc).isoformat())
 
-    return {
+
+def _incident_key(inc: dict[str, Any]) -> tuple:
+    return (
+        str(inc.get("title", "")).strip().lower(),
+        frozenset(inc.get("affected_resources", [])),
+    )
+
+
+def run_reason_agent(
+    signals: dict[str, Any],
+    on_incident: Callable[[dict[str, Any]], Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Run the Reason Agent with collected signals.
+    Returns structured incidents with reasoning chains.
+    With REASON_SHARDED, independent signal groups are reasoned over concurrently.
+    With `on_incident`, the response is streamed and each finalized incident
+    is passed to it while the rest are still being generated. A streamed
+    run does not raise once incidents may have reached Act: it keeps what
+    was emitted (or falls back) and reports the failure as `reason_error`.
+    """
+    emit = _IncidentEmitter(on_incident) if on_incident is not None else None
+    if REASON_SHARDED:
+        shards = shard_signals(signals)
+        if len(shards) > 1:
+            return _run_sharded(signals, shards, emit)
+
+    error: Exception | None = None
+    try:
+        incidents, report, raw = _reason_over(signals, emit)
+    except Exception as e:
+        if emit is None:
+            raise
+        # Streamed incidents may already have run playbooks in Act: finish
+        # with what arrived (or the fallback) so their records are returned
+        logger.warning("Streamed reasoning failed after %d incidents: %s", len(emit.incidents), e)
+        incidents, report, raw, error = list(emit.incidents) or None, None, "", e
+    if incidents is None:
+        incidents = _fallback_incidents(signals)
+        if emit is not None:
+            for inc in incidents:
+                emit(inc)
+    if emit is not None:
+        incidents = emit.incidents
+    else:
+        _finalize(incidents)
+
+    result = {
         "incidents": incidents,
         "analyzed_at": datetime.now(timezone.utc).isoformat(),
+        "prompt_tokens": report,
         "_raw_response": raw,
     }
+    if error is not None:
+        result["reason_error"] = str(error)
+    if emit is not None:
+        result["streaming"] = emit.stats()
+    return result
+
+
+def _shard_fallback(shard: dict[str, Any]) -> list[dict]:
+    """The deterministic fallback incidents that concern this shard's resources."""
+    keys = set(shard["resource_keys"])
+    return [
+        inc for inc in _fallback_incidents(shard)
+        if any(resource_keys(r) & keys for r in inc.get("affected_resources", []))
+    ]
+
+
+def _merge_incidents(per_shard: list[list[dict]]) -> list[dict]:
+    """
+    Drop incidents reported by several shards, keeping the highest
+    confidence_score; re-id colliding incident ids. Non-streaming runs only —
+    streamed incidents are de-duplicated first-come by _IncidentEmitter.
+    """
+    merged: dict[tuple, dict] = {}
+    for index, incidents in enumerate(per_shard):
+        for inc in incidents:
+            key = _incident_key(inc)
+            kept = merged.get(key)
+            if kept is None or inc.get("confidence_score", 0) > kept.get("confidence_score", 0):
+                merged[key] = {**inc, "_shard": index}
+    seen_ids: set[str] = set()
+    result = []
+    for inc in merged.values():
+        shard_index = inc.pop("_shard")
+        if inc.get("incident_id") in seen_ids:
+            inc["incident_id"] = f"{inc['incident_id']}-s{shard_index}"
+        if "incident_id" in inc:
+            seen_ids.add(inc["incident_id"])
+        result.append(inc)
+    return result
+
+
+def _run_sharded(
+    signals: dict[str, Any],
+    shards: list[dict[str, Any]],
+    emit: _IncidentEmitter | None = None,
+) -> dict[str, Any]:
+    # What each shard has already handed downstream while streaming
+    emitted: list[list[dict]] = [[] for _ in shards]
+
+    def shard_emit(index: int) -> Callable[[dict[str, Any]], None] | None:
+        if emit is None:
+            return None
+
+        def forward(inc: dict[str, Any]) -> None:
+            emitted[index].append(inc)
+            emit(inc, index)
+        return forward
+
+    def reason(index: int) -> tuple[list[dict] | None, dict[str, Any] | None, str, Exception | None]:
+        try:
+            return (*_reason_over(shards[index], shard_emit(index)), None)
+        except Exception as e:
+            logger.warning("Reason shard over %s failed: %s", shards[index]["resource_keys"][:3], e)
+            return None, None, "", e
+
+    with ThreadPoolExecutor(max_workers=min(len(shards), REASON_SHARD_WORKERS), thread_name_prefix="reason") as pool:
+        outcomes = list(pool.map(reason, range(len(shards))))
+
+    errors = [e for *_, e in outcomes if e is not None]
+    # Streaming runs never raise: incidents may already be in Act
+    if len(errors) == len(shards) and emit is None:
+        raise errors[0]
+
+    per_shard, reports, shard_errors = [], [], []
+    for index, (shard, (incidents, report, _, error)) in enumerate(zip(shards, outcomes)):
+        if incidents is None and emitted[index]:
+            # Failed mid-stream: what it already emitted stands, no fallback on top
+            shard_errors.append({"shard": index, "error": str(error) if error else "unparseable response"})
+            incidents = emitted[index]
+        elif incidents is None:
+            # Only this shard falls back; the others keep their model output
+            shard_errors.append({"shard": index, "error": str(error) if error else "unparseable response"})
+            incidents = _shard_fallback(shard)
+            if emit is not None:
+                for inc in incidents:
+                    emit(inc, index)
+        per_shard.append(incidents)
+        reports.append(report)
+
+    if emit is not None:
+        # Already merged and finalized as they streamed in
+        incidents = emit.incidents
+    else:
+        incidents = _merge_incidents(per_shard)
+        _finalize(incidents)
+    result = {
+        "incidents": incidents,
+        "analyzed_at": datetime.now(timezone.utc).isoformat(),
+        "shards": len(shards),
+        "shard_errors": shard_errors,
+        "prompt_tokens": {
+            "estimated_tokens": sum(r["estimated_tokens"] for r in reports if r),
+            "per_shard": reports,
+        },
+        "_raw_response": "\n\n".join(raw for _, _, raw, _ in outcomes if raw),
+    }
+    if emit is not None:
+        result["streaming"] = emit.stats()
+    return result
 
 
 def _fallback_incidents(signals: dict) -> list[dict]:
@@ -1,8 +1,10 @@
 """
 FastAPI backend — serves the Nova DevOps Copilot dashboard.
 """
+import asyncio
 import json
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Any
 
@@ -10,16 +12,25 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from src.pipeline import run_pipeline
+from src.agent_pool import AGENT_POOL
+from src.pipeline import run_pipeline, warm_agents
 from src.config import DEMO_MODE
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Build pooled Bedrock clients before the first pipeline run needs them
+    await asyncio.to_thread(warm_agents)
+    yield
+
+
 app = FastAPI(
     title="Nova DevOps Copilot API",
     description="Proactive Infrastructure Guardian — Amazon Nova AI Hackathon 2026",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -46,7 +57,7 @@ class ApprovalRequest(BaseModel):
 # ── Routes ───────────────────────────────────────────────────────────────────
 
 @app.get("/")
-def root():
+async def root():
     return {
         "service": "Nova DevOps Copilot",
         "version": "1.0.0",
@@ -56,19 +67,31 @@ def root():
 
 
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
 
 
+@app.get("/api/agents/pool")
+async def get_agent_pool():
+    """Pooled Bedrock models and the construction time reuse has avoided."""
+    return AGENT_POOL.stats()
+
+
+@app.get("/api/agents/rate-limits")
+async def get_rate_limits():
+    """Live Bedrock concurrency limits per model, with throttle, retry and rejection counts."""
+    return AGENT_POOL.rate.stats()
+
+
 @app.post("/api/pipeline/run")
-def trigger_pipeline():
+async def trigger_pipeline():
     """
     Trigger the 4-agent pipeline: Monitor → Reason → Act → Escalate.
     Returns complete pipeline result with incidents, remediations, and escalations.
     """
     global _incidents_store
     try:
-        result = run_pipeline()
+        result = await run_pipeline()
         _pipeline_cache["latest"] = result
         _incidents_store = result.get("incidents", [])
         return result
@@ -78,24 +101,24 @@ def trigger_pipeline():
 
 
 @app.get("/api/pipeline/latest")
-def get_latest_pipeline():
+async def get_latest_pipeline():
     """Return the most recent pipeline run result."""
     if "latest" not in _pipeline_cache:
         # Auto-run for demo
-        return trigger_pipeline()
+        return await trigger_pipeline()
     return _pipeline_cache["latest"]
 
 
 @app.get("/api/incidents")
-def list_incidents():
+async def list_incidents():
     """List all incidents from the latest pipeline run."""
     if not _incidents_store:
-        trigger_pipeline()
+        await trigger_pipeline()
     return {"incidents": _incidents_store}
 
 
 @app.get("/api/incidents/{incident_id}")
-def get_incident(incident_id: str):
+async def get_incident(incident_id: str):
     """Get a specific incident by ID, including full reasoning chain."""
     for inc in _incidents_store:
         if inc.get("incident_id") == incident_id:
@@ -104,7 +127,7 @@ def get_incident(incident_id: str):
 
 
 @app.post("/api/incidents/{incident_id}/approve")
-def approve_incident(incident_id: str, request: ApprovalRequest):
+async def approve_incident(incident_id: str, request: ApprovalRequest):
     """
     HITL approval endpoint — operator approves or rejects a remediation.
     Approved incidents will be executed on next pipeline run (or immediately in demo).
@@ -119,7 +142,7 @@ def approve_incident(incident_id: str, request: ApprovalRequest):
 
                 # Execute immediately in demo
                 from src.agents.act_agent import run_act_agent
-                act_result = run_act_agent([inc])
+                act_result = await asyncio.to_thread(run_act_agent, [inc])
                 inc["status"] = "REMEDIATED"
                 return {
                     "message": f"Incident {incident_id} approved and remediated",
@@ -135,7 +158,7 @@ def approve_incident(incident_id: str, request: ApprovalRequest):
 
 
 @app.get("/api/demo/signals")
-def get_demo_signals():
+async def get_demo_signals():
     """Return raw sandbox signals for demo visualization."""
     from src import sandbox_data
     return {
@@ -15,5 +15,26 @@ NOVA_PRO_MODEL_ID = os.getenv("NOVA_PRO_MODEL_ID", "us.amazon.nova-pro-v1:0")
 # Demo / sandbox mode — uses pre-seeded data instead of live AWS calls
 DEMO_MODE = os.getenv("DEMO_MODE", "true").lower() == "true"
 
+# Monitor collection: "direct" calls the collectors in code, "agent" routes them through Nova Pro
+MONITOR_MODE = os.getenv("MONITOR_MODE", "direct").lower()
+
 # Confidence threshold for auto-remediation (below this → HITL)
 AUTO_REMEDIATE_THRESHOLD = float(os.getenv("AUTO_REMEDIATE_THRESHOLD", "0.85"))
+
+# Per-prompt token budget for encoded signals / incidents (0 disables trimming)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "4000"))
+
+# Pooled HTTPS connections per shared bedrock-runtime client (see src/agent_pool.py)
+BEDROCK_POOL_CONNECTIONS = int(os.getenv("BEDROCK_POOL_CONNECTIONS", "32"))
+
+# Act stage: playbooks on different resources run concurrently on this many threads
+PLAYBOOK_MAX_WORKERS = int(os.getenv("PLAYBOOK_MAX_WORKERS", "8"))
+
+# Reason stage sharding (opt-in): analyze correlated signal groups concurrently
+REASON_SHARDED = os.getenv("REASON_SHARDED", "false").lower() == "true"
+REASON_SHARD_MAX_SIGNALS = int(os.getenv("REASON_SHARD_MAX_SIGNALS", "12"))
+REASON_SHARD_WORKERS = int(os.getenv("REASON_SHARD_WORKERS", "4"))
+
+# Reason stage streaming (opt-in): parse incidents out of the ConverseStream response as they complete
+# and start Act / Escalate on them before the full response has arrived
+REASON_STREAMING = os.getenv("REASON_STREAMING", "false").lower() == "true"
@@ -0,0 +1,87 @@
+"""
+Incremental incident parser for streamed Reason output.
+
+Nova streams the `{"incidents": [...]}` document a few characters at a
+time. Rather than wait for the whole response and regex it, the parser
+tracks JSON structure (depth, strings, escapes) as chunks arrive and
+returns each element of the `incidents` array the moment its closing
+brace is seen. Every character is scanned once, so the total cost stays
+linear in the response size however it is chunked.
+"""
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class IncidentStreamParser:
+    """Feed text chunks; get back the incident objects they completed."""
+
+    def __init__(self, key: str = "incidents"):
+        self.key = key
+        self.buffer = ""
+        self.found_array = False
+        self.incidents: list[dict[str, Any]] = []
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = -1
+        self._last_string: str | None = None
+        self._expect_array = False
+        self._array_depth: int | None = None
+        self._item_start = -1
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        self.buffer += chunk
+        completed: list[dict[str, Any]] = []
+        text = self.buffer
+        for pos in range(self._pos, len(text)):
+            ch = text[pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:pos]
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif ch == ":":
+                # `"incidents":` directly inside the top-level object
+                self._expect_array = self._depth == 1 and self._last_string == self.key
+            elif ch in "{[":
+                if ch == "[" and self._expect_array and self._array_depth is None:
+                    self._array_depth = self._depth + 1
+                    self.found_array = True
+                elif ch == "{" and self._array_depth is not None and self._depth == self._array_depth:
+                    self._item_start = pos
+                self._depth += 1
+                self._expect_array = False
+            elif ch in "}]":
+                self._depth -= 1
+                if ch == "}" and self._item_start >= 0 and self._depth == self._array_depth:
+                    incident = self._decode(text[self._item_start:pos + 1])
+                    self._item_start = -1
+                    if incident is not None:
+                        completed.append(incident)
+                elif ch == "]" and self._array_depth is not None and self._depth == self._array_depth - 1:
+                    self._array_depth = None
+            elif not ch.isspace():
+                self._expect_array = False
+        self._pos = len(text)
+        self.incidents.extend(completed)
+        return completed
+
+    @staticmethod
+    def _decode(text: str) -> dict[str, Any] | None:
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            logger.warning("Skipping malformed streamed incident (%d chars)", len(text))
+            return None
+        return value if isinstance(value, dict) else None
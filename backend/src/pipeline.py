@@ -1,22 +1,177 @@
 """
-Main pipeline orchestrator — runs the 4-agent loop:
-Monitor → Reason → Act → Escalate
+Main pipeline orchestrator — runs the 4-agent loop as a stage DAG:
+Monitor → Reason → (Act ∥ Escalate)
+
+Escalate only needs the incidents Reason marked as non-auto-remediable, so
+it runs alongside Act instead of after it. Stages are blocking agent calls
+and run on worker threads; the event loop only coordinates them.
+
+With REASON_STREAMING, Act and Escalate do not wait for Reason at all: each
+incident is handed to them as soon as the streamed response completes it.
 
 Returns a complete pipeline result for the dashboard.
 """
+import asyncio
 import logging
+import queue
+import time
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
-from src.agents.monitor_agent import run_monitor_agent
-from src.agents.reason_agent import run_reason_agent
-from src.agents.act_agent import run_act_agent
-from src.agents.escalate_agent import run_escalate_agent
+from src.agents.monitor_agent import build_monitor_agent, run_monitor_agent
+from src.agents.reason_agent import build_reason_agent, run_reason_agent
+from src.agents.act_agent import build_act_agent, run_act_agent
+from src.agents.escalate_agent import build_escalate_agent, run_escalate_agent
+from src.config import REASON_STREAMING
 
 logger = logging.getLogger(__name__)
 
+# name → (dependencies, fn(results of completed stages) -> stage result)
+StageGraph = dict[str, tuple[tuple[str, ...], Callable[[dict[str, Any]], Any]]]
+
+
+def warm_agents() -> None:
+    """Build each stage's agent once so pooled models and clients exist before the first run."""
+    for build in (build_monitor_agent, build_reason_agent, build_act_agent, build_escalate_agent):
+        build()
+
+
+async def run_stages(stages: StageGraph) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """
+    Run a stage DAG: every stage starts as soon as its dependencies finish,
+    on a worker thread. Returns (results, timings) keyed by stage name.
+    A failing stage cancels the stages still waiting on it.
+    """
+    results: dict[str, Any] = {}
+    timings: dict[str, dict[str, Any]] = {}
+    tasks: dict[str, asyncio.Task] = {}
+    origin = time.perf_counter()
+
+    async def run(name: str) -> None:
+        deps, fn = stages[name]
+        await asyncio.gather(*(tasks[d] for d in deps))
+        started = time.perf_counter()
+        started_at = datetime.now(timezone.utc).isoformat()
+        logger.info("Stage %s starting", name)
+        try:
+            results[name] = await asyncio.to_thread(fn, results)
+        finally:
+            timings[name] = {
+                "started_at": started_at,
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+                "start_offset_ms": round((started - origin) * 1000, 1),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+
+    for name in stages:
+        tasks[name] = asyncio.create_task(run(name), name=f"stage-{name}")
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    return results, timings
+
+
+def _mark_hitl(inc: dict[str, Any]) -> None:
+    # Known as soon as Reason has the incident — lets Escalate start alongside Act
+    if not inc.get("auto_remediable"):
+        inc["status"] = "PENDING_HITL"
+
+
+def _reason(results: dict[str, Any]) -> dict[str, Any]:
+    reason_result = run_reason_agent(results["monitor"])
+    for inc in reason_result.get("incidents", []):
+        _mark_hitl(inc)
+    return reason_result
+
+
+PIPELINE_STAGES: StageGraph = {
+    "monitor": ((), lambda r: run_monitor_agent()),
+    "reason": (("monitor",), _reason),
+    "act": (("reason",), lambda r: run_act_agent(r["reason"].get("incidents", []))),
+    "escalate": (("reason",), lambda r: run_escalate_agent(r["reason"].get("incidents", []))),
+}
+
+
+class _IncidentFeed:
+    """
+    Runs a stage over incidents while Reason is still streaming them. Each
+    call takes every incident that arrived while the previous call was busy,
+    so the first incident is handled at once without one model call apiece.
+    """
+
+    def __init__(self, run: Callable[[list[dict[str, Any]]], dict[str, Any]]):
+        self.run = run
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue()
 
-def run_pipeline() -> dict[str, Any]:
+    def put(self, inc: dict[str, Any]) -> None:
+        self._queue.put(inc)
+
+    def close(self) -> None:
+        self._queue.put(None)
+
+    def drain(self) -> list[dict[str, Any]]:
+        """Stage results, one per batch; returns once the feed is closed."""
+        outputs, done = [], False
+        while not done:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            done = None in batch
+            batch = [inc for inc in batch if inc is not None]
+            if batch:
+                outputs.append(self.run(batch))
+        return outputs
+
+
+def _combine(outputs: list[dict[str, Any]], key: str) -> dict[str, Any]:
+    """Merge per-batch stage results into the shape of a single call."""
+    items: dict[Any, dict[str, Any]] = {}
+    for output in outputs:
+        for item in output.get(key, []):
+            items.setdefault(item.get("incident_id") or id(item), item)
+    reports = [o["prompt_tokens"] for o in outputs if o.get("prompt_tokens")]
+    return {
+        key: list(items.values()),
+        "batches": len(outputs),
+        "prompt_tokens": None if not reports else {
+            "estimated_tokens": sum(r["estimated_tokens"] for r in reports),
+            "per_call": reports,
+        },
+    }
+
+
+def streaming_stages() -> StageGraph:
+    """A per-run stage graph where Act and Escalate consume incidents as Reason streams them."""
+    act_feed = _IncidentFeed(run_act_agent)
+    escalate_feed = _IncidentFeed(run_escalate_agent)
+
+    def hand_off(inc: dict[str, Any]) -> None:
+        _mark_hitl(inc)
+        (act_feed if inc.get("auto_remediable") else escalate_feed).put(inc)
+
+    def reason(results: dict[str, Any]) -> dict[str, Any]:
+        try:
+            return run_reason_agent(results["monitor"], on_incident=hand_off)
+        finally:
+            # Also on failure, so the consumers never wait on a dead producer
+            act_feed.close()
+            escalate_feed.close()
+
+    return {
+        "monitor": ((), lambda r: run_monitor_agent()),
+        "reason": (("monitor",), reason),
+        "act": (("monitor",), lambda r: _combine(act_feed.drain(), "remediations")),
+        "escalate": (("monitor",), lambda r: _combine(escalate_feed.drain(), "escalations")),
+    }
+
+
+async def run_pipeline() -> dict[str, Any]:
     """
     Execute the full 4-agent pipeline.
     Returns complete result dict for API consumption.
@@ -24,30 +179,22 @@ def run_pipeline() -> dict[str, Any]:
     pipeline_start = datetime.now(timezone.utc)
     logger.info("Pipeline starting at %s", pipeline_start.isoformat())
 
-    # Stage 1: Monitor
-    logger.info("[1/4] Monitor Agent — collecting signals...")
-    signals = run_monitor_agent()
-
-    # Stage 2: Reason
-    logger.info("[2/4] Reason Agent — synthesizing cross-service signals...")
-    reason_result = run_reason_agent(signals)
+    results, timings = await run_stages(streaming_stages() if REASON_STREAMING else PIPELINE_STAGES)
+    signals = results["monitor"]
+    reason_result = results["reason"]
+    act_result = results["act"]
+    escalate_result = results["escalate"]
     incidents = reason_result.get("incidents", [])
 
-    # Stage 3: Act (auto-remediable incidents only)
-    logger.info("[3/4] Act Agent — executing approved playbooks...")
-    act_result = run_act_agent(incidents)
-
     # Update incident statuses based on remediations
-    remediated_ids = {r["incident_id"] for r in act_result.get("remediations", [])}
+    remediated_ids = {
+        r["incident_id"]
+        for r in act_result.get("remediations", [])
+        if (r.get("result") or {}).get("status") not in ("FAILED", "UNRESOLVED")
+    }
     for inc in incidents:
         if inc["incident_id"] in remediated_ids:
             inc["status"] = "REMEDIATED"
-        elif not inc.get("auto_remediable"):
-            inc["status"] = "PENDING_HITL"
-
-    # Stage 4: Escalate (HITL incidents)
-    logger.info("[4/4] Escalate Agent — generating HITL summaries...")
-    escalate_result = run_escalate_agent(incidents)
 
     pipeline_end = datetime.now(timezone.utc)
     duration_ms = int((pipeline_end - pipeline_start).total_seconds() * 1000)
@@ -57,10 +204,19 @@ def run_pipeline() -> dict[str, Any]:
         "started_at": pipeline_start.isoformat(),
         "completed_at": pipeline_end.isoformat(),
         "duration_ms": duration_ms,
+        "stages": timings,
+        # Streamed runs only: how long Act / Escalate waited for their first incident
+        "time_to_first_incident_ms": (reason_result.get("streaming") or {}).get("time_to_first_incident_ms"),
         "signals": signals,
         "incidents": incidents,
         "remediations": act_result.get("remediations", []),
         "escalations": escalate_result.get("escalations", []),
+        # Estimated prompt size per LLM stage (None when the stage made no call)
+        "prompt_tokens": {
+            "reason": reason_result.get("prompt_tokens"),
+            "act": act_result.get("prompt_tokens"),
+            "escalate": escalate_result.get("prompt_tokens"),
+        },
         "summary": {
             "total_incidents": len(incidents),
             "auto_remediated": len(remediated_ids),
@@ -0,0 +1,176 @@
+"""
+Prompt encoding — compact, budgeted rendering of signals and incidents.
+
+Agents used to embed `json.dumps(..., indent=2)` of everything they were
+handed. This layer drops fields the model never needs (console URLs, raw
+responses), drops healthy readings, renders homogeneous lists as pipe
+tables (keys once per table instead of once per row) and trims the
+lowest-priority rows so every prompt stays inside a token budget.
+"""
+from typing import Any
+
+from src.config import PROMPT_TOKEN_BUDGET
+
+# Fields never useful to the model
+DROP_FIELDS = {"remediation_url", "cloudwatch_url", "_raw_response", "anomaly", "created_at", "status"}
+
+SEVERITY_RANK = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3, "INFORMATIONAL": 4}
+
+# Incident columns each downstream stage needs
+ACT_INCIDENT_FIELDS = ["incident_id", "recommended_action", "affected_resources", "confidence_score", "title"]
+ESCALATE_INCIDENT_FIELDS = [
+    "incident_id",
+    "title",
+    "severity",
+    "affected_resources",
+    "cross_service_signals",
+    "root_cause",
+    "reasoning_chain",
+    "confidence_score",
+    "recommended_action",
+    "estimated_monthly_savings_usd",
+]
+
+MAX_CELL_CHARS = 400
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars/token)."""
+    return len(text) // 4 + 1
+
+
+def _cell(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        text = "; ".join(_cell(v) for v in value)
+    elif isinstance(value, dict):
+        text = ", ".join(f"{k}={_cell(v)}" for k, v in value.items())
+    elif isinstance(value, float):
+        text = f"{value:g}"
+    else:
+        text = "" if value is None else str(value)
+    text = text.replace("|", "/").replace("\n", " ")
+    return text if len(text) <= MAX_CELL_CHARS else text[: MAX_CELL_CHARS - 1] + "…"
+
+
+def _columns(rows: list[dict[str, Any]], fields: list[str] | None) -> list[str]:
+    if fields:
+        return [f for f in fields if any(f in r for r in rows)]
+    columns: list[str] = []
+    for row in rows:
+        for key in row:
+            if key not in DROP_FIELDS and key not in columns:
+                columns.append(key)
+    # Columns that are empty on every row carry no signal
+    return [c for c in columns if any(r.get(c) not in (None, "", [], {}) for r in rows)]
+
+
+class Table:
+    """A titled list of records rendered as `col|col` header plus one line per row."""
+
+    def __init__(self, title: str, rows: list[dict[str, Any]], fields: list[str] | None = None, note: str = ""):
+        self.title = title
+        self.rows = list(rows)
+        self.columns = _columns(rows, fields)
+        self.lines = ["|".join(_cell(r.get(c)) for c in self.columns) for r in rows]
+        self.note = note
+        self.omitted: list[dict[str, Any]] = []
+
+    @property
+    def header(self) -> str:
+        return f"## {self.title} ({len(self.rows)})\n" + "|".join(self.columns)
+
+    def render(self) -> str:
+        parts = [self.header, *self.lines]
+        if self.omitted:
+            parts.append(f"… {len(self.omitted)} lower-priority rows omitted")
+        if self.note:
+            parts.append(self.note)
+        return "\n".join(parts)
+
+
+def render(tables: list[Table], budget: int | None = None) -> tuple[str, dict[str, Any]]:
+    """
+    Render tables into one prompt block, dropping trailing (lowest-priority)
+    rows from the longest table until the estimate fits `budget`.
+    Returns (text, stats) with the token estimate and rows omitted.
+    """
+    budget = PROMPT_TOKEN_BUDGET if budget is None else budget
+
+    def trim(tokens: int) -> None:
+        # Per-line estimates, so trimming stays linear in the number of rows
+        while tokens > budget:
+            table = max(tables, key=lambda t: len(t.lines), default=None)
+            if table is None or not table.lines:
+                return
+            tokens -= len(table.lines.pop()) // 4 + 1
+
+    def join() -> str:
+        for table in tables:
+            table.omitted = table.rows[len(table.lines):]
+        return "\n\n".join(t.render() for t in tables if t.lines or t.omitted or t.note)
+
+    text = join()
+    if budget:
+        trim(estimate_tokens(text))
+        text = join()
+        # Separators and "rows omitted" notes are not in the per-line estimate
+        while estimate_tokens(text) > budget and any(t.lines for t in tables):
+            trim(budget + 1)
+            text = join()
+    return text, {
+        "estimated_tokens": estimate_tokens(text),
+        "budget": budget,
+        "rows": sum(len(t.lines) for t in tables),
+        "rows_omitted": sum(len(t.omitted) for t in tables),
+    }
+
+
+# ── Stage encoders ────────────────────────────────────────────────────────────
+
+def _by_severity(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return sorted(rows, key=lambda r: SEVERITY_RANK.get(str(r.get("severity", "")).upper(), 9))
+
+
+def encode_signals(signals: dict[str, Any], budget: int | None = None) -> tuple[str, dict[str, Any]]:
+    """Monitor output → anomalous CloudWatch readings, cost anomalies and failed findings."""
+    tables = []
+    for key, value in signals.items():
+        if not isinstance(value, list) or not value or not all(isinstance(r, dict) for r in value):
+            continue
+        rows, note = value, ""
+        if key == "cloudwatch":
+            rows = [r for r in value if r.get("anomaly", True)]
+            healthy = len(value) - len(rows)
+            note = f"({healthy} healthy readings omitted)" if healthy else ""
+        elif key == "cost_anomalies":
+            rows = sorted(value, key=lambda r: -float(r.get("delta_pct") or 0))
+        elif key == "security_findings":
+            rows = _by_severity([r for r in value if r.get("compliance_status", "FAILED") != "PASSED"])
+        tables.append(Table(key, rows, note=note))
+    return render(tables, budget)
+
+
+def encode_incidents(
+    incidents: list[dict[str, Any]],
+    fields: list[str],
+    budget: int | None = None,
+) -> tuple[str, dict[str, Any], list[dict[str, Any]]]:
+    """
+    Incidents → one table with only the columns the stage needs.
+    Also returns the incidents trimmed by the budget, which the caller
+    must handle without the model.
+    """
+    table = Table("incidents", _by_severity(incidents), fields)
+    text, stats = render([table], budget)
+    return text, stats, table.omitted
+
+
+def prompt_report(system_prompt: str, prompt: str, stats: dict[str, Any]) -> dict[str, Any]:
+    """Per-stage token report: whole request estimate plus the encoded-data stats."""
+    return {
+        "estimated_tokens": estimate_tokens(system_prompt) + estimate_tokens(prompt),
+        "data_tokens": stats["estimated_tokens"],
+        "budget": stats["budget"],
+        "rows": stats["rows"],
+        "rows_omitted": stats["rows_omitted"],
+    }
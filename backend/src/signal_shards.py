@@ -0,0 +1,120 @@
+"""
+Signal sharding — partitions Monitor signals into independent correlation
+shards so the Reason stage can analyze them concurrently.
+
+Signals never cross an account boundary. Inside an account, signals are
+linked when they name the same resource (bare ids and ARNs are normalized,
+so `i-0abc` and `arn:…:instance/i-0abc` match) or when one signal's text
+mentions another's resource (a cost anomaly hinting at a bucket that a
+Security Hub finding flags). Small shards are then packed together, up to
+a signal count, to keep the number of model calls proportional to the
+work rather than to the number of resources.
+"""
+import re
+from typing import Any
+
+from src.config import REASON_SHARD_MAX_SIGNALS
+
+SIGNAL_KEYS = ("cloudwatch", "cost_anomalies", "security_findings")
+
+# Free-text fields that may mention a related resource
+_TEXT_FIELDS = ("root_cause_hint", "anomaly_reason", "title", "description")
+_ACCOUNT_RE = re.compile(r"arn:aws:[^:]*:[^:]*:(\d{12}):")
+_TOKEN_RE = re.compile(r"[A-Za-z0-9][\w.\-]{5,}")
+
+
+def resource_keys(resource: str) -> set[str]:
+    """The id plus its short form: bucket name from an S3 ARN, trailing id from other ARNs."""
+    keys = {resource}
+    if resource.startswith("arn:aws:s3:::"):
+        keys.add(resource.split(":::", 1)[1].split("/", 1)[0])
+    elif resource.startswith("arn:"):
+        keys.add(re.split(r"[:/]", resource)[-1])
+    return {k for k in keys if k}
+
+
+def _account(record: dict[str, Any]) -> str:
+    if record.get("account_id"):
+        return str(record["account_id"])
+    match = _ACCOUNT_RE.match(str(record.get("resource_id", "")))
+    return match.group(1) if match else ""
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+def shard_signals(signals: dict[str, Any], max_signals: int | None = None) -> list[dict[str, Any]]:
+    """
+    Split a signals dict into shard dicts of the same shape. Healthy
+    CloudWatch readings are left out — the prompt encoder drops them anyway.
+    """
+    max_signals = REASON_SHARD_MAX_SIGNALS if max_signals is None else max_signals
+    nodes: list[tuple[str, dict[str, Any]]] = []
+    for key in SIGNAL_KEYS:
+        for record in signals.get(key) or []:
+            if key == "cloudwatch" and not record.get("anomaly", True):
+                continue
+            nodes.append((key, record))
+
+    uf = _UnionFind(len(nodes))
+    accounts = [_account(record) for _, record in nodes]
+    # resource key → account → first signal seen for it ("" = account unknown)
+    first: dict[str, dict[str, int]] = {}
+
+    def link(i: int, key: str) -> None:
+        for account, j in first.get(key, {}).items():
+            if not account or not accounts[i] or account == accounts[i]:
+                uf.union(i, j)
+
+    keys_of: list[set[str]] = []
+    for i, (_, record) in enumerate(nodes):
+        keys = resource_keys(str(record["resource_id"])) if record.get("resource_id") else set()
+        keys_of.append(keys)
+        for k in keys:
+            link(i, k)
+            first.setdefault(k, {}).setdefault(accounts[i], i)
+
+    # Linked findings: text that names another signal's resource
+    for i, (_, record) in enumerate(nodes):
+        text = " ".join(str(record.get(f, "")) for f in _TEXT_FIELDS)
+        for token in set(_TOKEN_RE.findall(text)):
+            link(i, token)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(nodes)):
+        groups.setdefault(uf.find(i), []).append(i)
+
+    # Pack correlation groups into shards, never mixing accounts
+    shards: list[list[int]] = []
+    open_shard: dict[str, list[int]] = {}
+    for members in sorted(groups.values(), key=len, reverse=True):
+        account = next((accounts[i] for i in members if accounts[i]), "")
+        current = open_shard.get(account)
+        if current is None or (max_signals and len(current) + len(members) > max_signals):
+            current = []
+            shards.append(current)
+            open_shard[account] = current
+        current.extend(members)
+
+    result = []
+    for members in shards:
+        shard: dict[str, Any] = {key: [] for key in SIGNAL_KEYS}
+        for i in sorted(members):
+            key, record = nodes[i]
+            shard[key].append(record)
+        shard["resource_keys"] = sorted(set().union(*(keys_of[i] for i in members)))
+        result.append(shard)
+    return result
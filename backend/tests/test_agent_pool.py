@@ -0,0 +1,31 @@
+"""AgentPool: pooled models, fresh agents, quiet by default."""
+from strands.handlers.callback_handler import PrintingCallbackHandler
+
+from src.agent_pool import AgentPool
+
+MODEL = "amazon.nova-lite-v1:0"
+
+
+def test_agents_share_the_pooled_model_but_not_conversation():
+    pool = AgentPool()
+    first = pool.agent(MODEL, "us-east-1", 0.1, "sys")
+    second = pool.agent(MODEL, "us-east-1", 0.1, "sys")
+    assert first.model is second.model
+    assert first is not second
+    assert (pool.misses, pool.hits) == (1, 1)
+
+
+def test_agents_do_not_print_responses_by_default():
+    agent = AgentPool().agent(MODEL, "us-east-1", 0.1, "sys")
+    assert not isinstance(agent.callback_handler, PrintingCallbackHandler)
+
+
+def test_explicit_callback_handler_is_kept():
+    chunks = []
+
+    def on_chunk(**kwargs):
+        chunks.append(kwargs.get("data"))
+
+    agent = AgentPool().agent(MODEL, "us-east-1", 0.1, "sys", streaming=True, callback_handler=on_chunk)
+    agent.callback_handler(data="partial")
+    assert chunks == ["partial"]
@@ -0,0 +1,103 @@
+"""Analysis cache: fingerprint buckets, TTL, and versioning by prompt and answering model."""
+import asyncio
+import json
+
+from agents import cache as cache_module
+from agents.cache import AnalysisCache, fingerprint
+from agents.reason import BATCH_SYSTEM_PROMPT, MODEL_ID, PROMPT_VERSION, SYSTEM_PROMPT, ReasonAgent, prompt_version
+
+
+def _event(i: int, value: float = 94.7, severity: str = "low") -> dict:
+    return {
+        "id": f"evt-{i}",
+        "source": "cloudwatch",
+        "service": "EC2",
+        "region": "us-east-1",
+        "severity": severity,
+        "message": "CPU high",
+        "resource": f"i-{i:04d}",
+        "metric": "CPUUtilization",
+        "value": value,
+        "threshold": 80,
+        "timestamp": "2026-10-17T10:00:00Z",
+    }
+
+
+def _analysis(event_id: str | None = None) -> dict:
+    item = {
+        "root_cause": "load spike",
+        "confidence": 0.7,
+        "impact": "latency",
+        "reasoning_steps": ["cpu high"],
+        "recommended_action": "monitor",
+        "fix_description": "none",
+        "related_services": [],
+        "estimated_resolution_time": "5m",
+    }
+    if event_id is not None:
+        item["event_id"] = event_id
+    return item
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.calls = []
+
+    async def converse(self, modelId, system, messages, inferenceConfig):
+        self.calls.append((modelId, system[0]["text"] == BATCH_SYSTEM_PROMPT))
+        if system[0]["text"] == BATCH_SYSTEM_PROMPT:
+            text = json.dumps([_analysis(f"evt-{i}") for i in range(10)])
+        else:
+            text = json.dumps(_analysis())
+        return {"output": {"message": {"content": [{"text": text}]}}, "usage": {"inputTokens": 10, "outputTokens": 5}}, 1.0
+
+
+def test_version_covers_both_prompts_and_the_model():
+    assert PROMPT_VERSION == prompt_version(MODEL_ID, SYSTEM_PROMPT, BATCH_SYSTEM_PROMPT)
+    assert PROMPT_VERSION != prompt_version(MODEL_ID, SYSTEM_PROMPT, BATCH_SYSTEM_PROMPT + " ")
+    assert PROMPT_VERSION != prompt_version("amazon.nova-premier-v1:0", SYSTEM_PROMPT, BATCH_SYSTEM_PROMPT)
+
+
+def test_batched_answers_are_served_from_cache():
+    cache = AnalysisCache(ttl_seconds=60)
+    executor = FakeExecutor()
+    agent = ReasonAgent(use_mock=False, executor=executor, cache=cache, batch_size=4, batch_token_budget=100_000)
+
+    asyncio.run(agent.analyze_many([_event(0), _event(1)]))
+    again = asyncio.run(agent.analyze(_event(1, value=95.1)))
+
+    assert executor.calls == [(MODEL_ID, True)]
+    assert again["cache"]["hit"] is True
+    assert again["event_id"] == "evt-1"
+
+
+def test_cascade_settings_and_triage_model_get_their_own_entries():
+    cache = AnalysisCache(ttl_seconds=60)
+    plain = ReasonAgent(use_mock=False, executor=FakeExecutor(), cache=cache)
+    lite = ReasonAgent(use_mock=False, executor=FakeExecutor(), cache=cache, cascade=True, triage_model_id="lite-a")
+    other = ReasonAgent(use_mock=False, executor=FakeExecutor(), cache=cache, cascade=True, triage_model_id="lite-b")
+
+    assert len({plain.prompt_version, lite.prompt_version, other.prompt_version}) == 3
+    asyncio.run(plain.analyze(_event(0)))
+    assert asyncio.run(lite.analyze(_event(0))).get("cache") is None
+    assert asyncio.run(other.analyze(_event(0))).get("cache") is None
+    assert asyncio.run(plain.analyze(_event(0)))["cache"]["hit"] is True
+
+
+def test_fingerprint_buckets_nearby_values_only():
+    assert fingerprint(_event(0, 94.7), "v") == fingerprint(_event(0, 95.1), "v")
+    assert fingerprint(_event(0, 94.7), "v") != fingerprint(_event(0, 60.0), "v")
+    assert fingerprint(_event(0), "v") != fingerprint(_event(0, severity="critical"), "v")
+    assert fingerprint(_event(0), "v") != fingerprint(_event(0), "w")
+
+
+def test_entries_expire(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = AnalysisCache(ttl_seconds=10)
+    cache.set("k", _analysis())
+    now[0] += 9
+    assert cache.get("k") is not None
+    now[0] += 2
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
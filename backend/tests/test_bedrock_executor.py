@@ -0,0 +1,102 @@
+"""Bedrock executor: one shared client, slots held until pool calls really finish."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents import bedrock
+from agents.bedrock import BedrockExecutor
+from agents.ratelimit import RateController, RateLimitExceeded
+
+MODEL = "amazon.nova-pro-v1:0"
+
+
+class BlockingClient:
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def converse(self, modelId, **request):
+        self.started.set()
+        self.release.wait(5)
+        return {"output": {"message": {"content": [{"text": "{}"}]}}}
+
+
+def _executor(concurrency: int = 1) -> BedrockExecutor:
+    rate = RateController(
+        default_concurrency=concurrency,
+        model_concurrency={},
+        default_rpm=0,
+        model_rpm={},
+        deadline_seconds=5,
+        base_delay=0.001,
+    )
+    return BedrockExecutor(max_workers=4, rate=rate)
+
+
+def test_client_is_created_once_across_threads(monkeypatch):
+    created = []
+
+    def slow_client(*args, **kwargs):
+        time.sleep(0.01)
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.setattr(bedrock.boto3, "client", slow_client)
+    executor = _executor()
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(executor._get_client())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(created) == 1
+    assert all(c is created[0] for c in clients)
+    executor.shutdown()
+
+
+def test_timed_out_call_keeps_its_slot_until_the_thread_returns():
+    executor = _executor(concurrency=1)
+    client = executor._client = BlockingClient()
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(executor.converse(MODEL, messages=[]), timeout=0.05)
+        assert client.started.is_set()
+        # The abandoned Converse call is still running on the pool
+        assert executor.rate.stats()["models"][MODEL]["in_flight"] == 1
+        with pytest.raises(RateLimitExceeded):
+            await executor.rate.acall(MODEL, lambda: asyncio.sleep(0), deadline_seconds=0.05)
+
+        client.release.set()
+        for _ in range(100):
+            if executor.rate.stats()["models"][MODEL]["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        response, latency_ms = await executor.converse(MODEL, messages=[])
+        return response, latency_ms
+
+    response, latency_ms = asyncio.run(run())
+
+    assert response["output"]["message"]["content"][0]["text"] == "{}"
+    assert latency_ms >= 0
+    stats = executor.stats()["models"][MODEL]
+    assert stats["calls"] == 2
+    assert stats["in_flight"] == 0
+    executor.shutdown()
+
+
+def test_cancelled_coroutine_releases_its_slot_at_once():
+    rate = RateController(default_concurrency=1, model_concurrency={}, default_rpm=0, model_rpm={}, deadline_seconds=1)
+
+    async def run():
+        task = asyncio.create_task(rate.acall(MODEL, lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return rate.stats()["models"][MODEL]["in_flight"]
+
+    assert asyncio.run(run()) == 0
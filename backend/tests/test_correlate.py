@@ -0,0 +1,93 @@
+"""Correlator: union-find clustering by shared resource and dependency chain."""
+from agents.correlate import Correlator
+
+
+def _event(eid: str, service: str, resource: str, ts: str | None = "2026-10-17T12:00:00Z", **extra) -> dict:
+    event = {
+        "id": eid,
+        "source": "cloudwatch",
+        "region": "us-east-1",
+        "service": service,
+        "resource": resource,
+        "severity": "medium",
+        **extra,
+    }
+    if ts is not None:
+        event["timestamp"] = ts
+    return event
+
+
+def _groups(clusters: list[dict]) -> set[frozenset[str]]:
+    return {frozenset(c["event_ids"]) for c in clusters}
+
+
+def test_shared_resource_links_events():
+    clusters = Correlator().correlate([
+        _event("cpu", "EC2", "i-0aaa"),
+        _event("status", "EC2", "i-0aaa", severity="critical"),
+        _event("disk", "EBS", "vol-0bbb", source="cost_explorer"),
+    ])
+    assert _groups(clusters) == {frozenset({"cpu", "status"}), frozenset({"disk"})}
+    [pair] = [c for c in clusters if len(c["event_ids"]) == 2]
+    assert pair["primary_event_id"] == "status"
+    assert pair["reasons"] == ["shared resource i-0aaa"]
+
+
+def test_unrelated_events_on_one_service_stay_apart():
+    clusters = Correlator().correlate([
+        _event("a", "EC2", "i-0aaa"),
+        _event("b", "EC2", "i-0bbb"),
+    ])
+    assert _groups(clusters) == {frozenset({"a"}), frozenset({"b"})}
+
+
+def test_dependency_chain_joins_transitively():
+    clusters = Correlator().correlate([
+        _event("api", "ApiGateway", "orders-api", ts="2026-10-17T12:02:00Z"),
+        _event("fn", "Lambda", "orders-fn", ts="2026-10-17T12:01:00Z"),
+        _event("table", "DynamoDB", "orders-table", ts="2026-10-17T12:00:00Z"),
+    ])
+    assert _groups(clusters) == {frozenset({"api", "fn", "table"})}
+    assert clusters[0]["reasons"] == [
+        "ApiGateway depends on Lambda in us-east-1",
+        "Lambda depends on DynamoDB in us-east-1",
+    ]
+
+
+def test_dependency_links_respect_window_region_and_source():
+    correlator = Correlator(window_seconds=300)
+    events = [
+        _event("fn", "Lambda", "orders-fn", ts="2026-10-17T12:00:00Z"),
+        _event("late", "DynamoDB", "t1", ts="2026-10-17T12:30:00Z"),
+        _event("elsewhere", "DynamoDB", "t2", region="eu-west-1"),
+        _event("cost", "DynamoDB", "t3", source="cost_explorer"),
+    ]
+    assert len(correlator.correlate(events)) == 4
+
+
+def test_upstream_named_in_message_links_events():
+    clusters = Correlator(dependencies={}).correlate([
+        _event("fn", "Lambda", "orders-fn", message="Throttled by DynamoDB"),
+        _event("table", "DynamoDB", "orders-table"),
+    ])
+    assert _groups(clusters) == {frozenset({"fn", "table"})}
+
+
+def test_untimed_events_link_without_a_window():
+    clusters = Correlator().correlate([
+        _event("fn", "Lambda", "orders-fn", ts=None),
+        _event("table", "DynamoDB", "orders-table"),
+    ])
+    assert _groups(clusters) == {frozenset({"fn", "table"})}
+
+
+def test_cluster_ids_are_stable_and_cluster_event_carries_members():
+    events = [_event("cpu", "EC2", "i-0aaa"), _event("status", "EC2", "i-0aaa", severity="high")]
+    [first] = Correlator().correlate(events)
+    [again] = Correlator().correlate(list(reversed(events)))
+    assert first["cluster_id"] == again["cluster_id"]
+
+    merged = Correlator.cluster_event(first, {e["id"]: e for e in events})
+    assert merged["id"] == first["cluster_id"]
+    assert merged["primary_event_id"] == "status"
+    assert [e["id"] for e in merged["correlated_events"]] == ["cpu"]
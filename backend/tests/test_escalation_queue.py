@@ -0,0 +1,137 @@
+"""Escalation queue: heap ordering, lazy deletion, filters, archive bound."""
+import pytest
+
+from agents.escalate import EscalateAgent
+
+
+def _escalate(agent: EscalateAgent, event_id: str, severity: str, confidence: float, service: str = "EC2") -> dict:
+    event = {"id": event_id, "severity": severity, "service": service}
+    return agent.escalate(event, {"confidence": confidence, "recommended_action": "escalate"})
+
+
+def _ids(records: list[dict]) -> list[str]:
+    return [r["event_id"] for r in records]
+
+
+def test_queue_orders_by_severity_then_confidence_then_age():
+    agent = EscalateAgent()
+    _escalate(agent, "low-1", "low", 0.1)
+    _escalate(agent, "crit-sure", "critical", 0.9)
+    _escalate(agent, "high-1", "high", 0.5)
+    _escalate(agent, "crit-unsure", "critical", 0.2)
+    _escalate(agent, "crit-unsure-later", "critical", 0.2)
+
+    assert _ids(agent.get_queue()) == ["crit-unsure", "crit-unsure-later", "crit-sure", "high-1", "low-1"]
+    assert _ids(agent.get_queue(limit=2, offset=1)) == ["crit-unsure-later", "crit-sure"]
+    assert _ids(agent.get_queue(severity="critical", limit=1)) == ["crit-unsure"]
+
+
+def test_resolved_entries_are_skipped_lazily():
+    agent = EscalateAgent()
+    for i in range(5):
+        _escalate(agent, f"e{i}", "high", i / 10)
+    agent.resolve("esc-e0", "approved")
+    agent.resolve("esc-e3", "rejected")
+
+    # Stale heap entries stay until a rebuild, but are never returned
+    assert agent.stats()["heap_entries"] == 5
+    assert _ids(agent.get_queue()) == ["e1", "e2", "e4"]
+    assert agent.pending_count() == 3
+    assert agent.pending_count(severity="high") == 3
+    assert agent.get("esc-e0")["resolution"] == "approved"
+
+
+def test_re_escalation_replaces_previous_entry():
+    agent = EscalateAgent()
+    _escalate(agent, "a", "high", 0.9)
+    _escalate(agent, "b", "high", 0.5)
+    _escalate(agent, "a", "high", 0.1)  # refreshed analysis, now least certain
+
+    assert _ids(agent.get_queue()) == ["a", "b"]
+    assert agent.get_queue()[0]["analysis"]["confidence"] == 0.1
+    assert agent.pending_count() == 2
+
+    # A re-escalated, previously resolved event is pending again
+    agent.resolve("esc-b", "deferred")
+    _escalate(agent, "b", "high", 0.3)
+    assert _ids(agent.get_queue()) == ["a", "b"]
+    assert agent.get("esc-b")["status"] == "pending"
+
+
+def test_heap_is_rebuilt_once_mostly_stale():
+    agent = EscalateAgent()
+    for i in range(100):
+        _escalate(agent, f"e{i}", "medium", 0.5)
+    for i in range(80):
+        agent.resolve(f"esc-e{i}", "approved")
+
+    assert agent.stats()["heap_entries"] < 100
+    assert _ids(agent.get_queue()) == [f"e{i}" for i in range(80, 100)]
+
+
+def test_service_filter_and_counts():
+    agent = EscalateAgent()
+    _escalate(agent, "l1", "high", 0.4, service="Lambda")
+    _escalate(agent, "e1", "high", 0.3, service="EC2")
+    _escalate(agent, "l2", "low", 0.1, service="Lambda")
+
+    assert _ids(agent.get_queue(service="Lambda")) == ["l1", "l2"]
+    assert agent.pending_count(service="Lambda") == 2
+    assert agent.pending_count(severity="high", service="Lambda") == 1
+    agent.resolve("esc-l1", "approved")
+    assert agent.pending_count(service="Lambda") == 1
+
+
+def test_unfiltered_queue_merges_services_within_a_severity():
+    agent = EscalateAgent()
+    _escalate(agent, "ec2-a", "high", 0.6, service="EC2")
+    _escalate(agent, "rds-a", "high", 0.2, service="RDS")
+    _escalate(agent, "ec2-b", "high", 0.4, service="EC2")
+    _escalate(agent, "rds-crit", "critical", 0.9, service="RDS")
+
+    assert _ids(agent.get_queue()) == ["rds-crit", "rds-a", "ec2-b", "ec2-a"]
+    assert _ids(agent.get_queue(service="RDS")) == ["rds-crit", "rds-a"]
+    assert _ids(agent.get_queue(severity="high", service="EC2")) == ["ec2-b", "ec2-a"]
+
+
+def test_service_filter_walks_only_that_services_entries():
+    class CountingDict(dict):
+        lookups = 0
+
+        def get(self, key, default=None):
+            CountingDict.lookups += 1
+            return super().get(key, default)
+
+    agent = EscalateAgent()
+    agent._pending = CountingDict()
+    for i in range(500):
+        _escalate(agent, f"ec2-{i}", "high", 0.1, service="EC2")
+    _escalate(agent, "lambda-1", "high", 0.5, service="Lambda")
+    CountingDict.lookups = 0
+
+    assert _ids(agent.get_queue(service="Lambda", limit=10)) == ["lambda-1"]
+    assert CountingDict.lookups == 1
+
+
+def test_archive_drops_oldest_resolved():
+    agent = EscalateAgent(archive_size=2)
+    for i in range(3):
+        _escalate(agent, f"e{i}", "low", 0.5)
+        agent.resolve(f"esc-e{i}", "approved")
+
+    assert agent.get("esc-e0") is None
+    assert [r["event_id"] for r in agent.get_all()] == ["e1", "e2"]
+    assert agent.stats()["archive_evicted"] == 1
+    with pytest.raises(KeyError):
+        agent.resolve("esc-e0", "approved")
+
+
+def test_changes_are_pushed_to_on_change():
+    changes = []
+    agent = EscalateAgent(on_change=lambda kind, diff: changes.append((kind, diff)))
+    _escalate(agent, "a", "critical", 0.2)
+    agent.resolve("esc-a", "rejected", resolved_by="alice")
+
+    assert [kind for kind, _ in changes] == ["escalation.created", "escalation.resolved"]
+    assert changes[0][1]["pending"] == 1
+    assert changes[1][1] == {**changes[1][1], "resolution": "rejected", "resolved_by": "alice", "pending": 0}
@@ -0,0 +1,84 @@
+"""Streaming incident parser: incidents complete across arbitrary chunk boundaries."""
+import json
+
+from src.agents.reason_agent import _IncidentEmitter
+from src.incident_stream import IncidentStreamParser
+
+INCIDENTS = [
+    {
+        "incident_id": "INC-001",
+        "title": "EC2 CPU {saturation} on \"web\" tier",
+        "affected_resources": ["i-0a1b2c3d"],
+        "reasoning_chain": ["CPU > 90% [5m]", "path C:\\logs\\cpu"],
+        "confidence_score": 0.92,
+    },
+    {
+        "incident_id": "INC-002",
+        "title": "S3 bucket public",
+        "affected_resources": ["arn:aws:s3:::logs"],
+        "nested": {"incidents": [{"not": "top-level"}]},
+        "confidence_score": 0.88,
+    },
+]
+RESPONSE = (
+    "Here is the analysis:\n```json\n"
+    + json.dumps({"summary": {"incidents": 2}, "incidents": INCIDENTS, "notes": [{"x": 1}]}, indent=2)
+    + "\n```"
+)
+
+
+def _feed_all(chunks: list[str]) -> tuple[IncidentStreamParser, list[dict]]:
+    parser = IncidentStreamParser()
+    emitted = []
+    for chunk in chunks:
+        emitted += parser.feed(chunk)
+    return parser, emitted
+
+
+def test_whole_response_in_one_chunk():
+    parser, emitted = _feed_all([RESPONSE])
+    assert parser.found_array
+    assert emitted == INCIDENTS
+    assert parser.incidents == INCIDENTS
+
+
+def test_every_two_chunk_split():
+    for cut in range(len(RESPONSE) + 1):
+        _, emitted = _feed_all([RESPONSE[:cut], RESPONSE[cut:]])
+        assert emitted == INCIDENTS, f"split at {cut}: {RESPONSE[max(cut - 10, 0):cut + 10]!r}"
+
+
+def test_one_character_at_a_time_emits_each_incident_on_its_closing_brace():
+    parser = IncidentStreamParser()
+    emitted_at = []
+    for pos, ch in enumerate(RESPONSE):
+        for incident in parser.feed(ch):
+            emitted_at.append((pos, incident["incident_id"]))
+    first_close = RESPONSE.index("}", RESPONSE.index('"confidence_score": 0.92'))
+    assert emitted_at[0] == (first_close, "INC-001")
+    assert [i for _, i in emitted_at] == ["INC-001", "INC-002"]
+
+
+def test_malformed_incident_is_skipped():
+    text = '{"incidents": [{"incident_id": "A"}, {"incident_id": "B", "x": tru}, {"incident_id": "C"}]}'
+    _, emitted = _feed_all([text[:20], text[20:45], text[45:]])
+    assert [i["incident_id"] for i in emitted] == ["A", "C"]
+
+
+def test_response_without_incidents_array():
+    parser, emitted = _feed_all(['{"error": "no signals", "incidents_found": [{"a": 1}]}'])
+    assert not parser.found_array
+    assert emitted == []
+
+
+def test_emitter_keeps_first_duplicate_and_renumbers_colliding_ids():
+    seen = []
+    emitter = _IncidentEmitter(seen.append)
+    emitter({"incident_id": "INC-1", "title": "CPU high", "affected_resources": ["i-1"], "confidence_score": 0.5}, shard=0)
+    emitter({"incident_id": "INC-9", "title": " cpu HIGH ", "affected_resources": ["i-1"], "confidence_score": 0.9}, shard=1)
+    emitter({"incident_id": "INC-1", "title": "Disk full", "affected_resources": ["i-2"]}, shard=1)
+
+    assert [i["incident_id"] for i in seen] == ["INC-1", "INC-1-s1"]
+    assert seen[0]["confidence_score"] == 0.5
+    assert emitter.stats()["incidents"] == 2
+    assert emitter.first_incident_ms is not None
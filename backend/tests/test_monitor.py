@@ -0,0 +1,53 @@
+"""MonitorAgent live collection: per-source timeouts and stuck collectors."""
+import threading
+
+import boto3
+
+from agents.monitor import MonitorAgent
+
+
+def test_stuck_collector_is_not_resubmitted():
+    agent = MonitorAgent(use_mock=False, sources=("cloudwatch",), source_timeouts={"cloudwatch": 0.05})
+    release = threading.Event()
+    calls = []
+
+    def stuck(region):
+        calls.append(region)
+        release.wait(5)
+        return [{"id": "alarm-1", "severity": "high"}]
+
+    agent._jobs = lambda: [("cloudwatch", "us-east-1", stuck)]
+    try:
+        assert agent.collect() == []
+        assert agent.last_collection["collectors"]["cloudwatch:us-east-1"] == {"status": "timeout", "events": 0}
+
+        assert agent.collect() == []
+        assert agent.last_collection["collectors"]["cloudwatch:us-east-1"]["carried_over"] is True
+        assert calls == ["us-east-1"]
+
+        release.set()
+        agent._inflight[("cloudwatch", "us-east-1")].result(timeout=1)
+        # The finished job was the last one; the next pass starts a fresh one
+        assert [e["id"] for e in agent.collect()] == ["alarm-1"]
+        assert calls == ["us-east-1", "us-east-1"]
+    finally:
+        release.set()
+        agent._pool.shutdown(wait=True)
+
+
+def test_clients_time_out_with_their_source(monkeypatch):
+    configs = {}
+
+    def fake_client(service, region_name, config):
+        configs[service] = config
+        return object()
+
+    monkeypatch.setattr(boto3, "client", fake_client)
+    agent = MonitorAgent(use_mock=False, source_timeouts={"cloudwatch": 3.0, "cost_explorer": 20.0, "security_hub": 8.0})
+    for service in ("cloudwatch", "ce", "securityhub"):
+        agent._client(service, "us-east-1")
+
+    assert configs["cloudwatch"].read_timeout == 3.0
+    assert configs["cloudwatch"].connect_timeout == 3.0
+    assert configs["ce"].read_timeout == 20.0
+    assert configs["securityhub"].read_timeout == 8.0
@@ -0,0 +1,163 @@
+"""Pipeline deadline: provisional fallbacks on time, real analyses attached later."""
+import asyncio
+import json
+import time
+
+import pytest
+
+from agents import EscalateAgent, ReasonAgent
+from agents.reason import MODEL_ID
+from runtime import EventSnapshot, MemoryRunStore, RunFeed
+
+
+def _event(eid: str, resource: str) -> dict:
+    return {
+        "id": eid,
+        "source": "cloudwatch",
+        "service": "EC2",
+        "region": "us-east-1",
+        "severity": "high",
+        "message": "CPU above threshold",
+        "resource": resource,
+        "metric": "CPUUtilization",
+        "value": 91.0,
+        "threshold": 80,
+        "timestamp": "2026-10-17T10:00:00Z",
+    }
+
+
+def _analysis(action: str) -> dict:
+    return {
+        "root_cause": "load spike",
+        "confidence": 0.9,
+        "impact": "latency",
+        "reasoning_steps": ["cpu high"],
+        "recommended_action": action,
+        "fix_description": "scale out",
+        "related_services": [],
+        "estimated_resolution_time": "5m",
+    }
+
+
+class DelayedExecutor:
+    """Answers each resource's analysis after its own delay."""
+
+    def __init__(self, plan: dict[str, tuple[float, str]]):
+        self.plan = plan
+
+    async def converse(self, modelId, system, messages, inferenceConfig):
+        text = messages[0]["content"][0]["text"]
+        resource = next(r for r in self.plan if f"Resource: {r}\n" in text)
+        delay, action = self.plan[resource]
+        await asyncio.sleep(delay)
+        response = {
+            "output": {"message": {"content": [{"text": json.dumps(_analysis(action))}]}},
+            "usage": {"inputTokens": 100, "outputTokens": 50},
+        }
+        return response, delay * 1000
+
+
+@pytest.fixture
+def updates() -> list:
+    return []
+
+
+@pytest.fixture
+def fixes() -> list:
+    return []
+
+
+@pytest.fixture
+def main(monkeypatch, updates, fixes):
+    monkeypatch.setenv("USE_MOCK", "true")
+    monkeypatch.setenv("RUN_STORE", "memory")
+    import main
+
+    async def execute(event, analysis):
+        fixes.append(event["id"])
+        return {"executed": True, "status": "SUCCESS"}
+
+    monkeypatch.setattr(main, "reason_agent", main.reason_agent)
+    monkeypatch.setattr(main, "escalate_agent", EscalateAgent())
+    monkeypatch.setattr(main, "run_store", MemoryRunStore())
+    monkeypatch.setattr(main, "PIPELINE_CORRELATE", False)
+    monkeypatch.setattr(main, "deadline_stats", dict.fromkeys(main.deadline_stats, 0))
+    monkeypatch.setattr(main.act_agent, "execute", execute)
+    monkeypatch.setattr(main.update_hub, "publish", lambda kind, data: updates.append((kind, data)))
+    return main
+
+
+def _run(main, plan: dict[str, tuple[float, str]], deadline_seconds: float | None):
+    """
+    Run the pipeline over one event per resource, each answered after its
+    planned delay; returns the record as saved on time and once background
+    work has finished.
+    """
+    main.reason_agent = ReasonAgent(use_mock=False, executor=DelayedExecutor(plan))
+    events = [_event(f"evt-{i}", resource) for i, resource in enumerate(plan)]
+
+    async def scenario():
+        deadline = None if deadline_seconds is None else time.perf_counter() + deadline_seconds
+        record = await main._execute_pipeline(EventSnapshot(events, 1, "d"), RunFeed(), False, deadline)
+        on_time = json.loads(json.dumps(record))
+        await asyncio.gather(*main.background_tasks)
+        return on_time, record
+
+    return asyncio.run(scenario())
+
+
+def _entry(record: dict, eid: str) -> dict:
+    return next(r for r in record["results"] if r["event"]["id"] == eid)
+
+
+def test_run_without_deadline_waits_for_every_analysis(main, fixes):
+    on_time, _ = _run(main, {"i-fast": (0.0, "escalate"), "i-slow": (0.05, "auto_fix")}, None)
+    assert on_time["finalized"] is True
+    assert on_time["provisional_events"] == []
+    assert _entry(on_time, "evt-1")["analysis"]["model"] == MODEL_ID
+    assert fixes == ["evt-1"]
+
+
+def test_late_unit_gets_a_provisional_escalation(main):
+    on_time, _ = _run(main, {"i-fast": (0.0, "escalate"), "i-slow": (0.5, "auto_fix")}, 0.1)
+
+    assert on_time["finalized"] is False
+    assert on_time["provisional_events"] == ["evt-1"]
+    assert _entry(on_time, "evt-0")["analysis"]["model"] == MODEL_ID
+    late = _entry(on_time, "evt-1")
+    assert late["provisional"] is True
+    assert (late["analysis"]["tier"], late["action_taken"]) == ("provisional", "escalate")
+    assert late["escalation"]["status"] == "pending"
+    assert main.deadline_stats["runs_degraded"] == 1
+    assert main.deadline_stats["provisional_results"] == 1
+
+
+def test_late_auto_fix_is_attached_but_held_for_approval(main, fixes, updates):
+    _, final = _run(main, {"i-fast": (0.0, "escalate"), "i-slow": (0.3, "auto_fix")}, 0.05)
+
+    assert fixes == []
+    assert final["finalized"] is True
+    late = _entry(final, "evt-1")
+    assert late["final_analysis"]["recommended_action"] == "auto_fix"
+    assert late["final_analysis"]["model"] == MODEL_ID
+    held = main.escalate_agent.get("esc-evt-1")
+    assert held is late["escalation"] and held["status"] == "pending"
+    assert held["analysis"]["recommended_action"] == "escalate"
+    assert held["analysis"]["source_recommended_action"] == "auto_fix"
+    assert main.deadline_stats["late_analyses_attached"] == 1
+    assert asyncio.run(main.run_store.get(final["run_id"]))["finalized"] is True
+    kinds = [kind for kind, _ in updates]
+    assert kinds.index("run.completed") < kinds.index("run.analysis_finalized") < kinds.index("run.finalized")
+
+
+def test_late_analysis_leaves_a_resolved_escalation_alone(main):
+    event = _event("evt-9", "i-0009")
+    escalation = main.escalate_agent.escalate(event, {**_analysis("escalate"), "provisional": True})
+    main.escalate_agent.resolve(escalation["escalation_id"], "rejected", "operator")
+    entries = [{"event": event, "analysis": {"recommended_action": "escalate"}, "escalation": escalation}]
+
+    main._attach_final("run-1", entries, {**_analysis("auto_fix"), "event_id": "evt-9"})
+
+    assert entries[0]["escalation"] is escalation
+    assert entries[0]["final_analysis"]["recommended_action"] == "auto_fix"
+    assert main.escalate_agent.pending_count() == 0
@@ -0,0 +1,132 @@
+"""Act playbook registry: resource resolution and direct dispatch."""
+import json
+
+import pytest
+
+from src.agents import act_agent
+from src.agents.act_agent import dispatch_playbooks, resolve_playbook, run_act_agent
+
+
+def _incident(action: str, *resources: str, incident_id: str = "inc-1", **extra) -> dict:
+    return {
+        "incident_id": incident_id,
+        "recommended_action": action,
+        "affected_resources": list(resources),
+        "auto_remediable": True,
+        **extra,
+    }
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Replace every playbook with a recorder; failing resources are listed in calls['fail']."""
+    recorded = {"runs": [], "fail": set()}
+
+    def fake(action):
+        def playbook(**kwargs):
+            recorded["runs"].append((action, kwargs))
+            failed = set(kwargs.values()) & recorded["fail"]
+            return json.dumps({"status": "FAILED" if failed else "SUCCESS", **kwargs})
+        return playbook
+
+    for action, (_, extract) in list(act_agent.PLAYBOOKS.items()):
+        monkeypatch.setitem(act_agent.PLAYBOOKS, action, (fake(action), extract))
+    return recorded
+
+
+@pytest.mark.parametrize("resource, bucket", [
+    ("arn:aws:s3:::prod-assets", "prod-assets"),
+    ("arn:aws:s3:::prod-assets/exports/2026", "prod-assets"),
+    ("s3://prod-data-lake-exports", "prod-data-lake-exports"),
+])
+def test_s3_resources_resolve_to_their_bucket(resource, bucket):
+    [(_, kwargs)] = resolve_playbook(_incident("S3_REVOKE_PUBLIC", resource))
+    assert kwargs == {"bucket_name": bucket}
+
+
+@pytest.mark.parametrize("resource", [
+    "sg-0ff1ce",
+    "checkout-service",
+    "i-0deadbeef999",
+    "arn:aws:ec2:us-east-1:123456789012:security-group/sg-0ff1ce",
+    "arn:aws:s3:::",
+])
+def test_non_bucket_resources_are_left_to_the_llm(resource):
+    assert resolve_playbook(_incident("S3_REVOKE_PUBLIC", resource)) is None
+
+
+def test_rightsize_accepts_instance_ids_and_arns():
+    calls = resolve_playbook(_incident(
+        "EC2_RIGHTSIZE",
+        "i-0aaa",
+        "arn:aws:ec2:us-east-1:123456789012:instance/i-0bbb",
+        "i-0aaa",  # duplicates are acted on once
+        target_instance_type="t3.medium",
+    ))
+    assert [kwargs for _, kwargs in calls] == [
+        {"instance_id": "i-0aaa", "target_instance_type": "t3.medium"},
+        {"instance_id": "i-0bbb", "target_instance_type": "t3.medium"},
+    ]
+
+
+def test_partially_resolvable_incident_is_not_dispatched():
+    assert resolve_playbook(_incident("EC2_RIGHTSIZE", "i-0aaa", "db-prod-postgres")) is None
+    assert resolve_playbook(_incident("TAG_RESOURCES", "i-0aaa", "some-name")) is None
+    assert resolve_playbook(_incident("MANUAL_REVIEW", "i-0aaa")) is None
+    assert resolve_playbook(_incident("TAG_RESOURCES")) is None
+
+
+def test_dispatch_runs_every_resource_and_reports_failures(calls):
+    calls["fail"].add("i-0bbb")
+    incidents = [
+        _incident("EC2_RIGHTSIZE", "i-0aaa", "i-0bbb", incident_id="inc-1"),
+        _incident("S3_REVOKE_PUBLIC", "arn:aws:s3:::prod-assets", incident_id="inc-2"),
+        _incident("S3_REVOKE_PUBLIC", "sg-0ff1ce", incident_id="inc-3"),
+    ]
+
+    remediations, unresolved = dispatch_playbooks(incidents)
+
+    assert [i["incident_id"] for i in unresolved] == ["inc-3"]
+    by_id = {r["incident_id"]: r for r in remediations}
+    assert by_id["inc-1"]["result"]["status"] == "FAILED"
+    assert by_id["inc-1"]["result"]["failed_resources"] == ["i-0bbb"]
+    assert [s["resource"] for s in by_id["inc-1"]["result"]["resources"]] == ["i-0aaa", "i-0bbb"]
+    assert by_id["inc-2"]["result"] == {"status": "SUCCESS", "bucket_name": "prod-assets"}
+    assert all(r["dispatch"] == "direct" for r in remediations)
+    assert sorted(action for action, _ in calls["runs"]) == ["EC2_RIGHTSIZE", "EC2_RIGHTSIZE", "S3_REVOKE_PUBLIC"]
+
+
+def test_playbooks_on_the_same_resource_run_in_order(calls):
+    incidents = [
+        _incident("TAG_RESOURCES", "i-0aaa", incident_id="inc-1"),
+        _incident("EC2_RIGHTSIZE", "i-0aaa", incident_id="inc-2"),
+    ]
+    remediations, _ = dispatch_playbooks(incidents)
+    assert [action for action, _ in calls["runs"]] == ["TAG_RESOURCES", "EC2_RIGHTSIZE"]
+    assert [r["incident_id"] for r in remediations] == ["inc-1", "inc-2"]
+
+
+def test_only_unresolved_incidents_reach_the_llm(calls, monkeypatch):
+    prompts = []
+
+    def fake_agent(prompt):
+        prompts.append(prompt)
+        return json.dumps({"remediations": [{"incident_id": "inc-2", "result": {"status": "SUCCESS"}}]})
+
+    monkeypatch.setattr(act_agent, "build_act_agent", lambda: fake_agent)
+    result = run_act_agent([
+        _incident("S3_REVOKE_PUBLIC", "arn:aws:s3:::prod-assets", incident_id="inc-1"),
+        _incident("S3_REVOKE_PUBLIC", "sg-0ff1ce", incident_id="inc-2"),
+        _incident("TAG_RESOURCES", "i-0ccc", incident_id="inc-3", auto_remediable=False),
+    ])
+
+    assert len(prompts) == 1
+    assert "inc-2" in prompts[0] and "inc-1" not in prompts[0] and "inc-3" not in prompts[0]
+    assert [(r["incident_id"], r["dispatch"]) for r in result["remediations"]] == [("inc-1", "direct"), ("inc-2", "llm")]
+
+
+def test_no_llm_call_when_everything_resolves(calls, monkeypatch):
+    monkeypatch.setattr(act_agent, "build_act_agent", lambda: pytest.fail("LLM consulted"))
+    result = run_act_agent([_incident("TAG_RESOURCES", "i-0aaa")])
+    assert [r["dispatch"] for r in result["remediations"]] == ["direct"]
+    assert "prompt_tokens" not in result
@@ -0,0 +1,196 @@
+"""Rate controller: AIMD back-off and recovery, admission, deadlines."""
+import asyncio
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+
+from agents.ratelimit import RateController, RateLimitExceeded
+
+MODEL = "amazon.nova-pro-v1:0"
+
+
+def _error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "Converse")
+
+
+def _controller(concurrency: int = 8, deadline: float = 5.0) -> RateController:
+    return RateController(
+        default_concurrency=concurrency,
+        model_concurrency={},
+        default_rpm=0,
+        model_rpm={},
+        deadline_seconds=deadline,
+        base_delay=0.001,
+        max_delay=0.01,
+    )
+
+
+def _model_stats(controller: RateController) -> dict:
+    return controller.stats()["models"][MODEL]
+
+
+def _throttle_then(result, throttles: int = 1):
+    calls = {"n": 0}
+
+    def fn():
+        calls["n"] += 1
+        if calls["n"] <= throttles:
+            raise _error("ThrottlingException")
+        return result
+
+    return fn, calls
+
+
+def test_throttle_halves_limit_and_retries():
+    controller = _controller(concurrency=8)
+    fn, calls = _throttle_then("ok")
+
+    assert controller.call(MODEL, fn) == "ok"
+
+    stats = _model_stats(controller)
+    assert calls["n"] == 2
+    assert stats["throttled"] == 1
+    assert stats["retries"] == 1
+    assert stats["limit_decreases"] == 1
+    assert stats["concurrency_limit"] == pytest.approx(4 + 1 / 4, abs=0.01)
+    assert stats["in_flight"] == 0
+
+
+def test_successes_recover_additively_up_to_the_ceiling():
+    controller = _controller(concurrency=8)
+    for _ in range(3):
+        controller.call(MODEL, _throttle_then("ok")[0])
+    low = _model_stats(controller)["concurrency_limit"]
+    assert low < 3
+
+    previous = low
+    for _ in range(5):
+        controller.call(MODEL, lambda: "ok")
+        current = _model_stats(controller)["concurrency_limit"]
+        assert current > previous
+        # +1/limit per success: about +1 per limit's worth of calls
+        assert current - previous <= 1 / previous + 0.01
+        previous = current
+
+    for _ in range(200):
+        controller.call(MODEL, lambda: "ok")
+    assert _model_stats(controller)["concurrency_limit"] == 8
+
+
+def test_limit_never_drops_below_one():
+    controller = _controller(concurrency=4)
+    for _ in range(6):
+        controller.call(MODEL, _throttle_then("ok")[0])
+    assert _model_stats(controller)["concurrency_limit"] >= 1
+
+
+def test_one_decrease_per_round_of_in_flight_calls():
+    controller = _controller(concurrency=8)
+
+    async def run():
+        gate = asyncio.Event()
+        attempts: dict[int, int] = {}
+
+        def make(i):
+            async def fn():
+                attempts[i] = attempts.get(i, 0) + 1
+                if attempts[i] == 1:
+                    await gate.wait()
+                    raise _error("ThrottlingException")
+                return i
+            return fn
+
+        calls = [asyncio.create_task(controller.acall(MODEL, make(i))) for i in range(4)]
+        await asyncio.sleep(0.01)
+        assert _model_stats(controller)["in_flight"] == 4
+        gate.set()
+        return await asyncio.gather(*calls)
+
+    assert asyncio.run(run()) == [0, 1, 2, 3]
+    stats = _model_stats(controller)
+    # Four throttles from calls sent under the same limit: one halving
+    assert stats["throttled"] == 4
+    assert stats["limit_decreases"] == 1
+
+
+def test_non_retryable_errors_are_not_retried():
+    controller = _controller()
+    calls = {"n": 0}
+
+    def fn():
+        calls["n"] += 1
+        raise _error("ValidationException")
+
+    with pytest.raises(ClientError):
+        controller.call(MODEL, fn)
+    stats = _model_stats(controller)
+    assert calls["n"] == 1
+    assert stats["retries"] == 0
+    assert stats["concurrency_limit"] == 8
+    assert stats["in_flight"] == 0
+
+
+def test_persistent_throttling_raises_the_original_error_at_the_deadline():
+    controller = _controller(deadline=0.05)
+    fn, calls = _throttle_then("never", throttles=10_000)
+
+    with pytest.raises(ClientError) as info:
+        controller.call(MODEL, fn)
+
+    assert info.value.response["Error"]["Code"] == "ThrottlingException"
+    assert calls["n"] > 1
+    assert _model_stats(controller)["rejected"] == 1
+    assert _model_stats(controller)["in_flight"] == 0
+
+
+def test_async_callers_wait_for_a_released_slot():
+    controller = _controller(concurrency=2)
+    peak = {"now": 0, "max": 0}
+
+    async def work():
+        peak["now"] += 1
+        peak["max"] = max(peak["max"], peak["now"])
+        await asyncio.sleep(0.01)
+        peak["now"] -= 1
+        return True
+
+    async def run():
+        return await asyncio.gather(*[controller.acall(MODEL, work) for _ in range(6)])
+
+    assert asyncio.run(run()) == [True] * 6
+    assert peak["max"] == 2
+    assert _model_stats(controller)["calls"] == 6
+
+
+def test_admission_times_out_with_rate_limit_exceeded():
+    controller = _controller(concurrency=1)
+    holding, release = threading.Event(), threading.Event()
+
+    def hold():
+        holding.set()
+        release.wait()
+
+    worker = threading.Thread(target=controller.call, args=(MODEL, hold))
+    worker.start()
+    holding.wait()
+    try:
+        with pytest.raises(RateLimitExceeded):
+            controller.call(MODEL, lambda: "late", deadline_seconds=0.05)
+    finally:
+        release.set()
+        worker.join()
+    assert _model_stats(controller)["rejected"] == 1
+    assert controller.call(MODEL, lambda: "next") == "next"
+
+
+def test_stream_holds_its_slot_until_consumed():
+    controller = _controller(concurrency=1)
+    response = controller.call_stream(MODEL, lambda: {"stream": iter([{"chunk": 1}, {"chunk": 2}])})
+    assert _model_stats(controller)["in_flight"] == 1
+    with pytest.raises(RateLimitExceeded):
+        controller.call(MODEL, lambda: "blocked", deadline_seconds=0.05)
+
+    assert list(response["stream"]) == [{"chunk": 1}, {"chunk": 2}]
+    assert _model_stats(controller)["in_flight"] == 0
+    assert controller.call(MODEL, lambda: "free") == "free"
@@ -0,0 +1,124 @@
+"""ReasonAgent batch mode: packing and per-event retry of bad batch answers."""
+import asyncio
+import json
+
+from agents.reason import BATCH_SYSTEM_PROMPT, ReasonAgent
+
+
+def _event(i: int, message: str = "CPU above threshold") -> dict:
+    return {
+        "id": f"evt-{i}",
+        "source": "cloudwatch",
+        "service": "EC2",
+        "region": "us-east-1",
+        "severity": "low",
+        "message": message,
+        "resource": f"i-{i:04d}",
+        "metric": "CPUUtilization",
+        "value": 91.0,
+        "threshold": 80,
+        "timestamp": "2026-10-17T10:00:00Z",
+    }
+
+
+def _analysis(event_id: str | None = None, **overrides) -> dict:
+    item = {
+        "root_cause": "load spike",
+        "confidence": 0.9,
+        "impact": "latency",
+        "reasoning_steps": ["cpu high"],
+        "recommended_action": "monitor",
+        "fix_description": "none",
+        "related_services": [],
+        "estimated_resolution_time": "5m",
+    }
+    if event_id is not None:
+        item["event_id"] = event_id
+    return {**item, **overrides}
+
+
+class FakeExecutor:
+    """Answers batch requests with `batch_items` and single requests with a valid analysis."""
+
+    def __init__(self, batch_items=None, batch_error: Exception | None = None):
+        self.batch_items = batch_items or []
+        self.batch_error = batch_error
+        self.batch_calls = 0
+        self.single_calls = 0
+
+    async def converse(self, modelId, system, messages, inferenceConfig):
+        if system[0]["text"] == BATCH_SYSTEM_PROMPT:
+            self.batch_calls += 1
+            if self.batch_error is not None:
+                raise self.batch_error
+            text = json.dumps(self.batch_items)
+        else:
+            self.single_calls += 1
+            text = json.dumps(_analysis())
+        response = {
+            "output": {"message": {"content": [{"text": text}]}},
+            "usage": {"inputTokens": 100, "outputTokens": 50},
+        }
+        return response, 5.0
+
+
+def test_pack_splits_on_batch_size():
+    agent = ReasonAgent(use_mock=False, executor=FakeExecutor(), batch_size=3, batch_token_budget=100_000)
+    batches = agent._pack([_event(i) for i in range(7)])
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert [e["id"] for b in batches for e in b] == [f"evt-{i}" for i in range(7)]
+
+
+def test_pack_splits_on_token_budget():
+    agent = ReasonAgent(use_mock=False, executor=FakeExecutor(), batch_size=10, batch_token_budget=1500)
+    batches = agent._pack([_event(i, message="x" * 800) for i in range(4)])
+    assert len(batches) > 1
+    # An event larger than the budget still goes out, alone
+    oversized = agent._pack([_event(0, message="x" * 20_000), _event(1)])
+    assert [len(b) for b in oversized] == [1, 1]
+
+
+def test_missing_and_invalid_batch_items_are_retried_individually():
+    events = [_event(i) for i in range(4)]
+    executor = FakeExecutor(batch_items=[
+        _analysis("evt-0"),
+        _analysis("evt-1", confidence=1.7),            # out of range
+        _analysis("evt-2", recommended_action="reboot"),  # not a valid action
+        # evt-3 missing
+    ])
+    agent = ReasonAgent(use_mock=False, executor=executor, batch_size=4, batch_token_budget=100_000)
+
+    analyses = asyncio.run(agent.analyze_many(events))
+
+    assert [a["event_id"] for a in analyses] == [e["id"] for e in events]
+    assert executor.batch_calls == 1
+    assert executor.single_calls == 3
+    assert analyses[0]["batch_size"] == 4
+    assert all("batch_size" not in a for a in analyses[1:])
+    assert agent.batched_events == 1
+    assert agent.batch_retries == 3
+
+
+def test_failed_batch_falls_back_to_single_requests():
+    events = [_event(i) for i in range(3)]
+    executor = FakeExecutor(batch_error=RuntimeError("throttled"))
+    agent = ReasonAgent(use_mock=False, executor=executor, batch_size=3, batch_token_budget=100_000)
+
+    analyses = asyncio.run(agent.analyze_many(events))
+
+    assert [a["model"] for a in analyses] == [analyses[0]["model"]] * 3
+    assert analyses[0]["model"] != "error"
+    assert executor.single_calls == 3
+    assert agent.batch_retries == 3
+
+
+def test_only_batch_severities_are_batched():
+    events = [_event(0), {**_event(1), "severity": "critical"}, _event(2)]
+    executor = FakeExecutor(batch_items=[_analysis("evt-0"), _analysis("evt-2")])
+    agent = ReasonAgent(use_mock=False, executor=executor, batch_size=5, batch_token_budget=100_000)
+
+    analyses = asyncio.run(agent.analyze_many(events))
+
+    assert executor.batch_calls == 1
+    assert executor.single_calls == 1
+    assert [a.get("batch_size") for a in analyses] == [2, None, 2]
@@ -0,0 +1,143 @@
+"""ReasonAgent cascade: Nova Lite triage answers stand or are promoted to Nova Pro."""
+import asyncio
+import json
+
+import pytest
+
+from agents.cache import AnalysisCache
+from agents.reason import MODEL_ID, TRIAGE_MODEL_ID, ReasonAgent
+
+
+def _event(severity: str = "medium", i: int = 1) -> dict:
+    return {
+        "id": f"evt-{i}",
+        "source": "cloudwatch",
+        "service": "EC2",
+        "region": "us-east-1",
+        "severity": severity,
+        "message": "CPU above threshold",
+        "resource": f"i-{i:04d}",
+        "metric": "CPUUtilization",
+        "value": 91.0,
+        "threshold": 80,
+        "timestamp": "2026-10-17T10:00:00Z",
+    }
+
+
+def _analysis(**overrides) -> dict:
+    return {
+        "root_cause": "load spike",
+        "confidence": 0.9,
+        "impact": "latency",
+        "reasoning_steps": ["cpu high"],
+        "recommended_action": "monitor",
+        "fix_description": "none",
+        "related_services": [],
+        "estimated_resolution_time": "5m",
+        **overrides,
+    }
+
+
+class FakeExecutor:
+    """Answers per model id; an Exception value makes that model's calls fail."""
+
+    def __init__(self, triage, pro=None):
+        self.answers = {TRIAGE_MODEL_ID: triage, MODEL_ID: pro or _analysis(root_cause="pro verdict")}
+        self.calls: list[str] = []
+
+    async def converse(self, modelId, system, messages, inferenceConfig):
+        self.calls.append(modelId)
+        answer = self.answers[modelId]
+        if isinstance(answer, Exception):
+            raise answer
+        response = {
+            "output": {"message": {"content": [{"text": json.dumps(answer)}]}},
+            "usage": {"inputTokens": 100, "outputTokens": 50},
+        }
+        return response, 12.0
+
+
+def _agent(executor: FakeExecutor, **kwargs) -> ReasonAgent:
+    return ReasonAgent(use_mock=False, executor=executor, cascade=True, **kwargs)
+
+
+def test_confident_triage_answer_stands():
+    executor = FakeExecutor(triage=_analysis(confidence=0.92))
+    agent = _agent(executor)
+
+    analysis = asyncio.run(agent.analyze(_event()))
+
+    assert executor.calls == [TRIAGE_MODEL_ID]
+    assert (analysis["model"], analysis["tier"]) == (TRIAGE_MODEL_ID, "triage")
+    assert "promoted_from" not in analysis
+    assert (agent.answered_by_triage, agent.sent_to_pro) == (1, 0)
+
+
+@pytest.mark.parametrize("triage, reason", [
+    (_analysis(confidence=0.55), "low_confidence"),
+    (_analysis(confidence=None), "low_confidence"),
+    (_analysis(confidence=0.95, recommended_action="auto_fix"), "auto_fix"),
+    (RuntimeError("throttled"), "triage_failed"),
+    ("not an analysis", "triage_failed"),
+])
+def test_triage_is_promoted_to_pro(triage, reason):
+    executor = FakeExecutor(triage=triage)
+    agent = _agent(executor)
+
+    analysis = asyncio.run(agent.analyze(_event()))
+
+    assert executor.calls == [TRIAGE_MODEL_ID, MODEL_ID]
+    assert (analysis["model"], analysis["tier"], analysis["root_cause"]) == (MODEL_ID, "pro", "pro verdict")
+    assert analysis["promoted_from"]["reason"] == reason
+    assert analysis["promoted_from"]["model"] == TRIAGE_MODEL_ID
+    assert agent.promotions == {reason: 1}
+    assert agent.sent_to_pro == 1
+
+
+def test_promotion_keeps_the_triage_verdict():
+    executor = FakeExecutor(triage=_analysis(confidence=0.4, recommended_action="escalate"))
+    analysis = asyncio.run(_agent(executor).analyze(_event()))
+    promoted = analysis["promoted_from"]
+    assert (promoted["confidence"], promoted["recommended_action"]) == (0.4, "escalate")
+    assert promoted["usage"]["input_tokens"] == 100
+
+
+def test_promote_severities_skip_triage():
+    executor = FakeExecutor(triage=_analysis())
+    analysis = asyncio.run(_agent(executor).analyze(_event("critical")))
+    assert executor.calls == [MODEL_ID]
+    assert analysis["tier"] == "pro" and "promoted_from" not in analysis
+
+
+def test_promote_below_threshold_is_configurable():
+    executor = FakeExecutor(triage=_analysis(confidence=0.6))
+    analysis = asyncio.run(_agent(executor, promote_below=0.5).analyze(_event()))
+    assert analysis["tier"] == "triage"
+
+
+def test_promotion_reason_order():
+    agent = _agent(FakeExecutor(triage=_analysis()))
+    triage = _analysis(model=TRIAGE_MODEL_ID, confidence=0.1, recommended_action="auto_fix")
+    assert agent._promotion_reason(_event("critical"), triage) == "severity"
+    assert agent._promotion_reason(_event(), triage) == "auto_fix"
+    assert agent._promotion_reason(_event(), {**triage, "model": "error"}) == "triage_failed"
+    assert agent._promotion_reason(_event(), {**triage, "recommended_action": "monitor"}) == "low_confidence"
+
+
+def test_cascade_settings_are_part_of_the_cache_key():
+    plain = ReasonAgent(use_mock=False, executor=FakeExecutor(triage=_analysis()))
+    cascade = _agent(FakeExecutor(triage=_analysis()))
+    stricter = _agent(FakeExecutor(triage=_analysis()), promote_below=0.95)
+    assert len({plain.prompt_version, cascade.prompt_version, stricter.prompt_version}) == 3
+
+
+def test_settled_answer_is_cached():
+    executor = FakeExecutor(triage=_analysis(confidence=0.3))
+    agent = _agent(executor, cache=AnalysisCache(ttl_seconds=60))
+
+    first = asyncio.run(agent.analyze(_event()))
+    second = asyncio.run(agent.analyze(_event()))
+
+    assert executor.calls == [TRIAGE_MODEL_ID, MODEL_ID]
+    assert second["promoted_from"] == first["promoted_from"]
+    assert second["cache"]["hit"] is True
@@ -0,0 +1,97 @@
+"""Streamed reasoning that fails mid-response still returns Act / Escalate results."""
+import asyncio
+
+import pytest
+
+from src import pipeline
+from src.agents import reason_agent
+
+AUTO_FIX = {
+    "incident_id": "INC-1",
+    "title": "Untagged instances",
+    "affected_resources": ["i-0aaa"],
+    "recommended_action": "TAG_RESOURCES",
+    "confidence_score": 0.99,
+}
+REVIEW = {
+    "incident_id": "INC-2",
+    "title": "Suspicious IAM activity",
+    "affected_resources": ["arn:aws:iam::123:user/x"],
+    "recommended_action": "MANUAL_REVIEW",
+    "confidence_score": 0.5,
+}
+
+
+def _failing_stream(incidents):
+    def reason_over(signals, emit=None):
+        for inc in incidents:
+            emit(dict(inc))
+        raise RuntimeError("ConverseStream dropped")
+    return reason_over
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    monkeypatch.setattr(reason_agent, "REASON_SHARDED", False)
+    monkeypatch.setattr(reason_agent, "_fallback_incidents", lambda signals: [dict(REVIEW)])
+    monkeypatch.setattr(pipeline, "run_monitor_agent", lambda: {"resources": []})
+    monkeypatch.setattr(pipeline, "run_act_agent", lambda incs: {
+        "remediations": [{"incident_id": i["incident_id"], "result": {"status": "SUCCESS"}} for i in incs],
+    })
+    monkeypatch.setattr(pipeline, "run_escalate_agent", lambda incs: {
+        "escalations": [{"incident_id": i["incident_id"]} for i in incs],
+    })
+    return pipeline.streaming_stages
+
+
+def test_incidents_emitted_before_the_failure_are_kept(stages, monkeypatch):
+    monkeypatch.setattr(reason_agent, "_reason_over", _failing_stream([AUTO_FIX]))
+
+    results, _ = asyncio.run(pipeline.run_stages(stages()))
+
+    assert [i["incident_id"] for i in results["reason"]["incidents"]] == ["INC-1"]
+    assert results["reason"]["reason_error"] == "ConverseStream dropped"
+    assert [r["incident_id"] for r in results["act"]["remediations"]] == ["INC-1"]
+    assert results["escalate"]["escalations"] == []
+
+
+def test_failure_before_any_incident_falls_back(stages, monkeypatch):
+    monkeypatch.setattr(reason_agent, "_reason_over", _failing_stream([]))
+
+    results, _ = asyncio.run(pipeline.run_stages(stages()))
+
+    assert [i["incident_id"] for i in results["reason"]["incidents"]] == ["INC-2"]
+    assert [e["incident_id"] for e in results["escalate"]["escalations"]] == ["INC-2"]
+
+
+def test_sharded_streaming_keeps_emitted_incidents_when_every_shard_fails(stages, monkeypatch):
+    shards = [{"resource_keys": ["i-0aaa"]}, {"resource_keys": ["arn:aws:iam::123:user/x"]}]
+    monkeypatch.setattr(reason_agent, "REASON_SHARDED", True)
+    monkeypatch.setattr(reason_agent, "shard_signals", lambda signals: shards)
+    monkeypatch.setattr(reason_agent, "_shard_fallback", lambda shard: [dict(REVIEW)])
+
+    def reason_over(signals, emit=None):
+        if signals is shards[0]:
+            emit(dict(AUTO_FIX))
+        raise RuntimeError("throttled")
+
+    monkeypatch.setattr(reason_agent, "_reason_over", reason_over)
+
+    results, _ = asyncio.run(pipeline.run_stages(stages()))
+
+    # Shard 0 keeps what it streamed; only shard 1 falls back
+    assert sorted(i["incident_id"] for i in results["reason"]["incidents"]) == ["INC-1", "INC-2"]
+    assert len(results["reason"]["shard_errors"]) == 2
+    assert [r["incident_id"] for r in results["act"]["remediations"]] == ["INC-1"]
+    assert [e["incident_id"] for e in results["escalate"]["escalations"]] == ["INC-2"]
+
+
+def test_non_streaming_failure_still_raises(monkeypatch):
+    monkeypatch.setattr(reason_agent, "REASON_SHARDED", False)
+
+    def reason_over(signals, emit=None):
+        raise RuntimeError("Bedrock down")
+
+    monkeypatch.setattr(reason_agent, "_reason_over", reason_over)
+    with pytest.raises(RuntimeError):
+        reason_agent.run_reason_agent({})
@@ -0,0 +1,178 @@
+"""Run store: cursor pagination, pending/persisted merge, retention."""
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from runtime.run_store import MemoryRunStore, SQLiteRunStore, decode_cursor, open_run_store
+
+
+def _run(i: int, started_at: str | None = None, **extra) -> dict:
+    started_at = started_at or f"2026-10-17T10:00:{i:02d}Z"
+    return {
+        "run_id": f"run-{i:03d}",
+        "started_at": started_at,
+        "completed_at": started_at,
+        "events_processed": i,
+        "results": [{"event": {"id": f"evt-{i}"}}],
+        **extra,
+    }
+
+
+def _flush(store: SQLiteRunStore) -> None:
+    store._writer.submit(lambda: None).result()
+
+
+def _all_pages(store, limit: int) -> list[str]:
+    async def walk():
+        ids, cursor = [], None
+        while True:
+            page = await store.list(limit=limit, cursor=cursor)
+            ids += [r["run_id"] for r in page["runs"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return ids
+    return asyncio.run(walk())
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = SQLiteRunStore(str(tmp_path / "runs.db"))
+    yield store
+    asyncio.run(store.close())
+
+
+def test_sqlite_pages_newest_first_without_gaps(sqlite_store):
+    for i in range(7):
+        sqlite_store.save(_run(i))
+    # Same started_at: run_id breaks the tie
+    sqlite_store.save(_run(7, started_at=_run(6)["started_at"]))
+    _flush(sqlite_store)
+
+    ids = _all_pages(sqlite_store, limit=3)
+
+    assert ids == ["run-007", "run-006", "run-005", "run-004", "run-003", "run-002", "run-001", "run-000"]
+
+
+def test_list_omits_results_unless_asked(sqlite_store):
+    sqlite_store.save(_run(1))
+    _flush(sqlite_store)
+    summary = asyncio.run(sqlite_store.list(limit=1))["runs"][0]
+    full = asyncio.run(sqlite_store.list(limit=1, include_results=True))["runs"][0]
+    assert "results" not in summary
+    assert full["results"] == [{"event": {"id": "evt-1"}}]
+
+
+def test_pending_writes_merge_with_persisted_runs(sqlite_store):
+    for i in range(3):
+        sqlite_store.save(_run(i))
+    _flush(sqlite_store)
+
+    # Hold the writer so the next saves stay pending
+    release = threading.Event()
+    sqlite_store._writer.submit(release.wait)
+    try:
+        sqlite_store.save(_run(1, finalized=True))  # re-save of a persisted run
+        sqlite_store.save(_run(3))                  # new run, not yet written
+        assert sqlite_store.stats()["pending_writes"] == 2
+
+        assert _all_pages(sqlite_store, limit=2) == ["run-003", "run-002", "run-001", "run-000"]
+        assert asyncio.run(sqlite_store.count()) == 4
+        assert asyncio.run(sqlite_store.get("run-001"))["finalized"] is True
+        assert asyncio.run(sqlite_store.latest())["run_id"] == "run-003"
+    finally:
+        release.set()
+    _flush(sqlite_store)
+
+    assert sqlite_store.stats()["pending_writes"] == 0
+    assert asyncio.run(sqlite_store.count()) == 4
+    assert asyncio.run(sqlite_store.get("run-001"))["finalized"] is True
+
+
+def test_saved_record_is_snapshotted_at_save_time(sqlite_store):
+    release = threading.Event()
+    sqlite_store._writer.submit(release.wait)
+    record = _run(1)
+    sqlite_store.save(record)
+    record["events_processed"] = 99  # live record keeps changing after save
+    release.set()
+    _flush(sqlite_store)
+    assert asyncio.run(sqlite_store.get("run-001"))["events_processed"] == 1
+
+
+def test_save_serializes_on_the_writer_thread(sqlite_store, monkeypatch):
+    import runtime.run_store as run_store
+
+    threads = []
+    dumps = run_store.json.dumps
+
+    def recording_dumps(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return dumps(*args, **kwargs)
+
+    monkeypatch.setattr(run_store.json, "dumps", recording_dumps)
+    release = threading.Event()
+    sqlite_store._writer.submit(release.wait)
+    record = _run(1)
+    sqlite_store.save(record)
+    assert threads == []
+    record["results"][0]["final_analysis"] = {"late": True}  # attached after the save
+    release.set()
+    _flush(sqlite_store)
+
+    assert threads and all(name.startswith("run-store") for name in threads)
+    assert "final_analysis" not in asyncio.run(sqlite_store.get("run-001"))["results"][0]
+
+
+def test_retention_prunes_old_runs(tmp_path):
+    store = SQLiteRunStore(str(tmp_path / "runs.db"), retention_days=30)
+    old = (datetime.utcnow() - timedelta(days=45)).isoformat() + "Z"
+    recent = (datetime.utcnow() - timedelta(days=1)).isoformat() + "Z"
+    try:
+        store.save(_run(1, started_at=recent))
+        store.save(_run(2, started_at=old))
+        _flush(store)
+        # Pruning runs on the first write and every 100th after it
+        for i in range(3, 102):
+            store.save(_run(i, started_at=recent))
+        _flush(store)
+
+        assert asyncio.run(store.get("run-002")) is None
+        assert asyncio.run(store.get("run-001")) is not None
+        assert asyncio.run(store.count()) == 100
+    finally:
+        asyncio.run(store.close())
+
+
+def test_runs_survive_reopen(tmp_path):
+    path = str(tmp_path / "runs.db")
+    store = SQLiteRunStore(path)
+    store.save(_run(1))
+    asyncio.run(store.close())
+
+    reopened = SQLiteRunStore(path)
+    try:
+        assert asyncio.run(reopened.get("run-001"))["run_id"] == "run-001"
+    finally:
+        asyncio.run(reopened.close())
+
+
+def test_memory_store_pages_and_bounds():
+    store = MemoryRunStore(max_runs=5)
+    for i in range(8):
+        store.save(_run(i))
+    assert _all_pages(store, limit=2) == ["run-007", "run-006", "run-005", "run-004", "run-003"]
+    assert asyncio.run(store.count()) == 5
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        asyncio.run(MemoryRunStore().list(cursor="%%%"))
+
+
+def test_unopenable_path_falls_back_to_memory(tmp_path):
+    store = open_run_store("sqlite", str(tmp_path / "missing" / "runs.db"))
+    assert store.backend == "memory"
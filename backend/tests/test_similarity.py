@@ -0,0 +1,186 @@
+"""Similarity index: MinHash matching, LRU eviction, TTL; provisional answers and their confirmation."""
+import asyncio
+import json
+
+from agents import similarity
+from agents.reason import ReasonAgent
+from agents.similarity import SimilarityIndex, tokens
+
+VERSION = "v1"
+
+
+def _event(event_id: str, value: float = 94.7, instance: str = "0a1b2c3d4e5f", **overrides) -> dict:
+    return {
+        "id": event_id,
+        "source": "cloudwatch",
+        "service": "EC2",
+        "region": "us-east-1",
+        "metric": "CPUUtilization",
+        "severity": "high",
+        "message": f"CPU utilization {value}% on i-{instance} exceeds threshold",
+        "resource": f"i-{instance}",
+        "value": value,
+        "threshold": 80,
+        "timestamp": "2026-10-17T10:00:00Z",
+        **overrides,
+    }
+
+
+def _analysis(action: str = "monitor") -> dict:
+    return {
+        "root_cause": "load spike",
+        "confidence": 0.9,
+        "impact": "latency",
+        "reasoning_steps": ["cpu high"],
+        "recommended_action": action,
+        "fix_description": "scale out",
+        "related_services": [],
+        "estimated_resolution_time": "5m",
+    }
+
+
+def test_near_duplicate_matches_across_instances_and_values():
+    index = SimilarityIndex(threshold=0.6)
+    source_id = index.add(_event("a"), _analysis(), VERSION)
+
+    found = index.match(_event("b", value=91.2, instance="9f8e7d6c5b4a"), VERSION)
+
+    assert found is not None
+    analysis, analysis_id, source_event, score = found
+    assert (analysis_id, source_event) == (source_id, "a")
+    assert 0.6 <= score <= 1.0
+    assert analysis == _analysis()
+    assert index.stats()["matches"] == 1
+
+
+def test_ids_and_numbers_are_masked_in_tokens():
+    assert tokens(_event("a", instance="0a1b2c3d4e5f")) == tokens(_event("b", instance="ffffeeee1111"))
+
+
+def test_no_match_outside_the_block_or_below_threshold():
+    index = SimilarityIndex(threshold=0.6)
+    index.add(_event("a"), _analysis(), VERSION)
+
+    assert index.match(_event("b", severity="critical"), VERSION) is None
+    assert index.match(_event("b", service="RDS"), VERSION) is None
+    assert index.match(_event("b"), "v2") is None
+    unrelated = _event("c", message="Disk queue depth 40 on vol-0abc123def456", value=40, threshold=10)
+    assert index.match(unrelated, VERSION) is None
+    # An event never matches its own earlier analysis
+    assert index.match(_event("a"), VERSION) is None
+
+
+def test_clusters_and_disabled_index_never_match():
+    index = SimilarityIndex(threshold=0.6)
+    index.add(_event("a"), _analysis(), VERSION)
+    assert index.match(_event("b", correlated_events=[_event("c")]), VERSION) is None
+
+    disabled = SimilarityIndex(threshold=0)
+    disabled.add(_event("a"), _analysis(), VERSION)
+    assert not disabled.enabled
+    assert disabled.match(_event("b"), VERSION) is None
+
+
+def test_returned_analysis_is_a_copy():
+    index = SimilarityIndex(threshold=0.6)
+    index.add(_event("a"), _analysis(), VERSION)
+    index.match(_event("b"), VERSION)[0]["reasoning_steps"].append("mutated")
+    assert index.match(_event("b"), VERSION)[0]["reasoning_steps"] == ["cpu high"]
+
+
+def test_least_recently_matched_entry_is_evicted():
+    index = SimilarityIndex(threshold=0.6, max_entries=2)
+    index.add(_event("a"), _analysis("monitor"), VERSION)
+    index.add(_event("b", service="RDS"), _analysis("ignore"), VERSION)
+    assert index.match(_event("x"), VERSION)[2] == "a"  # a is now most recent
+
+    index.add(_event("c", service="Lambda"), _analysis(), VERSION)
+
+    assert index.stats()["entries"] == 2
+    assert index.stats()["evictions"] == 1
+    assert index.match(_event("y", service="RDS"), VERSION) is None
+    assert index.match(_event("x"), VERSION)[2] == "a"
+
+
+def test_re_adding_an_event_replaces_its_entry():
+    index = SimilarityIndex(threshold=0.6)
+    first = index.add(_event("a"), _analysis("monitor"), VERSION)
+    second = index.add(_event("a"), _analysis("ignore"), VERSION)
+
+    assert first != second
+    assert index.stats()["entries"] == 1
+    assert index.match(_event("b"), VERSION)[:2] == (_analysis("ignore"), second)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(similarity.time, "time", lambda: now[0])
+    index = SimilarityIndex(threshold=0.6, ttl_seconds=60)
+    index.add(_event("a"), _analysis(), VERSION)
+
+    now[0] += 59
+    assert index.match(_event("b"), VERSION) is not None
+    now[0] += 2
+    assert index.match(_event("b"), VERSION) is None
+
+
+class FakeExecutor:
+    def __init__(self, action: str):
+        self.action = action
+        self.calls = 0
+
+    async def converse(self, modelId, system, messages, inferenceConfig):
+        self.calls += 1
+        text = json.dumps(_analysis(self.action))
+        return {"output": {"message": {"content": [{"text": text}]}}, "usage": {"inputTokens": 10, "outputTokens": 5}}, 1.0
+
+
+def test_provisional_auto_fix_is_escalated_until_confirmed():
+    confirmed = []
+    agent = ReasonAgent(
+        use_mock=False,
+        executor=FakeExecutor("auto_fix"),
+        similarity=SimilarityIndex(threshold=0.6),
+        on_confirmed=lambda event, analysis: confirmed.append((event["id"], analysis)),
+    )
+
+    async def run():
+        source = await agent.analyze(_event("a"))
+        provisional = await agent.analyze(_event("b", value=91.2))
+        await asyncio.gather(*agent._confirming)
+        return source, provisional
+
+    source, provisional = asyncio.run(run())
+
+    assert source["recommended_action"] == "auto_fix"
+    assert provisional["provisional"] is True
+    assert provisional["recommended_action"] == "escalate"
+    assert provisional["source_recommended_action"] == "auto_fix"
+    assert provisional["similar_to"]["analysis_id"] == source["analysis_id"]
+
+    [(event_id, analysis)] = confirmed
+    assert event_id == "b"
+    assert analysis["recommended_action"] == "auto_fix"
+    assert analysis["confirms"] == {
+        **provisional["similar_to"],
+        "agreed": True,
+        "provisional_action": "escalate",
+    }
+    assert agent.confirmations == {"agreed": 1, "changed": 0, "failed": 0}
+
+
+def test_pipeline_stream_yields_provisional_then_confirmed():
+    executor = FakeExecutor("monitor")
+    agent = ReasonAgent(use_mock=False, executor=executor, similarity=SimilarityIndex(threshold=0.6))
+
+    async def run():
+        await agent.analyze(_event("a"))
+        executor.action = "escalate"
+        return [a async for a in agent.analyze_stream([_event("b")])]
+
+    provisional, confirmed = asyncio.run(run())
+
+    assert provisional["provisional"] is True
+    assert "confirms" in confirmed and not confirmed.get("provisional")
+    assert confirmed["confirms"]["agreed"] is False
+    assert agent.confirmations["changed"] == 1
@@ -0,0 +1,95 @@
+"""SingleFlight: concurrent callers share one execution, errors included."""
+import asyncio
+
+from runtime import SingleFlight
+
+
+class Work:
+    """Counts calls; each run waits for `release` before returning or raising."""
+
+    def __init__(self, error: Exception | None = None):
+        self.calls = 0
+        self.error = error
+        self.release: asyncio.Event | None = None
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {"run": self.calls}
+
+
+def _gather_callers(flight: SingleFlight, work: Work, keys: list[str]):
+    async def scenario():
+        work.release = asyncio.Event()
+        callers = [asyncio.ensure_future(flight.do(key, work)) for key in keys]
+        await asyncio.sleep(0)
+        work.release.set()
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    return asyncio.run(scenario())
+
+
+def test_concurrent_callers_share_one_execution():
+    flight, work = SingleFlight(), Work()
+    outcomes = _gather_callers(flight, work, ["k", "k", "k"])
+
+    assert work.calls == 1
+    assert [result for result, _ in outcomes] == [{"run": 1}] * 3
+    assert [shared for _, shared in outcomes] == [False, True, True]
+    assert (flight.executions, flight.coalesced) == (1, 2)
+    assert flight.in_flight() == []
+
+
+def test_different_keys_run_separately():
+    flight, work = SingleFlight(), Work()
+    _gather_callers(flight, work, ["a", "b"])
+    assert work.calls == 2
+
+
+def test_errors_reach_every_caller_and_are_not_reused():
+    flight, work = SingleFlight(reuse_window_seconds=60), Work(error=RuntimeError("bedrock down"))
+    outcomes = _gather_callers(flight, work, ["k", "k"])
+
+    assert work.calls == 1
+    assert all(isinstance(o, RuntimeError) and str(o) == "bedrock down" for o in outcomes)
+
+    work.error = None
+    [(result, shared)] = _gather_callers(flight, work, ["k"])
+    assert (result, shared) == ({"run": 2}, False)
+
+
+def test_results_are_reused_within_the_window():
+    flight, work = SingleFlight(reuse_window_seconds=60), Work()
+    _gather_callers(flight, work, ["k"])
+    [(result, shared)] = _gather_callers(flight, work, ["k"])
+    assert work.calls == 1
+    assert (result, shared) == ({"run": 1}, True)
+    assert flight.reused == 1
+
+
+def test_without_a_window_each_call_after_completion_runs_again():
+    flight, work = SingleFlight(), Work()
+    _gather_callers(flight, work, ["k"])
+    _gather_callers(flight, work, ["k"])
+    assert work.calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    flight, work = SingleFlight(), Work()
+
+    async def scenario():
+        work.release = asyncio.Event()
+        leaving = asyncio.ensure_future(flight.do("k", work))
+        staying = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        await asyncio.sleep(0)
+        work.release.set()
+        return await staying, leaving
+
+    (result, shared), leaving = asyncio.run(scenario())
+    assert leaving.cancelled()
+    assert (result, shared) == ({"run": 1}, True)
+    assert work.calls == 1
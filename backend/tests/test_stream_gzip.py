@@ -0,0 +1,46 @@
+"""StreamGZipMiddleware: JSON is compressed, Server-Sent Events never are."""
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from runtime import StreamGZipMiddleware
+
+BODY = "x" * 4096
+
+
+def _client(skip_paths=("/events",)) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(StreamGZipMiddleware, minimum_size=100, skip_paths=skip_paths)
+
+    @app.get("/runs")
+    def runs():
+        return PlainTextResponse(BODY)
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(iter([f"data: {BODY}\n\n"]), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_large_responses_are_compressed():
+    response = _client().get("/runs", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == BODY
+
+
+def test_skipped_paths_pass_through_uncompressed():
+    response = _client().get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == f"data: {BODY}\n\n"
+
+
+def test_main_skips_both_stream_routes(monkeypatch):
+    monkeypatch.setenv("USE_MOCK", "true")
+    monkeypatch.setenv("RUN_STORE", "memory")
+    import main
+
+    gzip = next(m for m in main.app.user_middleware if m.cls is StreamGZipMiddleware)
+    routes = {route.path for route in main.app.routes}
+    assert set(gzip.kwargs["skip_paths"]) == {"/pipeline/run/stream", "/stream/updates"}
+    assert set(gzip.kwargs["skip_paths"]) <= routes
@@ -0,0 +1,95 @@
+"""Update hub: resume from history, reset ordering, slow clients, heartbeats."""
+import asyncio
+
+from runtime.hub import UpdateHub
+
+
+def _collect(hub: UpdateHub, since: int | None, count: int, publish=()) -> list[dict]:
+    async def run():
+        stream = hub.subscribe(since)
+        messages = []
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        for kind in publish:
+            hub.publish(kind, {})
+        messages.append(await first)
+        while len(messages) < count:
+            messages.append(await stream.__anext__())
+        await stream.aclose()
+        return messages
+    return asyncio.run(run())
+
+
+def test_resume_replays_missed_updates_in_order():
+    hub = UpdateHub(history_size=10)
+    for i in range(5):
+        hub.publish("escalation.created", {"n": i})
+
+    messages = _collect(hub, since=2, count=3)
+
+    assert [m["seq"] for m in messages] == [3, 4, 5]
+    assert [m["data"]["n"] for m in messages] == [2, 3, 4]
+
+
+def test_reset_precedes_backlog_without_ids_going_backwards():
+    hub = UpdateHub(history_size=3)
+    for i in range(10):
+        hub.publish("run.completed", {"n": i})
+
+    messages = _collect(hub, since=2, count=4)
+
+    assert messages[0]["type"] == "reset"
+    assert messages[0]["data"] == {"since": 2, "oldest": 8}
+    seqs = [m["seq"] for m in messages]
+    assert seqs == [2, 8, 9, 10]
+    assert seqs == sorted(seqs)
+
+
+def test_live_updates_follow_the_backlog_once():
+    hub = UpdateHub(history_size=10)
+    hub.publish("run.completed", {})
+
+    messages = _collect(hub, since=0, count=3, publish=["escalation.created", "escalation.resolved"])
+
+    assert [(m["seq"], m["type"]) for m in messages] == [
+        (1, "run.completed"), (2, "escalation.created"), (3, "escalation.resolved"),
+    ]
+
+
+def test_since_ahead_of_the_hub_is_clamped():
+    hub = UpdateHub()
+    hub.publish("run.completed", {})
+    messages = _collect(hub, since=99, count=1, publish=["escalation.created"])
+    assert [m["seq"] for m in messages] == [2]
+
+
+def test_slow_client_is_dropped_with_a_resume_point():
+    hub = UpdateHub(buffer_size=2, history_size=10)
+
+    async def run():
+        stream = hub.subscribe()
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        hub.publish("a", {})
+        got = [await first]
+        for kind in ("b", "c", "d"):
+            hub.publish(kind, {})
+        got.append(await stream.__anext__())
+        await stream.aclose()
+        return got
+
+    first, dropped = asyncio.run(run())
+    assert first["type"] == "a"
+    assert dropped["type"] == "dropped"
+    assert dropped["data"] == {"resume_from": 1}
+    assert hub.stats()["dropped_clients"] == 1
+    # Resuming from the drop point replays what the client missed
+    assert [m["type"] for m in _collect(hub, since=1, count=3)] == ["b", "c", "d"]
+
+
+def test_idle_stream_gets_heartbeats():
+    hub = UpdateHub(heartbeat_seconds=0.01)
+    hub.publish("run.completed", {})
+    [heartbeat] = _collect(hub, since=None, count=1)
+    assert heartbeat["type"] == "heartbeat"
+    assert heartbeat["seq"] == 1
@@ -9,7 +9,7 @@ import AgentPipeline from "@/components/AgentPipeline";
 import EventCard from "@/components/EventCard";
 import EscalationQueue from "@/components/EscalationQueue";
 import StatCard from "@/components/StatCard";
-import { api, type DashboardSummary, type PipelineRun, type Escalation } from "@/lib/api";
+import { api, subscribeUpdates, type DashboardSummary, type PipelineRun, type Escalation } from "@/lib/api";
 
 type Tab = "pipeline" | "escalations";
 
@@ -42,6 +42,18 @@ export default function Home() {
 
   useEffect(() => { refresh(); }, [refresh]);
 
+  useEffect(() => subscribeUpdates(update => {
+    const pending = update.data.pending;
+    if (typeof pending === "number") {
+      setSummary(s => (s ? { ...s, pending_escalations: pending } : s));
+    }
+    if (update.type === "escalation.resolved") {
+      setEscalations(prev => prev.filter(e => e.escalation_id !== update.data.escalation_id));
+    } else if (update.type === "run.completed" || update.type === "run.finalized" || update.type === "reset") {
+      refresh();
+    }
+  }), [refresh]);
+
   const runPipeline = useCallback(async () => {
     if (running) return;
     setRunning(true);
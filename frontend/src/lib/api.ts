@@ -23,6 +23,10 @@ export interface Analysis {
   fix_description: string;
   related_services: string[];
   estimated_resolution_time: string;
+  /** Reused from a near-duplicate event's analysis, pending confirmation */
+  similar_to?: { analysis_id: string; event_id: string; similarity: number };
+  /** Confirmation of a provisional similarity-index answer */
+  confirms?: { analysis_id: string; event_id: string; similarity: number; agreed: boolean; provisional_action: string };
 }
 
 export interface PipelineResult {
@@ -31,6 +35,11 @@ export interface PipelineResult {
   action_taken: string;
   execution: Record<string, unknown> | null;
   escalation: Record<string, unknown> | null;
+  /** Analysis missed the run deadline or was reused from a similar event; escalated */
+  provisional?: boolean;
+  /** The real analysis, attached once it finished after the run returned */
+  final_analysis?: Analysis;
+  finalized_at?: string;
 }
 
 /** Alias used by EventCard component */
@@ -43,9 +52,16 @@ export interface PipelineRun {
   events_processed: number;
   auto_fixed: number;
   escalated: number;
+  /** Events still awaiting their real analysis (deadline misses, near-duplicates) */
+  provisional_events?: string[];
+  /** False until late analyses / fixes have been attached */
+  finalized?: boolean;
   results: PipelineResult[];
 }
 
+/** /pipeline/runs list entries omit per-event results unless ?include=results */
+export type PipelineRunSummary = Omit<PipelineRun, "results">;
+
 export interface DashboardSummary {
   total_events: number;
   severity_breakdown: Record<string, number>;
@@ -105,11 +121,28 @@ async function apiFetch<T>(path: string, opts?: RequestInit): Promise<T> {
   return res.json();
 }
 
+export interface Update {
+  seq: number;
+  type: "escalation.created" | "escalation.resolved" | "run.completed" | "run.analysis_finalized" | "run.finalized" | "analysis.confirmed" | "reset" | "dropped" | "heartbeat";
+  ts: number;
+  data: { pending?: number; escalation_id?: string } & Record<string, unknown>;
+}
+
+/** Push feed of queue / run changes. EventSource resumes via Last-Event-ID on reconnect. */
+export function subscribeUpdates(onUpdate: (update: Update) => void): () => void {
+  const source = new EventSource(`${API_URL}/stream/updates`);
+  source.onmessage = (e) => {
+    const update = JSON.parse(e.data) as Update;
+    if (update.type !== "heartbeat") onUpdate(update);
+  };
+  return () => source.close();
+}
+
 export const api = {
   summary: () => apiFetch<DashboardSummary>("/dashboard/summary"),
   events: () => apiFetch<{ events: InfraEvent[]; count: number }>("/events"),
   runPipeline: () => apiFetch<PipelineRun>("/pipeline/run", { method: "POST" }),
-  runs: () => apiFetch<{ runs: PipelineRun[]; count: number }>("/pipeline/runs"),
+  runs: () => apiFetch<{ runs: PipelineRunSummary[]; count: number; next_cursor: string | null }>("/pipeline/runs"),
   escalations: () => apiFetch<{ escalations: Escalation[]; count: number }>("/escalations"),
   resolveEscalation: (id: string, resolution: string, resolved_by = "operator") =>
     apiFetch(`/escalations/${id}/resolve`, {